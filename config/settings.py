@@ -52,6 +52,11 @@ CACHES = {
     },
 }
 
+# Cached JSON responses of the read-heavy vendor and category endpoints,
+# invalidated by tags from the model signals
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True") == "True"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))
+
 
 # DATABASES
 # ------------------------------------------------------------------------------
@@ -356,9 +361,95 @@ CELERY_BEAT_SCHEDULE = {
         "task": "vendor_management_system.historical_performances.tasks.record_historical_performance",
         "schedule": crontab(hour="*/6"),  # Run every 6 hours
     },
+    "rollup_historical_performance": {
+        "task": "vendor_management_system.historical_performances.tasks.rollup_historical_performance",
+        "schedule": crontab(minute=30, hour=1),  # Run every day after midnight
+    },
+    "compute_category_distributions": {
+        "task": "vendor_management_system.historical_performances.tasks.compute_category_distributions",
+        "schedule": crontab(minute=15, hour="*/6"),  # Run after each snapshot
+    },
+    "recompute_dirty_vendor_kpis": {
+        "task": "vendor_management_system.purchase_orders.tasks.recompute_dirty_vendor_kpis",
+        "schedule": crontab(minute="*/5"),  # Safety net for the deferred KPI drain
+    },
+    "refresh_vendor_alerts": {
+        "task": "vendor_management_system.vendors.tasks.refresh_vendor_alerts",
+        "schedule": crontab(minute=5, hour=0),  # Run every day after midnight
+    },
+    "sweep_document_expiry": {
+        "task": "vendor_management_system.documents.tasks.sweep_document_expiry",
+        "schedule": crontab(minute=10, hour=0),  # Run every day after midnight
+    },
+    "purge_stale_document_uploads": {
+        "task": "vendor_management_system.documents.tasks.purge_stale_document_uploads",
+        "schedule": crontab(minute=20, hour=0),  # Run every day after midnight
+    },
+    "refresh_dashboard_metrics": {
+        "task": "vendor_management_system.documents.tasks.refresh_dashboard_metrics",
+        "schedule": crontab(minute="*"),  # Refresh before the snapshot expires
+    },
+}
+
+
+# Vendor KPIs
+# ------------------------------------------------------------------------------
+# With VENDOR_KPI_DEFERRED the purchase orders only mark the vendor dirty and
+# Celery recomputes each vendor once; otherwise the counters are updated inline
+VENDOR_KPI_DEFERRED = os.getenv("VENDOR_KPI_DEFERRED", "False") == "True"
+VENDOR_KPI_DEBOUNCE_SECONDS = int(os.getenv("VENDOR_KPI_DEBOUNCE_SECONDS", "30"))
+
+# Historical performance snapshots: bulk insert batch size
+HISTORICAL_PERFORMANCE_BATCH_SIZE = int(os.getenv("HISTORICAL_PERFORMANCE_BATCH_SIZE", "500"))
+
+# Days each resolution of the historical performance is kept: the raw snapshots
+# are downsampled into daily, weekly and monthly rollups (None keeps forever)
+HISTORICAL_PERFORMANCE_RETENTION_DAYS = {
+    "RAW": int(os.getenv("HISTORICAL_PERFORMANCE_RAW_RETENTION_DAYS", "90")),
+    "DAY": int(os.getenv("HISTORICAL_PERFORMANCE_DAY_RETENTION_DAYS", "730")),
+    "WEEK": int(os.getenv("HISTORICAL_PERFORMANCE_WEEK_RETENTION_DAYS", "1825")),
+    "MONTH": None,
 }
 
 
+# Vendor categories
+# ------------------------------------------------------------------------------
+# Serve the category statistics from the precomputed vendors_categorystats table,
+# kept up to date when a vendor changes category, status, qualification or risk
+CATEGORY_STATS_PRECOMPUTED = os.getenv("CATEGORY_STATS_PRECOMPUTED", "False") == "True"
+
+# Serve the vendor alerts from the precomputed vendor_alert_state table, refreshed
+# every night and when a vendor changes the fields the alerts depend on
+VENDOR_ALERTS_PRECOMPUTED = os.getenv("VENDOR_ALERTS_PRECOMPUTED", "False") == "True"
+
+
+# Documents
+# ------------------------------------------------------------------------------
+# Seconds the snapshot of the admin dashboard metrics is kept; Celery refreshes
+# it every minute, so the dashboards never count the documents on render
+DASHBOARD_METRICS_TIMEOUT = int(os.getenv("DASHBOARD_METRICS_TIMEOUT", "300"))
+
+# Seconds the document compliance of a vendor is cached; the Document and
+# DocumentType writes invalidate it
+COMPLIANCE_CACHE_TIMEOUT = int(os.getenv("COMPLIANCE_CACHE_TIMEOUT", "3600"))
+
+# Chunked uploads: the chunks are written to a spool on disk (on the same file
+# system as MEDIA_ROOT, so the finished file is moved and not copied)
+DOCUMENT_UPLOAD_SPOOL_ROOT = os.getenv(
+    "DOCUMENT_UPLOAD_SPOOL_ROOT", str(Path(MEDIA_ROOT) / "upload_spool")
+)
+DOCUMENT_UPLOAD_CHUNK_MAX_BYTES = int(
+    os.getenv("DOCUMENT_UPLOAD_CHUNK_MAX_BYTES", str(8 * 1024 * 1024))
+)
+DOCUMENT_UPLOAD_MAX_BYTES = int(os.getenv("DOCUMENT_UPLOAD_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Downloads: "x-accel-redirect" (nginx, internal location mapping the prefix to
+# MEDIA_ROOT) or "x-sendfile" (Apache) hand the file to the proxy; empty streams
+# it from Django with the Range and conditional requests support
+DOCUMENT_DOWNLOAD_OFFLOAD = os.getenv("DOCUMENT_DOWNLOAD_OFFLOAD", "")
+DOCUMENT_DOWNLOAD_ACCEL_PREFIX = os.getenv("DOCUMENT_DOWNLOAD_ACCEL_PREFIX", "/protected-media/")
+
+
 # django-rest-framework
 # -------------------------------------------------------------------------------
 REST_FRAMEWORK = {
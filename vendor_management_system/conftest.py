@@ -1,5 +1,8 @@
 # Imports
 import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
 
 from vendor_management_system.historical_performances.tests.factories import (
     HistoricalPerformanceFactory,
@@ -12,6 +15,12 @@ from vendor_management_system.purchase_orders.tests.factories import (
 from vendor_management_system.vendors.tests.factories import VendorFactory
 
 
+# Start every test with an empty cache
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
 # Set the fixture for the VendorFactory
 @pytest.fixture()
 def vendor_factory(db) -> VendorFactory:
@@ -28,3 +37,10 @@ def purchase_order_factory(db) -> PurchaseOrderFactory:
 @pytest.fixture()
 def historical_performance_factory(db) -> HistoricalPerformanceFactory:
     return HistoricalPerformanceFactory
+
+
+# Set the fixture for the token of an API user
+@pytest.fixture()
+def api_token(db) -> str:
+    user = get_user_model().objects.create(email="api@example.com")
+    return Token.objects.create(user=user).key
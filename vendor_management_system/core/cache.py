@@ -0,0 +1,114 @@
+# Imports
+import functools
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+
+# Prefixes of the cache keys
+RESPONSE_KEY_PREFIX = "response-cache"
+TAG_KEY_PREFIX = "response-cache-tag"
+
+# Query parameters never part of the cache key
+IGNORED_QUERY_PARAMS = {"token"}
+
+
+# Function to get the cache key of a tag version
+def tag_key(tag):
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+# Function to get the current versions of some tags in one round trip
+def tag_versions(tags):
+    versions = cache.get_many([tag_key(tag) for tag in tags])
+    return [versions.get(tag_key(tag), "0") for tag in tags]
+
+
+# Function to invalidate the cached responses carrying any of the tags
+def invalidate_tags(*tags):
+    # A new version makes the keys of the tagged entries unreachable
+    cache.set_many({tag_key(tag): uuid.uuid4().hex for tag in tags}, None)
+
+
+# Function to get the role part of the cache key
+def request_role(request):
+    user = request.user
+    if getattr(user, "is_superuser", False):
+        return "superuser"
+    role = getattr(user, "role", None) or "user"
+    if role == "vendor":
+        return f"vendor:{getattr(user, 'vendor_id', None)}"
+    return role
+
+
+# Function to get the cache key of a response
+def response_cache_key(name, request, tags, daily=False):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        if key not in IGNORED_QUERY_PARAMS
+        for value in values
+    )
+    parts = [name, repr(params), request_role(request), *tag_versions(tags)]
+    if daily:
+        parts.append(timezone.localdate().isoformat())
+    digest = hashlib.sha1("|".join(parts).encode()).hexdigest()
+    return f"{RESPONSE_KEY_PREFIX}:{name}:{digest}"
+
+
+# Function to get the response of an entry, or a 304 if the client has it
+def entry_response(request, entry):
+    etag = f'"{entry["etag"]}"'
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if etag in [value.strip() for value in if_none_match.split(",")] or if_none_match == "*":
+        http_response = HttpResponseNotModified()
+    else:
+        http_response = HttpResponse(entry["content"], content_type="application/json")
+    http_response["ETag"] = etag
+    http_response["Cache-Control"] = "private, no-cache"
+    return http_response
+
+
+# Decorator caching the JSON response of a ViewSet method by tags
+def cached_response(*tags, timeout=None, daily=False):
+    """
+    The tags may use the URL keyword arguments, e.g. "vendor:{vendor_code}".
+    Only the 200 responses are cached; a matching If-None-Match returns a
+    304 without running the view.
+    """
+
+    def decorator(view):
+        name = view.__qualname__
+
+        @functools.wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            if not getattr(settings, "RESPONSE_CACHE_ENABLED", True):
+                return view(self, request, *args, **kwargs)
+
+            resolved_tags = [tag.format(**kwargs) for tag in tags]
+            key = response_cache_key(name, request, resolved_tags, daily=daily)
+            entry = cache.get(key)
+
+            if entry is None:
+                view_response = view(self, request, *args, **kwargs)
+                if view_response.status_code != 200:
+                    return view_response
+
+                content = JSONRenderer().render(view_response.data)
+                entry = {"etag": hashlib.md5(content).hexdigest(), "content": content}
+                cache.set(
+                    key,
+                    entry,
+                    timeout or getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300),
+                )
+
+            return entry_response(request, entry)
+
+        return wrapper
+
+    return decorator
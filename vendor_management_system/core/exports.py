@@ -0,0 +1,110 @@
+# Imports
+import csv
+import datetime
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import dateparse, timezone
+
+
+# Supported export formats and their content types
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows read per query and bytes buffered before each chunk is sent
+EXPORT_BATCH_SIZE = 2000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+# Function to parse the since= parameter of an incremental export
+def parse_since(value):
+    try:
+        day = dateparse.parse_date(value)
+        since = (
+            datetime.datetime.combine(day, datetime.time.min)
+            if day is not None
+            else dateparse.parse_datetime(value)
+        )
+    except ValueError:
+        return None
+    if since is not None and timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+# Pseudo buffer handing back what the csv writer writes
+class Echo:
+    def write(self, value):
+        return value
+
+
+# Function to iterate the rows of a values_list in batches seeking on its key
+def iterate_rows(queryset, key, batch_size=EXPORT_BATCH_SIZE):
+    """
+    The key must be unique and the first column of the values_list. Each
+    batch is a separate bounded query, so the memory stays constant on the
+    backends whose drivers do not stream the results (MySQL).
+    """
+    queryset = queryset.order_by(key)
+    last = None
+    while True:
+        batch = queryset if last is None else queryset.filter(**{f"{key}__gt": last})
+        rows = list(batch[:batch_size])
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        last = rows[-1][0]
+
+
+# Function to encode the rows as lines of the requested format
+def encode_rows(rows, columns, export_format):
+    if export_format == "csv":
+        writer = csv.writer(Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        encoder = DjangoJSONEncoder(separators=(",", ":"))
+        for row in rows:
+            yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+# Function to group the lines in chunks, optionally gzip compressed
+def chunk_lines(lines, compress=False):
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer, size = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= EXPORT_CHUNK_BYTES:
+            chunk = b"".join(buffer)
+            buffer, size = [], 0
+            yield compressor.compress(chunk) if compressor else chunk
+
+    chunk = b"".join(buffer)
+    if compressor:
+        yield compressor.compress(chunk) + compressor.flush()
+    elif chunk:
+        yield chunk
+
+
+# Function to stream the rows of a values_list as a file
+def export_response(request, queryset, columns, key, filename, export_format="ndjson"):
+    compress = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+    lines = encode_rows(iterate_rows(queryset, key), columns, export_format)
+
+    http_response = StreamingHttpResponse(
+        chunk_lines(lines, compress=compress),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    http_response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    http_response["Vary"] = "Accept-Encoding"
+    if compress:
+        http_response["Content-Encoding"] = "gzip"
+    return http_response
@@ -0,0 +1,33 @@
+# Imports
+from django.db import models
+
+
+# Database function adding a number of days (an expression) to a date
+class AddDays(models.Func):
+    """
+    AddDays(date, days) is the date shifted by the days, computed by the
+    database so the days may come from a column (e.g. a joined reminder
+    period) and the comparison stays in a single query.
+    """
+
+    arity = 2
+    output_field = models.DateField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL adds an integer to a date natively
+        return super().as_sql(
+            compiler, connection, template="(%(expressions)s)", arg_joiner=" + ",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template="DATE_ADD(%(expressions)s DAY)",
+            arg_joiner=", INTERVAL ", **extra_context,
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template="date(%(expressions)s || ' days')",
+            arg_joiner=", ", **extra_context,
+        )
@@ -0,0 +1,64 @@
+# Imports
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from vendor_management_system.core.query_plans import explain_query, hot_queries
+
+
+# Command to explain the hot queries and report the sequential scans
+class Command(BaseCommand):
+    help = "EXPLAIN the hot queries against the current database and flag the sequential scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="names",
+            help="Prefix of the queries to explain (can be repeated, default: all)",
+        )
+        parser.add_argument(
+            "--fail-on-scan",
+            action="store_true",
+            help="Exit with an error when a query scans a whole table",
+        )
+
+    def handle(self, *args, **options):
+        names = options["names"]
+        queries = [
+            query for query in hot_queries()
+            if not names or any(query[0].startswith(name) for name in names)
+        ]
+        if not queries:
+            raise CommandError(f"No queries matching: {', '.join(names)}")
+
+        # Explain each query
+        flagged = []
+        unsupported = []
+        for name, queryset, expected in queries:
+            plan, scans = explain_query(queryset)
+            if scans is None:
+                unsupported.append(name)
+                self.stdout.write(
+                    self.style.NOTICE(f"{name}: scans not detected on {connection.vendor}")
+                )
+                scans = []
+            scans = sorted(set(scans) - expected)
+            if scans:
+                flagged.append(name)
+                self.stdout.write(
+                    self.style.WARNING(f"{name}: sequential scan of {', '.join(scans)}")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: ok"))
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  {queryset.query}")
+                for line in str(plan).splitlines():
+                    self.stdout.write(f"  {line}")
+
+        # Report the result
+        summary = f"{len(flagged)} of {len(queries)} queries with sequential scans"
+        if unsupported:
+            summary += f" ({len(unsupported)} not checked: unsupported database {connection.vendor})"
+        if flagged and options["fail_on_scan"]:
+            raise CommandError(summary)
+        self.stdout.write(summary)
@@ -0,0 +1,113 @@
+# Imports
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from rest_framework import response
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# Keyset pagination over a unique ordering
+class KeysetPagination:
+    """
+    Paginate a queryset by seeking past the last row of the previous page
+    instead of using an offset, so the cost of a page does not depend on its
+    position and the cursors stay valid when rows are inserted. The ordering
+    fields must be ascending and, together, unique.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 50
+    max_page_size = 500
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering, page_size=None):
+        self.ordering = tuple(ordering)
+        if page_size is not None:
+            self.page_size = page_size
+
+    # Method to encode the position of a row in an opaque cursor
+    def encode_cursor(self, row, reverse):
+        position = [getattr(row, field) for field in self.ordering]
+        payload = json.dumps({"p": position, "r": reverse}, default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    # Method to decode a cursor into a position and a direction
+    def decode_cursor(self, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            position, reverse = payload["p"], bool(payload["r"])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    # Method to get the condition of the rows after (or before) a position
+    def seek(self, position, reverse):
+        lookup = "lt" if reverse else "gt"
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            equal = {name: value for name, value in zip(self.ordering[:index], position)}
+            condition |= Q(**equal, **{f"{field}__{lookup}": position[index]})
+        return condition
+
+    # Method to get the page size requested by the client
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    # Method to get the rows of the requested page
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        position, reverse = self.decode_cursor(cursor) if cursor else (None, False)
+
+        # Seek past the cursor in the requested direction
+        if position is not None:
+            queryset = queryset.filter(self.seek(position, reverse))
+        ordering = [f"-{field}" if reverse else field for field in self.ordering]
+        rows = list(queryset.order_by(*ordering)[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        # Cursors of the neighbouring pages
+        if reverse:
+            rows.reverse()
+            self.next_cursor = self.encode_cursor(rows[-1], False) if rows else None
+            self.previous_cursor = (
+                self.encode_cursor(rows[0], True) if rows and has_more else None
+            )
+        else:
+            self.next_cursor = (
+                self.encode_cursor(rows[-1], False) if rows and has_more else None
+            )
+            self.previous_cursor = (
+                self.encode_cursor(rows[0], True) if rows and position else None
+            )
+        return rows
+
+    # Method to get the link to a page
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        # The links are shared through the response cache: no credentials
+        url = remove_query_param(self.request.build_absolute_uri(), "token")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    # Method to get the response of a page
+    def get_paginated_response(self, data):
+        return response.Response(
+            {
+                "next": self.get_link(self.next_cursor),
+                "previous": self.get_link(self.previous_cursor),
+                "results": data,
+            }
+        )
@@ -89,3 +89,12 @@ def vendor_required(view_func):
             return redirect('dashboard-redirect')
         return view_func(request, *args, **kwargs)
     return wrapper
+
+
+def can_access_vendor_data(user, vendor_id):
+    """Admin e BO User vedono tutti i fornitori, il Vendor solo il proprio"""
+    if not user.is_authenticated:
+        return False
+    if user.is_admin() or user.is_bo_user():
+        return True
+    return user.is_vendor_user() and user.vendor_id == vendor_id
@@ -0,0 +1,154 @@
+# Imports
+import json
+import re
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from vendor_management_system.documents import dashboard, expiry
+from vendor_management_system.documents.models import Document, DocumentType
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.vendors import alerts
+from vendor_management_system.vendors.models import Category, Vendor
+
+
+# Plan lines of SQLite reading a whole table
+SQLITE_SCAN = re.compile(r"\bSCAN (?:TABLE )?(\w+)\s*$", re.M)
+
+
+# Function to get the hot queries of the application
+def hot_queries():
+    """
+    Each entry is (name, queryset, tables): the tables whose scan is expected
+    and not reported, either small lookup tables or queries reading a whole
+    table by design (the live alert bitmask and the dashboard counts).
+
+    The querysets come from the functions running them, so the plans follow
+    any change to their predicates.
+    """
+    today = timezone.localdate()
+    now = timezone.now()
+    vendors = {Vendor._meta.db_table}
+    categories = {Category._meta.db_table}
+    documents = {Document._meta.db_table}
+    document_types = {DocumentType._meta.db_table}
+    open_statuses = ["PENDING", "ISSUED", "ACKNOWLEDGED"]
+
+    return [
+        # Vendor alerts
+        (
+            "vendors.alerts.live",
+            alerts.compute_vendor_alerts(today),
+            vendors | categories,
+        ),
+        (
+            "vendors.alerts.precomputed",
+            alerts.precomputed_vendor_alerts(),
+            set(),
+        ),
+        # Vendor list filters
+        (
+            "vendors.list.qualification_status",
+            Vendor.objects.filter(qualification_status="PENDING").order_by(
+                "name", "vendor_code"
+            ),
+            set(),
+        ),
+        (
+            "vendors.list.risk_level",
+            Vendor.objects.filter(risk_level="LOW").order_by("name", "vendor_code"),
+            set(),
+        ),
+        (
+            "vendors.list.category",
+            Vendor.objects.filter(category__path__startswith="0").order_by(
+                "name", "vendor_code"
+            ),
+            set(),
+        ),
+        # Purchase order list filters
+        (
+            "purchase_orders.list.vendor_status",
+            PurchaseOrder.objects.filter(vendor_id="0", status="PENDING"),
+            set(),
+        ),
+        (
+            "purchase_orders.list.overdue",
+            PurchaseOrder.objects.filter(
+                status__in=open_statuses, expected_delivery_date__lt=now
+            ),
+            set(),
+        ),
+        # Document dashboards
+        (
+            "documents.dashboard.status_counts",
+            dashboard.status_counts_query(today),
+            documents | document_types,
+        ),
+        (
+            "documents.dashboard.documented_vendors",
+            dashboard.documented_vendors_query(),
+            set(),
+        ),
+        (
+            "documents.dashboard.to_review",
+            dashboard.documents_to_review(),
+            vendors | document_types,
+        ),
+        # Document expiry sweep
+        (
+            "documents.expiry.expire",
+            expiry.documents_to_expire(today),
+            set(),
+        ),
+        (
+            "documents.expiry.remind",
+            expiry.documents_to_remind(today),
+            vendors | document_types,
+        ),
+    ]
+
+
+# Function to collect the values of a key in a JSON plan
+def plan_nodes(plan):
+    if isinstance(plan, dict):
+        yield plan
+        for value in plan.values():
+            yield from plan_nodes(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from plan_nodes(value)
+
+
+# Function to get the plan of a query and the tables it reads in full
+def explain_query(queryset):
+    """
+    On PostgreSQL the sequential scans are disabled while explaining, so a
+    scan is reported only when no index can serve the query, whatever the
+    size of the tables. On the other databases the plan is returned as it is
+    with None as scans, as they cannot be detected.
+    """
+    if connection.vendor == "postgresql":
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain(format="json")
+        scans = [
+            node["Relation Name"]
+            for node in plan_nodes(json.loads(plan))
+            if node.get("Node Type") == "Seq Scan"
+        ]
+    elif connection.vendor == "mysql":
+        plan = queryset.explain(format="json")
+        scans = [
+            node["table_name"]
+            for node in plan_nodes(json.loads(plan))
+            if node.get("access_type") == "ALL" and "table_name" in node
+        ]
+    elif connection.vendor == "sqlite":
+        plan = queryset.explain()
+        scans = SQLITE_SCAN.findall(plan)
+    else:
+        plan = queryset.explain()
+        scans = None
+    return plan, scans
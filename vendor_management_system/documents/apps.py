@@ -4,4 +4,8 @@ from django.utils.translation import gettext_lazy as _
 class DocumentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "vendor_management_system.documents"
-    verbose_name = _("Documents")
\ No newline at end of file
+    verbose_name = _("Documents")
+
+    def ready(self):
+        # Import the signals module
+        import vendor_management_system.documents.signals
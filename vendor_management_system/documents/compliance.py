@@ -0,0 +1,134 @@
+# Imports
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import FilteredRelation, Q
+from django.utils import timezone
+
+from vendor_management_system.core.cache import invalidate_tags, tag_versions
+from vendor_management_system.documents.models import DocumentType
+from vendor_management_system.vendors.models import Vendor
+
+
+# States of a required document type for a vendor, the code is the position
+COMPLIANCE_STATES = (
+    "MISSING",
+    "PENDING",
+    "UPLOADED",
+    "APPROVED",
+    "EXPIRING",
+    "REJECTED",
+    "EXPIRED",
+)
+STATE_CODES = {state: code for code, state in enumerate(COMPLIANCE_STATES)}
+
+# Cache key prefix and tags of the compliance of the vendors
+COMPLIANCE_KEY_PREFIX = "documents:compliance"
+COMPLIANCE_TYPES_TAG = "compliance:types"
+
+
+# Function to get the tag of the compliance of a vendor
+def vendor_tag(vendor_code):
+    return f"compliance:vendor:{vendor_code}"
+
+
+# Function to invalidate the cached compliance of some vendors
+def invalidate_vendor_compliance(*vendor_codes):
+    invalidate_tags(*(vendor_tag(vendor_code) for vendor_code in vendor_codes))
+
+
+# Function to invalidate the cached compliance of all the vendors
+def invalidate_compliance():
+    invalidate_tags(COMPLIANCE_TYPES_TAG)
+
+
+# Function to get the required document types, in the order of the matrix
+def required_types():
+    return [
+        *DocumentType.objects.filter(is_required=True)
+        .order_by("name", "id")
+        .values("id", "name", "description", "reminder_days_before")
+    ]
+
+
+# Function to get the state code of a document
+def document_state(status, expiry_date, reminder_days, today):
+    if expiry_date is not None and expiry_date < today:
+        return STATE_CODES["EXPIRED"]
+    if (
+        status in ("APPROVED", "UPLOADED")
+        and expiry_date is not None
+        and expiry_date <= today + datetime.timedelta(days=reminder_days)
+    ):
+        return STATE_CODES["EXPIRING"]
+    return STATE_CODES[status]
+
+
+# Function to get the required type x document state matrix of the vendors
+def compliance_matrix(vendor_codes=None, today=None):
+    """
+    The vendors are LEFT JOINed to their documents of the required types in
+    a single query; a type without a document is MISSING. Returns the types
+    and, for each vendor code, the state codes in the order of the types.
+    """
+    today = today or timezone.localdate()
+    types = required_types()
+    positions = {document_type["id"]: index for index, document_type in enumerate(types)}
+
+    vendors = Vendor.objects.order_by("vendor_code")
+    if vendor_codes is not None:
+        vendors = vendors.filter(pk__in=vendor_codes)
+
+    matrix = {}
+    if not types:
+        matrix = {vendor_code: [] for vendor_code in vendors.values_list("pk", flat=True)}
+        return {"types": types, "vendors": matrix}
+
+    # One row per vendor and required document, one row per vendor without any
+    rows = vendors.annotate(
+        required=FilteredRelation(
+            "documents", condition=Q(documents__document_type__in=[*positions])
+        )
+    ).values_list(
+        "vendor_code",
+        "required__document_type",
+        "required__status",
+        "required__expiry_date",
+    )
+    missing = STATE_CODES["MISSING"]
+    for vendor_code, type_id, status, expiry_date in rows:
+        cells = matrix.setdefault(vendor_code, [missing] * len(types))
+        if type_id is not None:
+            index = positions[type_id]
+            cells[index] = document_state(
+                status, expiry_date, types[index]["reminder_days_before"], today
+            )
+
+    return {"types": types, "vendors": matrix}
+
+
+# Function to get the cached compliance of a vendor
+def vendor_compliance(vendor_code, today=None):
+    """
+    The entry is keyed on the day (the EXPIRING state depends on it) and on
+    the versions of the tags bumped by the Document and DocumentType writes.
+    """
+    today = today or timezone.localdate()
+    versions = tag_versions([COMPLIANCE_TYPES_TAG, vendor_tag(vendor_code)])
+    key = ":".join([COMPLIANCE_KEY_PREFIX, vendor_code, today.isoformat(), *versions])
+
+    compliance = cache.get(key)
+    if compliance is None:
+        matrix = compliance_matrix([vendor_code], today)
+        compliance = {
+            "types": matrix["types"],
+            "states": matrix["vendors"].get(vendor_code, []),
+        }
+        cache.set(key, compliance, getattr(settings, "COMPLIANCE_CACHE_TIMEOUT", 3600))
+    return compliance
+
+
+# Function to pack the state codes of a vendor, one hexadecimal digit per type
+def pack_states(states):
+    return "".join(f"{code:x}" for code in states)
@@ -0,0 +1,103 @@
+# Imports
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Value
+from django.utils import timezone
+
+from vendor_management_system.core.functions import AddDays
+from vendor_management_system.documents.models import Document
+from vendor_management_system.vendors.models import Vendor
+
+
+logger = logging.getLogger(__name__)
+
+# Cache key of the dashboard metrics snapshot
+DASHBOARD_METRICS_KEY = "documents:dashboard-metrics"
+
+
+# Function to get the condition of the documents within their reminder period
+def expiring_soon_condition(today=None):
+    """
+    Same rule as Document.is_expiring_soon, evaluated by the database against
+    the reminder period of the joined document type.
+    """
+    today = today or timezone.localdate()
+    return Q(
+        expiry_date__isnull=False,
+        expiry_date__lte=AddDays(Value(today), F("document_type__reminder_days_before")),
+    )
+
+
+# Function to get the document counts by status, with those expiring soon
+def status_counts_query(today=None):
+    today = today or timezone.localdate()
+    return (
+        Document.objects.order_by("status")
+        .values("status")
+        .annotate(
+            count=Count("pk"),
+            expiring_soon=Count("pk", filter=expiring_soon_condition(today)),
+        )
+    )
+
+
+# Function to get the vendors with at least one document
+def documented_vendors_query():
+    return Document.objects.order_by().values("vendor").distinct()
+
+
+# Function to get the uploaded documents waiting for a review, newest first
+def documents_to_review():
+    return (
+        Document.objects.filter(status="UPLOADED")
+        .select_related("vendor", "document_type")
+        .order_by("-uploaded_at")
+    )
+
+
+# Function to compute the metrics of the admin dashboard in a few queries
+def compute_dashboard_metrics(today=None):
+    today = today or timezone.localdate()
+
+    # Document counts in one scan, grouped by status
+    rows = [*status_counts_query(today)]
+    counts = {row["status"]: row["count"] for row in rows}
+
+    return {
+        "total_documents": sum(counts.values()),
+        "pending_review": counts.get("UPLOADED", 0),
+        "expiring_soon": sum(
+            row["expiring_soon"] for row in rows if row["status"] in ["APPROVED", "UPLOADED"]
+        ),
+        "expired": counts.get("EXPIRED", 0),
+        "vendors_with_docs": documented_vendors_query().count(),
+        "status_counts": [{"status": row["status"], "count": row["count"]} for row in rows],
+        "total_vendors": Vendor.objects.count(),
+        "computed_at": timezone.now().isoformat(),
+    }
+
+
+# Function to recompute and store the snapshot of the dashboard metrics
+def refresh_dashboard_metrics():
+    metrics = compute_dashboard_metrics()
+    cache.set(
+        DASHBOARD_METRICS_KEY,
+        metrics,
+        getattr(settings, "DASHBOARD_METRICS_TIMEOUT", 300),
+    )
+    return metrics
+
+
+# Function to get the snapshot of the dashboard metrics
+def get_dashboard_metrics():
+    """
+    The snapshot is refreshed in the background by Celery; it is computed
+    here only when it is missing (first render or expired cache).
+    """
+    metrics = cache.get(DASHBOARD_METRICS_KEY)
+    if metrics is None:
+        logger.info("Dashboard metrics: snapshot missing, computing it")
+        metrics = refresh_dashboard_metrics()
+    return metrics
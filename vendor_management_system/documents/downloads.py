@@ -0,0 +1,138 @@
+# Imports
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
+
+from vendor_management_system.documents.storage import BLOB_PREFIX
+
+
+# Single byte range of a Range header (multiple ranges get the whole file)
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Name of a content-addressed blob, whose SHA-256 is a strong validator
+BLOB_PATTERN = re.compile(rf"^{BLOB_PREFIX}/.*/([0-9a-f]{{64}})(\.\w+)?$")
+
+
+# File opened at the start of a range, reading up to its end only
+class RangeFile:
+    """
+    The file descriptor is exposed so that the server file wrapper sends the
+    range with sendfile (it stops at the Content-Length); otherwise the
+    reads stop at the end of the range.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+# Function to get the validator of a stored file
+def file_etag(name, size, modified):
+    blob = BLOB_PATTERN.match(name)
+    if blob:
+        return f'"{blob.group(1)}"'
+    return f'"{size:x}-{int(modified):x}"'
+
+
+# Function to parse the Range header against the size of the file
+def parse_range(header, size):
+    """
+    Returns (start, end) of a satisfiable single range, None to send the
+    whole file and False when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.replace(" ", ""))
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+# Function to get the response sending a stored file
+def file_response(request, field_file, filename):
+    """
+    The file is handed to the front proxy when DOCUMENT_DOWNLOAD_OFFLOAD is
+    set (X-Accel-Redirect for nginx, X-Sendfile for Apache); otherwise it is
+    sent by FileResponse, which uses the server sendfile when available.
+    Conditional requests get a 304 and the Range requests a 206.
+    """
+    storage, name = field_file.storage, field_file.name
+    path = storage.path(name)
+    stat = os.stat(path)
+    etag = file_etag(name, stat.st_size, stat.st_mtime)
+
+    # Cached copies are revalidated without opening the file
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if conditional is not None:
+        conditional["ETag"] = etag
+        return conditional
+
+    offload = getattr(settings, "DOCUMENT_DOWNLOAD_OFFLOAD", "")
+    if offload:
+        # The proxy sends the bytes and serves the ranges
+        response = HttpResponse()
+        del response["Content-Type"]
+        if offload == "x-accel-redirect":
+            prefix = getattr(settings, "DOCUMENT_DOWNLOAD_ACCEL_PREFIX", "/protected-media/")
+            response["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{name}"
+        else:
+            response["X-Sendfile"] = path
+        response["Content-Disposition"] = content_disposition_header(False, filename)
+    else:
+        response = sendfile_response(request, path, stat.st_size, etag, filename)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+# Function to stream a file, or the requested range of it
+def sendfile_response(request, path, size, etag, filename):
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if "Range" in request.headers and (not if_range or if_range == etag):
+        byte_range = parse_range(request.headers["Range"], size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    file = open(path, "rb")
+    if byte_range is None:
+        response = FileResponse(file, filename=filename)
+    else:
+        start, end = byte_range
+        response = FileResponse(RangeFile(file, start, end - start + 1), filename=filename)
+        response.status_code = 206
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response["Accept-Ranges"] = "bytes"
+    return response
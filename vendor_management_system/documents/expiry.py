@@ -0,0 +1,97 @@
+# Imports
+import itertools
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F, Value
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from vendor_management_system.core.functions import AddDays
+from vendor_management_system.documents import compliance
+from vendor_management_system.documents.models import Document
+
+
+logger = logging.getLogger(__name__)
+
+# Statuses of the documents still valid, whose expiry is reminded
+REMINDED_STATUSES = ["APPROVED", "UPLOADED"]
+
+# Template of the reminder digest
+REMINDER_TEMPLATE = "emails/document_expiry_alert.html"
+
+
+# Function to get the documents past their expiry date not yet expired
+def documents_to_expire(today=None):
+    today = today or timezone.localdate()
+    return Document.objects.filter(expiry_date__lt=today).exclude(status="EXPIRED")
+
+
+# Function to mark the expired documents
+def expire_documents(today=None):
+    """
+    Same rule as Document.save, applied to all the rows with one UPDATE
+    instead of waiting for each document to be saved again.
+    """
+    documents = documents_to_expire(today)
+    vendor_codes = {*documents.values_list("vendor_id", flat=True)}
+    expired = documents.update(status="EXPIRED")
+
+    # The bulk update bypasses the signals: drop the cached compliance
+    if vendor_codes:
+        compliance.invalidate_vendor_compliance(*vendor_codes)
+    return expired
+
+
+# Function to get the documents entering their reminder period today
+def documents_to_remind(today=None):
+    today = today or timezone.localdate()
+    return (
+        Document.objects.filter(
+            status__in=REMINDED_STATUSES,
+            expiry_date=AddDays(Value(today), F("document_type__reminder_days_before")),
+        )
+        .select_related("vendor", "document_type")
+        .order_by("vendor", "expiry_date", "document_type__name")
+    )
+
+
+# Function to build the reminder digest of a vendor
+def reminder_digest(vendor, documents, today):
+    html = render_to_string(
+        REMINDER_TEMPLATE, {"vendor": vendor, "documents": documents, "today": today}
+    )
+    message = EmailMultiAlternatives(
+        subject=f"Documenti in scadenza: {len(documents)}",
+        body=strip_tags(html),
+        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None),
+        to=[vendor.email],
+    )
+    message.attach_alternative(html, "text/html")
+    return message
+
+
+# Function to send one reminder digest per vendor
+def send_reminder_digests(today=None):
+    today = today or timezone.localdate()
+    result = {"documents": 0, "vendors": 0, "sent": 0, "skipped_vendors": 0}
+
+    # One message per vendor, grouped from the ordered documents
+    messages = []
+    for vendor, documents in itertools.groupby(
+        documents_to_remind(today), key=lambda document: document.vendor
+    ):
+        documents = [*documents]
+        result["documents"] += len(documents)
+        result["vendors"] += 1
+        if not vendor.email:
+            result["skipped_vendors"] += 1
+            continue
+        messages.append(reminder_digest(vendor, documents, today))
+
+    # Send the digests on a single connection
+    if messages:
+        result["sent"] = get_connection().send_messages(messages) or 0
+    return result
@@ -0,0 +1,47 @@
+# Imports
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from vendor_management_system.documents import storage
+
+
+# Command to delete the document blobs no longer used by any document
+class Command(BaseCommand):
+    help = "Delete the document blobs without references, after a grace period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Keep the blobs unreferenced for less than these hours",
+        )
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recount the references of the blobs from the documents first",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the blobs that would be deleted",
+        )
+
+    def handle(self, *args, **options):
+        # Repair the reference counts
+        if options["recount"]:
+            count = storage.recount_references()
+            self.stdout.write(f"Recounted the references of {count} blobs")
+
+        # Delete the unreferenced blobs
+        result = storage.collect_garbage(
+            grace=datetime.timedelta(hours=options["grace_hours"]),
+            dry_run=options["dry_run"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Dry run: ' if result['dry_run'] else ''}"
+                f"{result['blobs']} blobs, {result['bytes']} bytes reclaimed"
+            )
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+        ('vendors', '0009_vendoralertstate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status', 'uploaded_at'], name='documents_d_status_7e2894_idx'),
+        ),
+    ]
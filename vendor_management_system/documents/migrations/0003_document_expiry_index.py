@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_document_indexes'),
+        ('vendors', '0010_vendor_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['expiry_date', 'status'], name='documents_d_expiry__5d5223_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:49
+
+import django.utils.timezone
+import vendor_management_system.documents.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_document_expiry_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='file',
+            field=models.FileField(blank=True, help_text='Upload the document file', null=True, storage=vendor_management_system.documents.storage.ContentAddressedStorage(), upload_to='vendor_documents/%Y/%m/', verbose_name='Document File'),
+        ),
+        migrations.CreateModel(
+            name='DocumentBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Name of the blob in the storage', max_length=255, unique=True, verbose_name='Name')),
+                ('sha256', models.CharField(db_index=True, help_text='SHA-256 of the content', max_length=64, verbose_name='SHA-256')),
+                ('size', models.BigIntegerField(help_text='Size of the content in bytes', verbose_name='Size')),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='Number of documents using this blob', verbose_name='References')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the blob was stored', verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When the references of the blob last changed', verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Document Blob',
+                'verbose_name_plural': 'Document Blobs',
+                'indexes': [models.Index(fields=['ref_count', 'updated_at'], name='documents_d_ref_cou_105d73_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:50
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_document_blobs'),
+        ('vendors', '0010_vendor_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique ID for the upload', primary_key=True, serialize=False, verbose_name='Upload ID')),
+                ('filename', models.CharField(help_text='Name of the uploaded file', max_length=255, verbose_name='File Name')),
+                ('size', models.BigIntegerField(help_text='Size of the file in bytes', verbose_name='Size')),
+                ('offset', models.BigIntegerField(default=0, help_text='Bytes received so far', verbose_name='Offset')),
+                ('issue_date', models.DateField(blank=True, null=True, verbose_name='Issue Date')),
+                ('expiry_date', models.DateField(blank=True, null=True, verbose_name='Expiry Date')),
+                ('notes', models.TextField(blank=True, verbose_name='Notes')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='document_uploads', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('document_type', models.ForeignKey(help_text='Type of document', on_delete=django.db.models.deletion.CASCADE, to='documents.documenttype', verbose_name='Document Type')),
+                ('vendor', models.ForeignKey(help_text='Vendor uploading the document', on_delete=django.db.models.deletion.CASCADE, related_name='document_uploads', to='vendors.vendor', verbose_name='Vendor')),
+            ],
+            options={
+                'verbose_name': 'Document Upload',
+                'verbose_name_plural': 'Document Uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
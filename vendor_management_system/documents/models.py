@@ -4,6 +4,8 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from vendor_management_system.documents.storage import ContentAddressedStorage
+
 class DocumentType(models.Model):
     """Tipi di documenti da richiedere ai fornitori"""
     
@@ -89,6 +91,7 @@ class Document(models.Model):
     file = models.FileField(
         _("Document File"),
         upload_to="vendor_documents/%Y/%m/",
+        storage=ContentAddressedStorage(),
         help_text=_("Upload the document file"),
         null=True,
         blank=True
@@ -143,10 +146,22 @@ class Document(models.Model):
         verbose_name_plural = _("Documents")
         ordering = ["-uploaded_at"]
         unique_together = ["vendor", "document_type"]
+        indexes = [
+            models.Index(fields=["status", "uploaded_at"]),
+            models.Index(fields=["expiry_date", "status"]),
+        ]
     
     def __str__(self):
         return f"{self.vendor.name} - {self.document_type.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # File as stored, to move the blob reference when the file is replaced
+        if 'file' in instance.__dict__:
+            instance._loaded_file = instance.__dict__['file']
+        return instance
+    
     @property
     def is_expiring_soon(self):
         """Check if document expires within reminder period"""
@@ -170,4 +185,125 @@ class Document(models.Model):
         if self.is_expired and self.status != 'EXPIRED':
             self.status = 'EXPIRED'
         
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class DocumentBlob(models.Model):
+    """Contenuto di un file, salvato una sola volta e condiviso dai documenti"""
+    
+    name = models.CharField(
+        _("Name"),
+        max_length=255,
+        unique=True,
+        help_text=_("Name of the blob in the storage"),
+    )
+    sha256 = models.CharField(
+        _("SHA-256"),
+        max_length=64,
+        db_index=True,
+        help_text=_("SHA-256 of the content"),
+    )
+    size = models.BigIntegerField(
+        _("Size"),
+        help_text=_("Size of the content in bytes"),
+    )
+    ref_count = models.PositiveIntegerField(
+        _("References"),
+        default=0,
+        help_text=_("Number of documents using this blob"),
+    )
+    created_at = models.DateTimeField(
+        _("Created At"),
+        auto_now_add=True,
+        help_text=_("When the blob was stored"),
+    )
+    updated_at = models.DateTimeField(
+        _("Updated At"),
+        default=timezone.now,
+        help_text=_("When the references of the blob last changed"),
+    )
+    
+    class Meta:
+        verbose_name = _("Document Blob")
+        verbose_name_plural = _("Document Blobs")
+        indexes = [models.Index(fields=["ref_count", "updated_at"])]
+    
+    def __str__(self):
+        return self.name
+
+
+class DocumentUpload(models.Model):
+    """Caricamento a blocchi di un documento, ripreso dall'ultimo blocco ricevuto"""
+    
+    id = models.UUIDField(
+        _("Upload ID"),
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text=_("Unique ID for the upload"),
+    )
+    vendor = models.ForeignKey(
+        "vendors.Vendor",
+        on_delete=models.CASCADE,
+        verbose_name=_("Vendor"),
+        help_text=_("Vendor uploading the document"),
+        related_name="document_uploads"
+    )
+    document_type = models.ForeignKey(
+        DocumentType,
+        on_delete=models.CASCADE,
+        verbose_name=_("Document Type"),
+        help_text=_("Type of document")
+    )
+    filename = models.CharField(
+        _("File Name"),
+        max_length=255,
+        help_text=_("Name of the uploaded file")
+    )
+    size = models.BigIntegerField(
+        _("Size"),
+        help_text=_("Size of the file in bytes")
+    )
+    offset = models.BigIntegerField(
+        _("Offset"),
+        default=0,
+        help_text=_("Bytes received so far")
+    )
+    issue_date = models.DateField(
+        _("Issue Date"),
+        null=True,
+        blank=True
+    )
+    expiry_date = models.DateField(
+        _("Expiry Date"),
+        null=True,
+        blank=True
+    )
+    notes = models.TextField(
+        _("Notes"),
+        blank=True
+    )
+    created_by = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        verbose_name=_("Created By"),
+        null=True,
+        blank=True,
+        related_name="document_uploads"
+    )
+    created_at = models.DateTimeField(
+        _("Created At"),
+        auto_now_add=True
+    )
+    updated_at = models.DateTimeField(
+        _("Updated At"),
+        auto_now=True
+    )
+    
+    class Meta:
+        verbose_name = _("Document Upload")
+        verbose_name_plural = _("Document Uploads")
+        ordering = ["-created_at"]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
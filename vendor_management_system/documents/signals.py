@@ -0,0 +1,46 @@
+# Imports
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from vendor_management_system.documents import compliance, storage
+from vendor_management_system.documents.models import Document, DocumentType
+
+
+# Create a signal to drop the cached compliance of the vendor of a changed document
+@receiver(post_save, sender=Document)
+@receiver(post_delete, sender=Document)
+def invalidate_compliance_on_document_change(sender, instance, **kwargs):
+    # After the commit, or a concurrent read would cache the previous rows
+    vendor_code = instance.vendor_id
+    transaction.on_commit(lambda: compliance.invalidate_vendor_compliance(vendor_code))
+
+
+# Create a signal to drop the cached compliance of all the vendors when a type changes
+@receiver(post_save, sender=DocumentType)
+@receiver(post_delete, sender=DocumentType)
+def invalidate_compliance_on_document_type_change(sender, instance, **kwargs):
+    transaction.on_commit(compliance.invalidate_compliance)
+
+
+# Create a signal to move the blob reference when the file of a document changes
+@receiver(post_save, sender=Document)
+def update_blob_references_on_document_save(sender, instance, created, **kwargs):
+    new_name = instance.file.name or ""
+
+    # Without the stored file (e.g. a deferred field) the reference is unknown
+    if not created and not hasattr(instance, "_loaded_file"):
+        instance._loaded_file = new_name
+        return
+
+    old_name = getattr(instance, "_loaded_file", None) or ""
+    if new_name != old_name:
+        storage.add_reference(new_name)
+        storage.remove_reference(old_name)
+    instance._loaded_file = new_name
+
+
+# Create a signal to release the blob of a deleted document
+@receiver(post_delete, sender=Document)
+def release_blob_on_document_delete(sender, instance, **kwargs):
+    storage.remove_reference(instance.file.name)
@@ -0,0 +1,178 @@
+# Imports
+import datetime
+import hashlib
+import itertools
+import os
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+
+# Directory of the blobs, below the storage location
+BLOB_PREFIX = "blobs"
+
+# Blobs handled per query by the garbage collection
+BLOB_GC_BATCH_SIZE = 1000
+
+
+# Function to get the name of the blob of a content
+def blob_name(digest, extension=""):
+    # Two levels of directories keep them small
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+# Function to hash a file reading it in chunks
+def file_digest(content):
+    sha256 = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks():
+        sha256.update(chunk)
+        size += len(chunk)
+    return sha256.hexdigest(), size
+
+
+# File storage keeping a single copy of each content, named by its SHA-256
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    The upload is hashed in chunks and only written when no blob has the
+    same content; otherwise the existing blob is returned and nothing is
+    written. The blobs are reference counted by the documents using them
+    (see the documents signals) and reclaimed by the gc_document_blobs
+    command.
+    """
+
+    def _save(self, name, content):
+        # Imported here, the models use this storage
+        from vendor_management_system.documents.models import DocumentBlob
+
+        digest, size = file_digest(content)
+        name = blob_name(digest, os.path.splitext(name)[1].lower())
+        if self.exists(name):
+            # Restart the grace period of a blob left without row
+            os.utime(self.path(name))
+        else:
+            # Written apart and linked into place, so a concurrent upload of
+            # the same content never sees a partial blob
+            temporary = super()._save(f"{name}.{uuid.uuid4().hex}.tmp", content)
+            try:
+                os.link(self.path(temporary), self.path(name))
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(self.path(temporary))
+
+        # Register the blob, its references are added when a document uses it
+        DocumentBlob.objects.get_or_create(
+            name=name, defaults={"sha256": digest, "size": size}
+        )
+        return name
+
+
+# Function to add a reference to a blob
+def add_reference(name):
+    from vendor_management_system.documents.models import DocumentBlob
+
+    if name:
+        DocumentBlob.objects.filter(name=name).update(
+            ref_count=F("ref_count") + 1, updated_at=timezone.now()
+        )
+
+
+# Function to remove a reference from a blob
+def remove_reference(name):
+    from vendor_management_system.documents.models import DocumentBlob
+
+    if name:
+        DocumentBlob.objects.filter(name=name, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1, updated_at=timezone.now()
+        )
+
+
+# Function to recount the references of the blobs from the documents
+def recount_references():
+    from vendor_management_system.documents.models import Document, DocumentBlob
+
+    references = (
+        Document.objects.filter(file=OuterRef("name"))
+        .order_by()
+        .values("file")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return DocumentBlob.objects.update(
+        ref_count=Coalesce(Subquery(references), Value(0))
+    )
+
+
+# Function to list the files below the blobs directory older than a time
+def blob_files(storage, before):
+    root = storage.path(BLOB_PREFIX)
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            stat = os.stat(path)
+            if stat.st_mtime < before.timestamp():
+                name = os.path.relpath(path, storage.location).replace(os.sep, "/")
+                yield name, stat.st_size
+
+
+# Function to delete the blobs without references
+def collect_garbage(grace=datetime.timedelta(hours=24), dry_run=False):
+    """
+    Only the blobs unreferenced for longer than the grace period are deleted,
+    so an upload whose document is not saved yet keeps its blob. The files
+    without any row (written by a transaction rolled back, or left by an
+    interrupted upload) are deleted after the same period.
+    """
+    from vendor_management_system.documents.models import Document, DocumentBlob
+
+    storage = Document._meta.get_field("file").storage
+    before = timezone.now() - grace
+    blobs = DocumentBlob.objects.filter(ref_count=0, updated_at__lt=before).order_by("pk")
+
+    result = {"blobs": 0, "bytes": 0, "dry_run": dry_run}
+    last = 0
+    while True:
+        batch = [*blobs.filter(pk__gt=last).values_list("pk", "name", "size")[:BLOB_GC_BATCH_SIZE]]
+        if not batch:
+            break
+        last = batch[-1][0]
+
+        # A document may still use the blob if the counts drifted
+        names = {name for _, name, _ in batch}
+        used = {*Document.objects.filter(file__in=names).values_list("file", flat=True)}
+        unused = [(pk, name, size) for pk, name, size in batch if name not in used]
+
+        result["blobs"] += len(unused)
+        result["bytes"] += sum(size for _, _, size in unused)
+        if dry_run:
+            continue
+
+        for _, name, _ in unused:
+            storage.delete(name)
+        DocumentBlob.objects.filter(pk__in=[pk for pk, _, _ in unused]).delete()
+
+    # Files of the blobs directory without row
+    files = blob_files(storage, before)
+    while batch := [*itertools.islice(files, BLOB_GC_BATCH_SIZE)]:
+        names = {name for name, _ in batch}
+        known = {
+            *DocumentBlob.objects.filter(name__in=names).values_list("name", flat=True),
+            *Document.objects.filter(file__in=names).values_list("file", flat=True),
+        }
+        orphans = [(name, size) for name, size in batch if name not in known]
+
+        result["blobs"] += len(orphans)
+        result["bytes"] += sum(size for _, size in orphans)
+        if dry_run:
+            continue
+
+        for name, _ in orphans:
+            storage.delete(name)
+
+    return result
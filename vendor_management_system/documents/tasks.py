@@ -0,0 +1,65 @@
+# Imports
+import logging
+import time
+
+from celery import shared_task
+from django.utils import timezone
+
+from vendor_management_system.documents import dashboard, expiry, uploads
+
+
+logger = logging.getLogger(__name__)
+
+
+# Task to refresh the snapshot of the admin dashboard metrics
+@shared_task
+def refresh_dashboard_metrics(*args):
+    # Recompute the metrics and store the snapshot
+    metrics = dashboard.refresh_dashboard_metrics()
+
+    # Return the time of the snapshot
+    return metrics["computed_at"]
+
+
+# Task to expire the documents past their expiry date and send the reminders
+@shared_task
+def sweep_document_expiry(*args):
+    # Same day for the whole run
+    today = timezone.localdate()
+    started = time.monotonic()
+
+    # Expire the past due documents with one UPDATE
+    expired = expiry.expire_documents(today)
+
+    # The bulk update bypasses Document.save: refresh the dashboard counts
+    if expired:
+        dashboard.refresh_dashboard_metrics()
+
+    # One reminder digest per vendor
+    reminders = expiry.send_reminder_digests(today)
+
+    # Report the run
+    result = {
+        "date": today.isoformat(),
+        "expired": expired,
+        "reminded_documents": reminders["documents"],
+        "reminded_vendors": reminders["vendors"],
+        "digests_sent": reminders["sent"],
+        "vendors_without_email": reminders["skipped_vendors"],
+        "seconds": round(time.monotonic() - started, 3),
+    }
+    logger.info("Document expiry sweep: %s", result)
+
+    # Return the result
+    return result
+
+
+# Task to delete the chunked uploads abandoned by the vendors
+@shared_task
+def purge_stale_document_uploads(*args):
+    # Delete the uploads and their spool files
+    count = uploads.purge_stale_uploads()
+    logger.info("Stale document uploads: %s deleted", count)
+
+    # Return the number of deleted uploads
+    return count
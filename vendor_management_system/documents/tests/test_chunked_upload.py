@@ -0,0 +1,111 @@
+# Imports
+import hashlib
+import io
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from vendor_management_system.documents import uploads
+from vendor_management_system.documents.models import Document, DocumentType, DocumentUpload
+
+
+# Test a file sent in chunks, with a corrupted chunk resent, becomes the document
+@pytest.mark.django_db
+def test_chunked_upload(settings, tmp_path, client, vendor_factory):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.DOCUMENT_UPLOAD_SPOOL_ROOT = str(tmp_path / "spool")
+    settings.DOCUMENT_UPLOAD_CHUNK_MAX_BYTES = 4
+    vendor = vendor_factory(address=None)
+    user = get_user_model().objects.create(email="vendor@example.com", role="vendor", vendor=vendor)
+    client.force_login(user)
+    iso = DocumentType.objects.create(name="ISO 9001")
+    content = b"scanned certificate"
+
+    http_response = client.post(
+        reverse("document-upload-start"),
+        json.dumps(
+            {"document_type": iso.pk, "filename": "iso.pdf", "size": len(content),
+             "expiry_date": "2099-01-01"}
+        ),
+        content_type="application/json",
+    )
+    assert http_response.status_code == 201
+    url = reverse("document-upload-chunk", kwargs={"upload_id": http_response.json()["upload_id"]})
+
+    def put(offset, chunk, checksum=None):
+        return client.put(
+            f"{url}?offset={offset}",
+            chunk,
+            content_type="application/octet-stream",
+            HTTP_X_CHUNK_SHA256=checksum or hashlib.sha256(chunk).hexdigest(),
+        )
+
+    # Chunks larger than the limit, at the wrong offset or corrupted are refused
+    assert put(0, content[:8]).status_code == 400
+    assert put(4, content[:4]).status_code == 409
+    assert put(0, content[:4], checksum="0" * 64).json()["offset"] == 0
+    assert client.get(url).json() == {"offset": 0, "size": len(content)}
+
+    # The upload is not complete until the last chunk
+    for offset in range(0, 12, 4):
+        assert put(offset, content[offset:offset + 4]).json()["offset"] == offset + 4
+    finish_url = f"{url}finish/"
+    assert client.post(finish_url).status_code == 409
+    for offset in range(12, len(content), 4):
+        assert put(offset, content[offset:offset + 4]).status_code == 200
+
+    http_response = client.post(finish_url)
+    assert http_response.status_code == 201
+    document = Document.objects.get(pk=http_response.json()["document_id"])
+    assert (document.vendor, document.status) == (vendor, "UPLOADED")
+    assert str(document.expiry_date) == "2099-01-01"
+    assert document.file.read() == content
+    assert not DocumentUpload.objects.exists()
+    assert not any((tmp_path / "spool").iterdir())
+
+
+# Test a chunk accepted while another request was streaming the same range is kept
+@pytest.mark.django_db
+def test_chunked_upload_concurrent_chunk(settings, tmp_path, vendor_factory):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.DOCUMENT_UPLOAD_SPOOL_ROOT = str(tmp_path / "spool")
+    vendor = vendor_factory(address=None)
+    iso = DocumentType.objects.create(name="ISO 9001")
+    upload = uploads.start_upload(vendor, iso, "iso.pdf", 8)
+    first, second = b"abcd", b"wxyz"
+
+    # The other request completes while this one is still reading its body
+    class SlowStream:
+        def __init__(self, data):
+            self.stream = io.BytesIO(data)
+
+        def read(self, size):
+            if self.stream.tell() == 0:
+                uploads.write_chunk(
+                    upload.pk, 0, io.BytesIO(first), 4, hashlib.sha256(first).hexdigest()
+                )
+            return self.stream.read(size)
+
+    with pytest.raises(uploads.UploadError) as error:
+        uploads.write_chunk(upload.pk, 0, SlowStream(second), 4, hashlib.sha256(second).hexdigest())
+    assert (error.value.status, error.value.data) == (409, {"offset": 4})
+    with open(uploads.spool_path(upload), "rb") as spool:
+        assert spool.read() == first
+    assert [path.name for path in (tmp_path / "spool").iterdir()] == [f"{upload.pk}.part"]
+
+
+# Test a JSON body other than an object is refused
+@pytest.mark.django_db
+def test_chunked_upload_start_invalid_body(client, vendor_factory):
+    vendor = vendor_factory(address=None)
+    user = get_user_model().objects.create(email="vendor@example.com", role="vendor", vendor=vendor)
+    client.force_login(user)
+
+    for body in ("[1, 2]", '"iso.pdf"', "not json"):
+        http_response = client.post(
+            reverse("document-upload-start"), body, content_type="application/json"
+        )
+        assert http_response.status_code == 400
+    assert not DocumentUpload.objects.exists()
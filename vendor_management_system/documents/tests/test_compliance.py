@@ -0,0 +1,84 @@
+# Imports
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from vendor_management_system.documents import compliance
+from vendor_management_system.documents.models import Document, DocumentType
+
+
+# Test the matrix states, the per vendor cache and the heatmap
+@pytest.mark.django_db
+def test_compliance_matrix(
+    client, vendor_factory, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    today = timezone.localdate()
+    durc = DocumentType.objects.create(name="DURC", reminder_days_before=10)
+    iso = DocumentType.objects.create(name="ISO 9001", reminder_days_before=30)
+    DocumentType.objects.create(name="Brochure", is_required=False)
+    vendor, other, empty = (vendor_factory(address=None) for _ in range(3))
+
+    Document.objects.create(
+        vendor=vendor, document_type=durc, status="APPROVED",
+        expiry_date=today + datetime.timedelta(days=100),
+    )
+    Document.objects.create(
+        vendor=vendor, document_type=iso, status="UPLOADED",
+        expiry_date=today + datetime.timedelta(days=20),
+    )
+    Document.objects.create(vendor=other, document_type=iso, status="REJECTED")
+
+    # Types and vendors in one query each
+    with django_assert_num_queries(2):
+        matrix = compliance.compliance_matrix()
+    codes = compliance.STATE_CODES
+    assert [document_type["name"] for document_type in matrix["types"]] == ["DURC", "ISO 9001"]
+    assert matrix["vendors"] == {
+        vendor.vendor_code: [codes["APPROVED"], codes["EXPIRING"]],
+        other.vendor_code: [codes["MISSING"], codes["REJECTED"]],
+        empty.vendor_code: [codes["MISSING"], codes["MISSING"]],
+    }
+
+    # The compliance of a vendor is cached until one of its documents changes
+    assert compliance.vendor_compliance(other.vendor_code)["states"] == [0, 5]
+    with django_assert_num_queries(0):
+        compliance.vendor_compliance(other.vendor_code)
+    with django_capture_on_commit_callbacks(execute=True):
+        Document.objects.create(vendor=other, document_type=durc, status="PENDING")
+    assert compliance.vendor_compliance(other.vendor_code)["states"] == [1, 5]
+
+    # The heatmap packs one hexadecimal digit per required type
+    user = get_user_model().objects.create(email="bo@example.com", role="bo_user")
+    client.force_login(user)
+    http_response = client.get(reverse("compliance-heatmap"))
+    assert http_response.status_code == 200
+    assert http_response.json()["vendors"] == {
+        vendor.vendor_code: "34",
+        other.vendor_code: "15",
+        empty.vendor_code: "00",
+    }
+
+
+# Test the portal lists the expiring documents of every type
+@pytest.mark.django_db
+def test_vendor_portal_expiring_documents(client, vendor_factory):
+    today = timezone.localdate()
+    vendor = vendor_factory(address=None)
+    required = DocumentType.objects.create(name="DURC", reminder_days_before=10)
+    optional = DocumentType.objects.create(name="Brochure", is_required=False)
+    expiring = Document.objects.create(
+        vendor=vendor, document_type=optional, status="APPROVED",
+        expiry_date=today + datetime.timedelta(days=5),
+    )
+    past_due = Document.objects.create(vendor=vendor, document_type=required, status="APPROVED")
+    Document.objects.filter(pk=past_due.pk).update(expiry_date=today - datetime.timedelta(days=1))
+
+    user = get_user_model().objects.create(email="vendor@example.com", role="vendor", vendor=vendor)
+    client.force_login(user)
+    http_response = client.get(reverse("vendor-portal"))
+    assert http_response.status_code == 200
+    assert {doc.pk for doc in http_response.context["expiring_docs"]} == {expiring.pk, past_due.pk}
+    assert http_response.context["missing_types"] == []
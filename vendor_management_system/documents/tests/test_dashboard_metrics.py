@@ -0,0 +1,55 @@
+# Imports
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from vendor_management_system.documents import dashboard
+from vendor_management_system.documents.models import Document, DocumentType
+
+
+# Test the metrics match the per document evaluation they replace
+@pytest.mark.django_db
+def test_dashboard_metrics(vendor_factory, django_assert_max_num_queries):
+    today = timezone.localdate()
+    short = DocumentType.objects.create(name="DURC", reminder_days_before=10)
+    long = DocumentType.objects.create(name="ISO 9001", reminder_days_before=60)
+    vendors = [vendor_factory(address=None) for _ in range(3)]
+
+    rows = [
+        (vendors[0], short, "APPROVED", 5),  # within 10 days
+        (vendors[0], long, "UPLOADED", 30),  # within 60 days
+        (vendors[1], short, "APPROVED", 30),  # outside 10 days
+        (vendors[1], long, "REJECTED", 5),  # not counted by status
+        (vendors[2], short, "UPLOADED", None),  # no expiry
+        (vendors[2], long, "APPROVED", -1),  # expired on save
+    ]
+    for vendor, document_type, status, days in rows:
+        Document.objects.create(
+            vendor=vendor,
+            document_type=document_type,
+            status=status,
+            expiry_date=today + datetime.timedelta(days=days) if days is not None else None,
+        )
+
+    with django_assert_max_num_queries(3):
+        metrics = dashboard.compute_dashboard_metrics(today)
+
+    expected = sum(
+        document.is_expiring_soon
+        for document in Document.objects.filter(status__in=["APPROVED", "UPLOADED"])
+    )
+    assert metrics["expiring_soon"] == expected == 2
+    assert metrics["total_documents"] == 6
+    assert metrics["pending_review"] == 2
+    assert metrics["expired"] == 1
+    assert metrics["vendors_with_docs"] == 3
+    assert {row["status"]: row["count"] for row in metrics["status_counts"]} == {
+        "APPROVED": 2, "UPLOADED": 2, "REJECTED": 1, "EXPIRED": 1,
+    }
+
+    # The snapshot is served from the cache until it is refreshed
+    assert dashboard.get_dashboard_metrics()["total_documents"] == 6
+    Document.objects.filter(status="REJECTED").delete()
+    assert dashboard.get_dashboard_metrics()["total_documents"] == 6
+    assert dashboard.refresh_dashboard_metrics()["total_documents"] == 5
@@ -0,0 +1,57 @@
+# Imports
+import hashlib
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.urls import reverse
+
+from vendor_management_system.documents.models import Document, DocumentType
+
+
+# Test the download checks the vendor, serves the ranges and revalidates the copies
+@pytest.mark.django_db
+def test_document_download(settings, tmp_path, client, vendor_factory):
+    settings.MEDIA_ROOT = str(tmp_path)
+    vendor, other = vendor_factory(address=None), vendor_factory(address=None)
+    content = b"0123456789" * 10
+    document = Document(
+        vendor=vendor, document_type=DocumentType.objects.create(name="DURC"), status="APPROVED"
+    )
+    document.file.save("durc.pdf", ContentFile(content), save=True)
+    url = reverse("document-download", kwargs={"document_id": document.pk})
+
+    # Vendors only download their own documents
+    users = get_user_model().objects
+    client.force_login(users.create(email="other@example.com", role="vendor", vendor=other))
+    assert client.get(url).status_code == 403
+    client.force_login(users.create(email="vendor@example.com", role="vendor", vendor=vendor))
+
+    http_response = client.get(url)
+    assert http_response.status_code == 200
+    assert b"".join(http_response.streaming_content) == content
+    assert http_response["Content-Type"] == "application/pdf"
+    etag = http_response["ETag"]
+    assert etag == f'"{hashlib.sha256(content).hexdigest()}"'
+
+    # Resumed download and unsatisfiable range
+    http_response = client.get(url, HTTP_RANGE="bytes=95-")
+    assert http_response.status_code == 206
+    assert http_response["Content-Range"] == "bytes 95-99/100"
+    assert b"".join(http_response.streaming_content) == content[95:]
+    http_response = client.get(url, HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE=etag)
+    assert b"".join(http_response.streaming_content) == content[10:20]
+    assert client.get(url, HTTP_RANGE="bytes=200-").status_code == 416
+
+    # Cached copies are revalidated
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    last_modified = client.get(url)["Last-Modified"]
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+    # Staff downloads are handed to the proxy when configured
+    settings.DOCUMENT_DOWNLOAD_OFFLOAD = "x-accel-redirect"
+    client.force_login(users.create(email="bo@example.com", role="bo_user"))
+    http_response = client.get(url)
+    assert http_response.status_code == 200
+    assert http_response["X-Accel-Redirect"] == f"/protected-media/{document.file.name}"
+    assert http_response.content == b""
@@ -0,0 +1,54 @@
+# Imports
+import datetime
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from vendor_management_system.documents import tasks
+from vendor_management_system.documents.models import Document, DocumentType
+
+
+# Test the sweep expires the past due documents and sends one digest per vendor
+@pytest.mark.django_db
+def test_sweep_document_expiry(vendor_factory):
+    today = timezone.localdate()
+    durc = DocumentType.objects.create(name="DURC", reminder_days_before=10)
+    iso = DocumentType.objects.create(name="ISO 9001", reminder_days_before=30)
+    visura = DocumentType.objects.create(name="Visura", reminder_days_before=30)
+    vendor = vendor_factory(address=None, email="vendor@example.com")
+    other = vendor_factory(address=None, email=None)
+
+    def document(vendor, document_type, status, days):
+        return Document.objects.create(
+            vendor=vendor,
+            document_type=document_type,
+            status=status,
+            expiry_date=today + datetime.timedelta(days=days),
+        )
+
+    # Entering the reminder period today
+    document(vendor, durc, "APPROVED", 10)
+    document(vendor, iso, "UPLOADED", 30)
+    document(other, durc, "APPROVED", 10)
+    # Already inside or not yet inside the reminder period
+    document(vendor, visura, "APPROVED", 29)
+    document(other, iso, "APPROVED", 31)
+    # Past due, saved without the status change of Document.save
+    stale = document(other, visura, "APPROVED", 5)
+    Document.objects.filter(pk=stale.pk).update(expiry_date=today - datetime.timedelta(days=1))
+
+    result = tasks.sweep_document_expiry()
+
+    assert result["expired"] == 1
+    assert Document.objects.get(pk=stale.pk).status == "EXPIRED"
+    assert (result["reminded_documents"], result["reminded_vendors"]) == (3, 2)
+    assert (result["digests_sent"], result["vendors_without_email"]) == (1, 1)
+
+    # One digest listing both documents of the vendor
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ["vendor@example.com"]
+    assert "DURC" in mail.outbox[0].body and "ISO 9001" in mail.outbox[0].body
+
+    # A second run has nothing left to expire
+    assert tasks.sweep_document_expiry()["expired"] == 0
@@ -0,0 +1,94 @@
+# Imports
+import datetime
+import os
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from vendor_management_system.documents.models import Document, DocumentBlob, DocumentType
+
+
+# Test identical uploads share one blob and the replaced blobs are reclaimed
+@pytest.mark.django_db
+def test_content_addressed_storage(settings, tmp_path, vendor_factory):
+    settings.MEDIA_ROOT = str(tmp_path)
+    iso = DocumentType.objects.create(name="ISO 9001")
+    vendor, other = vendor_factory(address=None), vendor_factory(address=None)
+
+    # The same certificate uploaded by two vendors is stored once
+    first = Document(vendor=vendor, document_type=iso, status="UPLOADED")
+    first.file.save("iso.pdf", ContentFile(b"certificate"), save=True)
+    second = Document(vendor=other, document_type=iso, status="UPLOADED")
+    second.file.save("ISO-copy.PDF", ContentFile(b"certificate"), save=True)
+
+    assert first.file.name == second.file.name
+    assert first.file.name.startswith("blobs/") and first.file.name.endswith(".pdf")
+    blob = DocumentBlob.objects.get()
+    assert (blob.size, blob.ref_count) == (len(b"certificate"), 2)
+    assert len([path for path in (tmp_path / "blobs").rglob("*") if path.is_file()]) == 1
+
+    # Replacing a file and deleting a document release their references
+    second = Document.objects.get(pk=second.pk)
+    second.file.save("renewed.pdf", ContentFile(b"renewed certificate"), save=True)
+    first.delete()
+    assert DocumentBlob.objects.get(name=blob.name).ref_count == 0
+    assert DocumentBlob.objects.get(name=second.file.name).ref_count == 1
+
+    # The unreferenced blob is kept during the grace period, then reclaimed
+    call_command("gc_document_blobs")
+    assert DocumentBlob.objects.filter(name=blob.name).exists()
+    DocumentBlob.objects.filter(name=blob.name).update(
+        updated_at=blob.updated_at - datetime.timedelta(days=2)
+    )
+    call_command("gc_document_blobs", "--recount")
+    assert [*DocumentBlob.objects.values_list("name", flat=True)] == [second.file.name]
+    assert not (tmp_path / blob.name).exists()
+    assert (tmp_path / second.file.name).read_bytes() == b"renewed certificate"
+
+
+# Test a racing upload of the same content reuses the blob written first
+@pytest.mark.django_db
+def test_content_addressed_storage_race(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    storage = Document._meta.get_field("file").storage
+    first = storage.save("iso.pdf", ContentFile(b"certificate"))
+
+    # The other upload checked before the first one was written
+    monkeypatch.setattr(type(storage), "exists", lambda self, name: False)
+    assert storage.save("copy.pdf", ContentFile(b"certificate")) == first
+    assert [path.name for path in (tmp_path / "blobs").rglob("*") if path.is_file()] == [
+        first.rsplit("/", 1)[1]
+    ]
+    assert DocumentBlob.objects.count() == 1
+
+
+# Test the blob files without row are reclaimed after the grace period
+@pytest.mark.django_db
+def test_collect_garbage_orphan_files(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    storage = Document._meta.get_field("file").storage
+    kept = storage.save("iso.pdf", ContentFile(b"certificate"))
+    with transaction.atomic():
+        orphan = storage.save("rolled-back.pdf", ContentFile(b"rolled back"))
+        transaction.set_rollback(True)
+    recent = storage.save("recent.pdf", ContentFile(b"recent"))
+    DocumentBlob.objects.filter(name=recent).delete()
+
+    # Old files, the recent orphan is still in its grace period
+    old = (timezone.now() - datetime.timedelta(days=2)).timestamp()
+    for name in (kept, orphan):
+        os.utime(tmp_path / name, (old, old))
+    DocumentBlob.objects.update(ref_count=1)
+
+    out = StringIO()
+    call_command("gc_document_blobs", "--dry-run", stdout=out)
+    assert "1 blobs, 11 bytes" in out.getvalue()
+    assert (tmp_path / orphan).exists()
+
+    call_command("gc_document_blobs", stdout=StringIO())
+    assert not (tmp_path / orphan).exists()
+    assert (tmp_path / kept).exists() and (tmp_path / recent).exists()
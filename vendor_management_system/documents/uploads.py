@@ -0,0 +1,204 @@
+# Imports
+import datetime
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from vendor_management_system.documents.models import Document, DocumentUpload
+
+
+# Largest chunk accepted by a single request and largest file
+UPLOAD_CHUNK_MAX_BYTES = 8 * 1024 * 1024
+UPLOAD_MAX_BYTES = 512 * 1024 * 1024
+
+# Bytes read from the request per write to the spool
+UPLOAD_READ_BYTES = 64 * 1024
+
+
+# Error of a step of the chunked upload, with the HTTP status to answer
+class UploadError(Exception):
+    def __init__(self, message, status=400, **data):
+        super().__init__(message)
+        self.status = status
+        self.data = data
+
+
+# File of a spool, moved (not copied) into the storage when it is saved
+class SpooledFile(File):
+    def temporary_file_path(self):
+        return self.file.name
+
+
+# Function to get the largest chunk accepted by a single request
+def chunk_max_bytes():
+    return getattr(settings, "DOCUMENT_UPLOAD_CHUNK_MAX_BYTES", UPLOAD_CHUNK_MAX_BYTES)
+
+
+# Function to get the directory of the spooled uploads
+def spool_root():
+    return getattr(
+        settings,
+        "DOCUMENT_UPLOAD_SPOOL_ROOT",
+        os.path.join(settings.MEDIA_ROOT, "upload_spool"),
+    )
+
+
+# Function to get the spool file of an upload
+def spool_path(upload):
+    return os.path.join(spool_root(), f"{upload.pk}.part")
+
+
+# Function to create or update the document of a vendor with a new file
+def save_vendor_document(vendor, document_type, file, issue_date=None, expiry_date=None, notes=""):
+    with transaction.atomic():
+        document, created = Document.objects.select_for_update().get_or_create(
+            vendor=vendor,
+            document_type=document_type,
+            defaults={
+                "file": file,
+                "issue_date": issue_date,
+                "expiry_date": expiry_date,
+                "notes": notes,
+                "status": "UPLOADED",
+            },
+        )
+
+        if not created:
+            # Update existing document
+            document.file = file
+            document.issue_date = issue_date
+            document.expiry_date = expiry_date
+            document.notes = notes
+            document.status = "UPLOADED"
+            document.save()
+
+    return document, created
+
+
+# Function to start a chunked upload
+def start_upload(vendor, document_type, filename, size, user=None, **metadata):
+    if size <= 0 or size > getattr(settings, "DOCUMENT_UPLOAD_MAX_BYTES", UPLOAD_MAX_BYTES):
+        raise UploadError(f"Invalid file size: {size}")
+
+    upload = DocumentUpload.objects.create(
+        vendor=vendor,
+        document_type=document_type,
+        filename=os.path.basename(filename)[:255],
+        size=size,
+        created_by=user,
+        **metadata,
+    )
+
+    # Empty spool file, the chunks are written at their offset
+    os.makedirs(spool_root(), exist_ok=True)
+    open(spool_path(upload), "wb").close()
+    return upload
+
+
+# Function to append a chunk read from a stream to the spool of an upload
+def write_chunk(upload_id, offset, stream, length, checksum):
+    """
+    The chunk must start at the bytes already received, so a client resumes
+    by asking the offset and sending the rest. The chunk is streamed and
+    hashed into a file next to the spool without holding any lock, as the
+    client may be slow; the upload row is then locked only to check the
+    offset again, copy the chunk into the spool and move the offset forward.
+    A chunk accepted meanwhile by another request is never overwritten.
+    """
+    if length <= 0 or length > chunk_max_bytes():
+        raise UploadError(f"Invalid chunk size: {length}")
+    if not checksum:
+        raise UploadError("Missing chunk checksum")
+
+    upload = DocumentUpload.objects.get(pk=upload_id)
+    if offset != upload.offset:
+        raise UploadError("Unexpected offset", status=409, offset=upload.offset)
+    if offset + length > upload.size:
+        raise UploadError("The chunk exceeds the file size", offset=upload.offset)
+
+    with tempfile.TemporaryFile(dir=spool_root()) as chunk:
+        # Stream the chunk to disk
+        sha256 = hashlib.sha256()
+        received = 0
+        while received < length:
+            data = stream.read(min(UPLOAD_READ_BYTES, length - received))
+            if not data:
+                break
+            sha256.update(data)
+            chunk.write(data)
+            received += len(data)
+
+        # Discard an incomplete or corrupted chunk
+        if received != length or sha256.hexdigest() != checksum.lower():
+            raise UploadError(
+                "Chunk checksum mismatch" if received == length else "Incomplete chunk",
+                offset=upload.offset,
+            )
+
+        with transaction.atomic():
+            # Another chunk may have been accepted meanwhile
+            upload = DocumentUpload.objects.select_for_update().get(pk=upload_id)
+            if offset != upload.offset:
+                raise UploadError("Unexpected offset", status=409, offset=upload.offset)
+
+            # Copy the chunk, the spool is cut back if the copy fails
+            chunk.seek(0)
+            with open(spool_path(upload), "r+b") as spool:
+                try:
+                    spool.seek(offset)
+                    shutil.copyfileobj(chunk, spool, UPLOAD_READ_BYTES)
+                except OSError:
+                    spool.truncate(offset)
+                    raise
+                spool.truncate(offset + length)
+
+            upload.offset = offset + length
+            upload.save(update_fields=["offset", "updated_at"])
+
+    return upload
+
+
+# Function to turn a complete upload into the document of the vendor
+def finish_upload(upload_id):
+    with transaction.atomic():
+        upload = DocumentUpload.objects.select_for_update().get(pk=upload_id)
+        if upload.offset != upload.size:
+            raise UploadError("The upload is not complete", status=409, offset=upload.offset)
+
+        # The storage hashes the spool and moves it into place
+        path = spool_path(upload)
+        with open(path, "rb") as spool:
+            file = SpooledFile(spool, name=upload.filename)
+            document, created = save_vendor_document(
+                upload.vendor,
+                upload.document_type,
+                file,
+                issue_date=upload.issue_date,
+                expiry_date=upload.expiry_date,
+                notes=upload.notes,
+            )
+        upload.delete()
+
+    # An identical blob already existed: the spool was not moved
+    if os.path.exists(path):
+        os.remove(path)
+    return document, created
+
+
+# Function to delete the uploads abandoned for longer than a period
+def purge_stale_uploads(max_age=datetime.timedelta(days=2)):
+    stale = DocumentUpload.objects.filter(updated_at__lt=timezone.now() - max_age)
+    count = 0
+    for upload in stale.iterator():
+        path = spool_path(upload)
+        if os.path.exists(path):
+            os.remove(path)
+        upload.delete()
+        count += 1
+    return count
@@ -1,7 +1,9 @@
 from django.urls import path
 from vendor_management_system.documents.views import (
     AdminDashboardView, BackOfficeDashboardView, VendorPortalView, 
-    DocumentUploadView, DocumentReviewView
+    DocumentUploadView, DocumentReviewView, ComplianceHeatmapView,
+    ChunkedUploadStartView, ChunkedUploadView, ChunkedUploadFinishView,
+    DocumentDownloadView
 )
 
 urlpatterns = [
@@ -10,8 +12,13 @@ urlpatterns = [
     path('backoffice/', BackOfficeDashboardView.as_view(), name='backoffice-dashboard'),
     path('dashboard/', AdminDashboardView.as_view(), name='admin-dashboard'),
     path('portal/', VendorPortalView.as_view(), name='vendor-portal'),
+    path('compliance/heatmap/', ComplianceHeatmapView.as_view(), name='compliance-heatmap'),
     # Actions
     path('upload/', DocumentUploadView.as_view(), name='document-upload'),
+    path('uploads/', ChunkedUploadStartView.as_view(), name='document-upload-start'),
+    path('uploads/<uuid:upload_id>/', ChunkedUploadView.as_view(), name='document-upload-chunk'),
+    path('uploads/<uuid:upload_id>/finish/', ChunkedUploadFinishView.as_view(), name='document-upload-finish'),
+    path('download/<str:document_id>/', DocumentDownloadView.as_view(), name='document-download'),
     path('review/<str:document_id>/', DocumentReviewView.as_view(), name='document-review'),
     
     # Backward compatibility
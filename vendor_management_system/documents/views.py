@@ -1,16 +1,26 @@
+import json
+import os
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import TemplateView
 from django.views import View
 from django.contrib import messages
 from django.utils import timezone
-from django.db.models import Q, Count
-from django.http import JsonResponse
+from django.db.models import Q
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse
+from django.utils import dateparse
 
 from vendor_management_system.core.permissions import (
-    AdminRequiredMixin, BackOfficeRequiredMixin, VendorRequiredMixin
+    AdminRequiredMixin, BackOfficeRequiredMixin, VendorRequiredMixin,
+    can_access_vendor_data
+)
+from vendor_management_system.documents import compliance, downloads, uploads
+from vendor_management_system.documents.dashboard import documents_to_review, get_dashboard_metrics
+from vendor_management_system.documents.models import (
+    Document, DocumentType, DocumentUpload
 )
-from vendor_management_system.documents.models import Document, DocumentType
 from vendor_management_system.vendors.models import Vendor
 
 
@@ -36,39 +46,22 @@ class AdminDashboardView(AdminRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Statistics complete per admin
-        total_documents = Document.objects.count()
-        pending_review = Document.objects.filter(status='UPLOADED').count()
-        
-        # Count expiring documents
-        expiring_soon = 0
-        for doc in Document.objects.filter(status__in=['APPROVED', 'UPLOADED']):
-            if doc.is_expiring_soon:
-                expiring_soon += 1
-        
-        expired = Document.objects.filter(status='EXPIRED').count()
+        # Statistics complete per admin, from the background snapshot
+        metrics = get_dashboard_metrics()
         
         # Recent documents
         recent_documents = Document.objects.select_related('vendor', 'document_type').order_by('-uploaded_at')[:15]
         
-        # Documents by status
-        status_counts = Document.objects.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
-        
-        # Vendor statistics
-        total_vendors = Vendor.objects.count()
-        vendors_with_docs = Vendor.objects.filter(documents__isnull=False).distinct().count()
-        
         context.update({
-            'total_documents': total_documents,
-            'pending_review': pending_review,
-            'expiring_soon': expiring_soon,
-            'expired': expired,
+            'total_documents': metrics['total_documents'],
+            'pending_review': metrics['pending_review'],
+            'expiring_soon': metrics['expiring_soon'],
+            'expired': metrics['expired'],
             'recent_documents': recent_documents,
-            'status_counts': status_counts,
-            'total_vendors': total_vendors,
-            'vendors_with_docs': vendors_with_docs,
+            'status_counts': metrics['status_counts'],
+            'total_vendors': metrics['total_vendors'],
+            'vendors_with_docs': metrics['vendors_with_docs'],
+            'metrics_computed_at': metrics['computed_at'],
             'user_role': 'admin',
         })
         
@@ -87,9 +80,7 @@ class BackOfficeDashboardView(BackOfficeRequiredMixin, TemplateView):
         pending_review = Document.objects.filter(status='UPLOADED').count()
         
         # Recent documents da revisionare
-        documents_to_review = Document.objects.filter(
-            status='UPLOADED'
-        ).select_related('vendor', 'document_type').order_by('-uploaded_at')[:10]
+        to_review = documents_to_review()[:10]
         
         # Vendor senza documenti
         vendors_without_docs = Vendor.objects.filter(documents__isnull=True)[:5]
@@ -97,7 +88,7 @@ class BackOfficeDashboardView(BackOfficeRequiredMixin, TemplateView):
         context.update({
             'total_documents': total_documents,
             'pending_review': pending_review,
-            'documents_to_review': documents_to_review,
+            'documents_to_review': to_review,
             'vendors_without_docs': vendors_without_docs,
             'user_role': 'backoffice',
         })
@@ -115,23 +106,29 @@ class VendorPortalView(VendorRequiredMixin, TemplateView):
         # Solo documenti del vendor dell'utente loggato
         vendor = self.request.user.vendor
         
-        # Get required document types
-        required_types = DocumentType.objects.filter(is_required=True)
+        # Required types and their state for the vendor, from the cached matrix
+        vendor_compliance = compliance.vendor_compliance(vendor.vendor_code)
+        required_types = vendor_compliance['types']
+        states = dict(zip(
+            [doc_type['id'] for doc_type in required_types], vendor_compliance['states']
+        ))
         
         # Get vendor's documents
-        vendor_documents = Document.objects.filter(
+        vendor_documents = [*Document.objects.filter(
             vendor=vendor
-        ).select_related('document_type')
+        ).select_related('document_type')]
         
         # Check which documents are missing
-        existing_types = vendor_documents.values_list('document_type_id', flat=True)
-        missing_types = required_types.exclude(id__in=existing_types)
+        missing_types = [
+            doc_type for doc_type in required_types
+            if states[doc_type['id']] == compliance.STATE_CODES['MISSING']
+        ]
         
-        # Documenti in scadenza del vendor
-        expiring_docs = []
-        for doc in vendor_documents.filter(status__in=['APPROVED', 'UPLOADED']):
-            if doc.is_expiring_soon:
-                expiring_docs.append(doc)
+        # Documenti in scadenza del vendor, anche quelli non obbligatori
+        expiring_docs = [
+            doc for doc in vendor_documents
+            if doc.status in ['APPROVED', 'UPLOADED'] and doc.is_expiring_soon
+        ]
         
         context.update({
             'vendor': vendor,
@@ -145,6 +142,30 @@ class VendorPortalView(VendorRequiredMixin, TemplateView):
         return context
 
 
+class ComplianceHeatmapView(BackOfficeRequiredMixin, View):
+    """Matrice di conformità documentale di tutti i fornitori"""
+    
+    def get(self, request, *args, **kwargs):
+        # Filtro opzionale sui codici fornitore
+        vendor_codes = request.GET.get('vendor_code')
+        vendor_codes = vendor_codes.split(',') if vendor_codes else None
+        
+        matrix = compliance.compliance_matrix(vendor_codes)
+        
+        # Una cifra esadecimale per tipo documento richiesto, nell'ordine di types
+        return JsonResponse({
+            'types': [
+                {'id': doc_type['id'], 'name': doc_type['name']}
+                for doc_type in matrix['types']
+            ],
+            'states': compliance.COMPLIANCE_STATES,
+            'vendors': {
+                vendor_code: compliance.pack_states(states)
+                for vendor_code, states in matrix['vendors'].items()
+            },
+        })
+
+
 class DocumentUploadView(VendorRequiredMixin, View):
     """Upload documenti - solo per il proprio vendor"""
     
@@ -161,27 +182,15 @@ class DocumentUploadView(VendorRequiredMixin, View):
             document_type = get_object_or_404(DocumentType, id=document_type_id)
             
             # Create or update document per il vendor dell'utente
-            document, created = Document.objects.get_or_create(
-                vendor=vendor,
-                document_type=document_type,
-                defaults={
-                    'file': file,
-                    'issue_date': issue_date if issue_date else None,
-                    'expiry_date': expiry_date if expiry_date else None,
-                    'notes': notes,
-                    'status': 'UPLOADED'
-                }
+            uploads.save_vendor_document(
+                vendor,
+                document_type,
+                file,
+                issue_date=dateparse.parse_date(issue_date) if issue_date else None,
+                expiry_date=dateparse.parse_date(expiry_date) if expiry_date else None,
+                notes=notes,
             )
             
-            if not created:
-                # Update existing document
-                document.file = file
-                document.issue_date = issue_date if issue_date else None
-                document.expiry_date = expiry_date if expiry_date else None
-                document.notes = notes
-                document.status = 'UPLOADED'
-                document.save()
-            
             messages.success(request, f'Documento {document_type.name} caricato con successo!')
             
         except Exception as e:
@@ -190,6 +199,108 @@ class DocumentUploadView(VendorRequiredMixin, View):
         return redirect('vendor-portal')
 
 
+class ChunkedUploadStartView(VendorRequiredMixin, View):
+    """Avvio di un caricamento a blocchi per il proprio vendor"""
+    
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+            if not isinstance(data, dict):
+                raise ValueError('JSON object expected')
+            document_type = DocumentType.objects.get(id=data.get('document_type'))
+            dates = {
+                name: dateparse.parse_date(data[name]) if data.get(name) else None
+                for name in ('issue_date', 'expiry_date')
+            }
+            upload = uploads.start_upload(
+                request.user.vendor,
+                document_type,
+                str(data.get('filename') or 'document'),
+                int(data.get('size') or 0),
+                user=request.user,
+                notes=str(data.get('notes') or ''),
+                **dates,
+            )
+        except (ValueError, TypeError):
+            return JsonResponse({'detail': 'Invalid request'}, status=400)
+        except DocumentType.DoesNotExist:
+            return JsonResponse({'detail': 'Document type not found'}, status=400)
+        except uploads.UploadError as error:
+            return JsonResponse({'detail': str(error), **error.data}, status=error.status)
+        
+        return JsonResponse({
+            'upload_id': str(upload.pk),
+            'offset': upload.offset,
+            'size': upload.size,
+            'chunk_size': uploads.chunk_max_bytes(),
+        }, status=201)
+
+
+class ChunkedUploadView(VendorRequiredMixin, View):
+    """Stato del caricamento (per riprenderlo) e invio di un blocco"""
+    
+    def get_upload(self, request, upload_id):
+        # Solo i caricamenti del vendor dell'utente loggato
+        return get_object_or_404(DocumentUpload, pk=upload_id, vendor=request.user.vendor)
+    
+    def get(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        return JsonResponse({'offset': upload.offset, 'size': upload.size})
+    
+    def put(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        try:
+            offset = int(request.GET.get('offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return JsonResponse({'detail': 'Invalid offset'}, status=400)
+        
+        # Il blocco viene letto dal corpo della richiesta e scritto su disco
+        try:
+            upload = uploads.write_chunk(
+                upload.pk, offset, request, length, request.headers.get('X-Chunk-SHA256')
+            )
+        except uploads.UploadError as error:
+            return JsonResponse({'detail': str(error), **error.data}, status=error.status)
+        
+        return JsonResponse({'offset': upload.offset, 'size': upload.size})
+
+
+class ChunkedUploadFinishView(VendorRequiredMixin, View):
+    """Completamento del caricamento: crea o aggiorna il documento"""
+    
+    def post(self, request, upload_id):
+        upload = get_object_or_404(DocumentUpload, pk=upload_id, vendor=request.user.vendor)
+        try:
+            document, created = uploads.finish_upload(upload.pk)
+        except uploads.UploadError as error:
+            return JsonResponse({'detail': str(error), **error.data}, status=error.status)
+        
+        return JsonResponse({
+            'document_id': document.pk,
+            'created': created,
+            'status': document.status,
+        }, status=201 if created else 200)
+
+
+class DocumentDownloadView(LoginRequiredMixin, View):
+    """Download di un documento: staff per tutti i fornitori, Vendor solo i propri"""
+    
+    def get(self, request, document_id):
+        document = get_object_or_404(
+            Document.objects.select_related('document_type'), id=document_id
+        )
+        if not can_access_vendor_data(request.user, document.vendor_id):
+            raise PermissionDenied("Non puoi accedere ai documenti di altri fornitori.")
+        if not document.file or not document.file.storage.exists(document.file.name):
+            raise Http404("File non disponibile")
+        
+        # Nome leggibile, i file sono salvati per contenuto
+        extension = os.path.splitext(document.file.name)[1]
+        filename = f"{document.vendor_id}_{document.document_type.name}{extension}"
+        return downloads.file_response(request, document.file, filename)
+
+
 class DocumentReviewView(BackOfficeRequiredMixin, View):
     """Approvazione/rifiuto documenti - solo per BO users e Admin"""
     
@@ -2,7 +2,9 @@
 from django.contrib import admin
 
 from vendor_management_system.historical_performances.models import (
+    CategoryPerformanceDistribution,
     HistoricalPerformance,
+    HistoricalPerformanceRollup,
 )
 
 
@@ -47,3 +49,38 @@ class HistoricalPerformanceAdmin(admin.ModelAdmin):
     ]
     ordering = ["date"]
     list_filter = ["vendor"]
+
+
+# Register HistoricalPerformanceRollup model in admin
+@admin.register(HistoricalPerformanceRollup)
+class HistoricalPerformanceRollupAdmin(admin.ModelAdmin):
+    list_display = [
+        "vendor",
+        "resolution",
+        "period_start",
+        "sample_count",
+        "on_time_delivery_rate_avg",
+        "quality_rating_avg_avg",
+        "average_response_time_avg",
+        "fulfillment_rate_avg",
+    ]
+    search_fields = ["vendor__name"]
+    ordering = ["-period_start"]
+    list_filter = ["resolution", "vendor"]
+
+    # The rollups are only written by the rollup task
+    def get_readonly_fields(self, request, obj=None):
+        return [field.name for field in self.model._meta.fields]
+
+
+# Register CategoryPerformanceDistribution model in admin
+@admin.register(CategoryPerformanceDistribution)
+class CategoryPerformanceDistributionAdmin(admin.ModelAdmin):
+    list_display = ["category", "metric", "vendor_count", "computed_at"]
+    search_fields = ["category__name", "metric"]
+    ordering = ["category", "metric"]
+    list_filter = ["metric"]
+
+    # The distributions are only written by the distribution task
+    def get_readonly_fields(self, request, obj=None):
+        return [field.name for field in self.model._meta.fields]
@@ -0,0 +1,109 @@
+# Imports
+import bisect
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    CategoryPerformanceDistribution,
+)
+from vendor_management_system.purchase_orders.kpis import KPI_FIELDS
+from vendor_management_system.vendors.models import Vendor
+
+
+# Metrics where a lower value is a better performance
+LOWER_IS_BETTER = ("average_response_time",)
+
+
+# Function to get the value at each percentile of a sorted list
+def percentile_cutpoints(values):
+    last = len(values) - 1
+    return [values[round(last * percentile / 100)] for percentile in range(101)]
+
+
+# Function to rank a value against the cutpoints of a distribution
+def percentile_rank(cutpoints, value, lower_is_better=False):
+    below = bisect.bisect_left(cutpoints, value)
+    above = len(cutpoints) - bisect.bisect_right(cutpoints, value)
+    ties = len(cutpoints) - below - above
+
+    # Share of the peers outperformed, ties count for half
+    beaten = above if lower_is_better else below
+    return round(100 * (beaten + ties / 2) / len(cutpoints), 1)
+
+
+# Function to compute the KPI distribution of the vendors of each category
+def compute_category_distributions():
+    # One query for the KPIs of all the active vendors with a category
+    values = defaultdict(lambda: defaultdict(list))
+    for row in (
+        Vendor.objects.filter(is_active=True, category__isnull=False)
+        .order_by()
+        .values("category_id", *KPI_FIELDS)
+        .iterator()
+    ):
+        for field in KPI_FIELDS:
+            if row[field] is not None:
+                values[row["category_id"]][field].append(row[field])
+
+    # Build the distributions
+    computed_at = timezone.now()
+    distributions = [
+        CategoryPerformanceDistribution(
+            category_id=category_id,
+            metric=field,
+            vendor_count=len(metric_values),
+            cutpoints=percentile_cutpoints(sorted(metric_values)),
+            computed_at=computed_at,
+        )
+        for category_id, metrics in values.items()
+        for field, metric_values in metrics.items()
+    ]
+
+    # Backends without a conflict target (MySQL) use the unique constraint
+    unique_fields = None
+    if connection.features.supports_update_conflicts_with_target:
+        unique_fields = ["category", "metric"]
+
+    # Replace the distributions and drop the ones without vendors anymore
+    with transaction.atomic():
+        CategoryPerformanceDistribution.objects.bulk_create(
+            distributions,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=["vendor_count", "cutpoints", "computed_at"],
+        )
+        CategoryPerformanceDistribution.objects.filter(
+            computed_at__lt=computed_at
+        ).delete()
+
+    return len(distributions)
+
+
+# Function to rank the current KPIs of a vendor against its category peers
+def vendor_cohort(vendor):
+    distributions = {
+        distribution.metric: distribution
+        for distribution in CategoryPerformanceDistribution.objects.filter(
+            category_id=vendor.category_id
+        )
+    }
+
+    metrics = {}
+    for field in KPI_FIELDS:
+        value = getattr(vendor, field)
+        distribution = distributions.get(field)
+        metrics[field] = {
+            "value": value,
+            "percentile": (
+                percentile_rank(
+                    distribution.cutpoints, value, field in LOWER_IS_BETTER
+                )
+                if distribution and value is not None
+                else None
+            ),
+            "peers": distribution.vendor_count if distribution else 0,
+            "computed_at": distribution.computed_at if distribution else None,
+        }
+    return metrics
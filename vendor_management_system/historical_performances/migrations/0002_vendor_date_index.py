@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historical_performances', '0001_initial'),
+        ('vendors', '0005_vendor_is_active'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicalperformance',
+            index=models.Index(fields=['vendor', '-date'], name='historical__vendor__c4f425_idx'),
+        ),
+    ]
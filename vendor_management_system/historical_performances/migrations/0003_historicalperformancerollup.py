@@ -0,0 +1,52 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historical_performances', '0002_vendor_date_index'),
+        ('vendors', '0005_vendor_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoricalPerformanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('DAY', 'Daily'), ('WEEK', 'Weekly'), ('MONTH', 'Monthly')], help_text='Length of the aggregated period', max_length=10, verbose_name='Resolution')),
+                ('period_start', models.DateField(help_text='First day of the aggregated period', verbose_name='Period Start')),
+                ('sample_count', models.PositiveIntegerField(default=0, help_text='Number of raw snapshots aggregated in the period', verbose_name='Sample Count')),
+                ('last_date', models.DateTimeField(help_text='Date of the last snapshot in the period', verbose_name='Last Snapshot Date')),
+                ('on_time_delivery_rate_min', models.FloatField(blank=True, null=True, verbose_name='On-time Delivery Rate Min')),
+                ('on_time_delivery_rate_max', models.FloatField(blank=True, null=True, verbose_name='On-time Delivery Rate Max')),
+                ('on_time_delivery_rate_avg', models.FloatField(blank=True, null=True, verbose_name='On-time Delivery Rate Avg')),
+                ('on_time_delivery_rate_last', models.FloatField(blank=True, null=True, verbose_name='On-time Delivery Rate Last')),
+                ('quality_rating_avg_min', models.FloatField(blank=True, null=True, verbose_name='Quality Rating Average Min')),
+                ('quality_rating_avg_max', models.FloatField(blank=True, null=True, verbose_name='Quality Rating Average Max')),
+                ('quality_rating_avg_avg', models.FloatField(blank=True, null=True, verbose_name='Quality Rating Average Avg')),
+                ('quality_rating_avg_last', models.FloatField(blank=True, null=True, verbose_name='Quality Rating Average Last')),
+                ('average_response_time_min', models.FloatField(blank=True, null=True, verbose_name='Average Response Time Min')),
+                ('average_response_time_max', models.FloatField(blank=True, null=True, verbose_name='Average Response Time Max')),
+                ('average_response_time_avg', models.FloatField(blank=True, null=True, verbose_name='Average Response Time Avg')),
+                ('average_response_time_last', models.FloatField(blank=True, null=True, verbose_name='Average Response Time Last')),
+                ('fulfillment_rate_min', models.FloatField(blank=True, null=True, verbose_name='Fulfillment Rate Min')),
+                ('fulfillment_rate_max', models.FloatField(blank=True, null=True, verbose_name='Fulfillment Rate Max')),
+                ('fulfillment_rate_avg', models.FloatField(blank=True, null=True, verbose_name='Fulfillment Rate Avg')),
+                ('fulfillment_rate_last', models.FloatField(blank=True, null=True, verbose_name='Fulfillment Rate Last')),
+                ('vendor', models.ForeignKey(help_text='Vendor associated with the rollup', on_delete=django.db.models.deletion.CASCADE, to='vendors.vendor', verbose_name='Vendor')),
+            ],
+            options={
+                'verbose_name': 'Historical Performance Rollup',
+                'verbose_name_plural': 'Historical Performance Rollups',
+                'ordering': ['resolution', '-period_start'],
+                'indexes': [models.Index(fields=['resolution', 'period_start'], name='historical__resolut_eaf393_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='historicalperformancerollup',
+            constraint=models.UniqueConstraint(fields=('vendor', 'resolution', 'period_start'), name='unique_historical_performance_rollup_period'),
+        ),
+    ]
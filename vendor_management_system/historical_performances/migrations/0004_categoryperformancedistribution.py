@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:19
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historical_performances', '0003_historicalperformancerollup'),
+        ('vendors', '0005_vendor_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryPerformanceDistribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(help_text='Name of the vendor KPI', max_length=50, verbose_name='Metric')),
+                ('vendor_count', models.PositiveIntegerField(default=0, help_text='Number of vendors with a value for the metric', verbose_name='Vendor Count')),
+                ('cutpoints', models.JSONField(default=list, help_text='Values of the metric at each percentile from 0 to 100', verbose_name='Cutpoints')),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Date of the computation of the distribution', verbose_name='Computed At')),
+                ('category', models.ForeignKey(help_text='Category of the vendors in the distribution', on_delete=django.db.models.deletion.CASCADE, related_name='performance_distributions', to='vendors.category', verbose_name='Category')),
+            ],
+            options={
+                'verbose_name': 'Category Performance Distribution',
+                'verbose_name_plural': 'Category Performance Distributions',
+                'ordering': ['category', 'metric'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='categoryperformancedistribution',
+            constraint=models.UniqueConstraint(fields=('category', 'metric'), name='unique_category_performance_distribution_metric'),
+        ),
+    ]
@@ -70,17 +70,172 @@ class HistoricalPerformance(models.Model):
         verbose_name = _("Historical Performance")
         verbose_name_plural = _("Historical Performances")
         ordering = ["-date"]
+        indexes = [models.Index(fields=["vendor", "-date"])]
 
     # String representation
     def __str__(self):
         return f"{self.vendor} - {self.date}"
 
+    # Method to generate a new id
+    @staticmethod
+    def generate_id():
+        return str(uuid.uuid4()).replace("-", "")[:10].upper()
+
     # Save method
     def save(self, *args, **kwargs):
         # If id is not specified
         if not self.id:
             # Generate a new id
-            self.id = str(uuid.uuid4()).replace("-", "")[:10].upper()
+            self.id = self.generate_id()
 
         # Save the model
         super(HistoricalPerformance, self).save(*args, **kwargs)
+
+
+# Model for HistoricalPerformanceRollup
+class HistoricalPerformanceRollup(models.Model):
+    # Resolution Choices
+    RESOLUTION_DAY = "DAY"
+    RESOLUTION_WEEK = "WEEK"
+    RESOLUTION_MONTH = "MONTH"
+    RESOLUTION_CHOICES = [
+        (RESOLUTION_DAY, _("Daily")),
+        (RESOLUTION_WEEK, _("Weekly")),
+        (RESOLUTION_MONTH, _("Monthly")),
+    ]
+
+    # Fields
+    vendor = models.ForeignKey(
+        "vendors.Vendor",
+        on_delete=models.CASCADE,
+        verbose_name=_("Vendor"),
+        help_text=_("Vendor associated with the rollup"),
+    )
+    resolution = models.CharField(
+        _("Resolution"),
+        max_length=10,
+        choices=RESOLUTION_CHOICES,
+        help_text=_("Length of the aggregated period"),
+    )
+    period_start = models.DateField(
+        _("Period Start"), help_text=_("First day of the aggregated period")
+    )
+    sample_count = models.PositiveIntegerField(
+        _("Sample Count"),
+        default=0,
+        help_text=_("Number of raw snapshots aggregated in the period"),
+    )
+    last_date = models.DateTimeField(
+        _("Last Snapshot Date"), help_text=_("Date of the last snapshot in the period")
+    )
+    on_time_delivery_rate_min = models.FloatField(
+        _("On-time Delivery Rate Min"), null=True, blank=True
+    )
+    on_time_delivery_rate_max = models.FloatField(
+        _("On-time Delivery Rate Max"), null=True, blank=True
+    )
+    on_time_delivery_rate_avg = models.FloatField(
+        _("On-time Delivery Rate Avg"), null=True, blank=True
+    )
+    on_time_delivery_rate_last = models.FloatField(
+        _("On-time Delivery Rate Last"), null=True, blank=True
+    )
+    quality_rating_avg_min = models.FloatField(
+        _("Quality Rating Average Min"), null=True, blank=True
+    )
+    quality_rating_avg_max = models.FloatField(
+        _("Quality Rating Average Max"), null=True, blank=True
+    )
+    quality_rating_avg_avg = models.FloatField(
+        _("Quality Rating Average Avg"), null=True, blank=True
+    )
+    quality_rating_avg_last = models.FloatField(
+        _("Quality Rating Average Last"), null=True, blank=True
+    )
+    average_response_time_min = models.FloatField(
+        _("Average Response Time Min"), null=True, blank=True
+    )
+    average_response_time_max = models.FloatField(
+        _("Average Response Time Max"), null=True, blank=True
+    )
+    average_response_time_avg = models.FloatField(
+        _("Average Response Time Avg"), null=True, blank=True
+    )
+    average_response_time_last = models.FloatField(
+        _("Average Response Time Last"), null=True, blank=True
+    )
+    fulfillment_rate_min = models.FloatField(
+        _("Fulfillment Rate Min"), null=True, blank=True
+    )
+    fulfillment_rate_max = models.FloatField(
+        _("Fulfillment Rate Max"), null=True, blank=True
+    )
+    fulfillment_rate_avg = models.FloatField(
+        _("Fulfillment Rate Avg"), null=True, blank=True
+    )
+    fulfillment_rate_last = models.FloatField(
+        _("Fulfillment Rate Last"), null=True, blank=True
+    )
+
+    # Metadata
+    class Meta:
+        verbose_name = _("Historical Performance Rollup")
+        verbose_name_plural = _("Historical Performance Rollups")
+        ordering = ["resolution", "-period_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "resolution", "period_start"],
+                name="unique_historical_performance_rollup_period",
+            )
+        ]
+        indexes = [models.Index(fields=["resolution", "period_start"])]
+
+    # String representation
+    def __str__(self):
+        return f"{self.vendor} - {self.resolution} {self.period_start}"
+
+
+# Model for CategoryPerformanceDistribution
+class CategoryPerformanceDistribution(models.Model):
+    # Fields
+    category = models.ForeignKey(
+        "vendors.Category",
+        on_delete=models.CASCADE,
+        verbose_name=_("Category"),
+        related_name="performance_distributions",
+        help_text=_("Category of the vendors in the distribution"),
+    )
+    metric = models.CharField(
+        _("Metric"), max_length=50, help_text=_("Name of the vendor KPI")
+    )
+    vendor_count = models.PositiveIntegerField(
+        _("Vendor Count"),
+        default=0,
+        help_text=_("Number of vendors with a value for the metric"),
+    )
+    cutpoints = models.JSONField(
+        _("Cutpoints"),
+        default=list,
+        help_text=_("Values of the metric at each percentile from 0 to 100"),
+    )
+    computed_at = models.DateTimeField(
+        _("Computed At"),
+        default=timezone.now,
+        help_text=_("Date of the computation of the distribution"),
+    )
+
+    # Metadata
+    class Meta:
+        verbose_name = _("Category Performance Distribution")
+        verbose_name_plural = _("Category Performance Distributions")
+        ordering = ["category", "metric"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "metric"],
+                name="unique_category_performance_distribution_metric",
+            )
+        ]
+
+    # String representation
+    def __str__(self):
+        return f"{self.category} - {self.metric}"
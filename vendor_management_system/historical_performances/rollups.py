@@ -0,0 +1,376 @@
+# Imports
+import datetime
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    HistoricalPerformance,
+    HistoricalPerformanceRollup,
+)
+from vendor_management_system.purchase_orders.kpis import KPI_FIELDS
+
+
+# Resolutions from the finest to the coarsest with their approximate length
+RAW = "RAW"
+DAY = HistoricalPerformanceRollup.RESOLUTION_DAY
+WEEK = HistoricalPerformanceRollup.RESOLUTION_WEEK
+MONTH = HistoricalPerformanceRollup.RESOLUTION_MONTH
+RESOLUTION_STEPS = {
+    RAW: datetime.timedelta(hours=6),
+    DAY: datetime.timedelta(days=1),
+    WEEK: datetime.timedelta(days=7),
+    MONTH: datetime.timedelta(days=30),
+}
+
+# Default retention in days of each resolution (None keeps the rows forever)
+DEFAULT_RETENTION_DAYS = {RAW: 90, DAY: 730, WEEK: 1825, MONTH: None}
+
+# Default maximum number of points returned by the history query
+DEFAULT_MAX_POINTS = 500
+
+# Aggregates kept for each metric
+AGGREGATES = ("min", "max", "avg", "last")
+
+# Database truncation of the raw snapshots for each resolution
+TRUNCATIONS = {DAY: TruncDay, WEEK: TruncWeek, MONTH: TruncMonth}
+
+# Short names of the metrics in the columnar series
+SERIES_KEYS = {
+    "on_time_delivery_rate": "on_time",
+    "quality_rating_avg": "quality",
+    "average_response_time": "response_time",
+    "fulfillment_rate": "fulfillment",
+}
+
+
+# Function to get the retention in days of each resolution
+def retention_days():
+    return {
+        **DEFAULT_RETENTION_DAYS,
+        **getattr(settings, "HISTORICAL_PERFORMANCE_RETENTION_DAYS", {}),
+    }
+
+
+# Function to get the first day of the period of a date
+def period_start(day, resolution):
+    if resolution == WEEK:
+        return day - datetime.timedelta(days=day.weekday())
+    if resolution == MONTH:
+        return day.replace(day=1)
+    return day
+
+
+# Function to start an empty bucket
+def new_bucket():
+    bucket = {"sample_count": 0, "last_date": None}
+    for field in KPI_FIELDS:
+        bucket.update(
+            {f"{field}_min": None, f"{field}_max": None, f"{field}_last": None}
+        )
+        bucket[f"_{field}_sum"] = 0.0
+        bucket[f"_{field}_count"] = 0
+    return bucket
+
+
+# Function to add a sample (a raw snapshot or a finer rollup) to a bucket
+def add_sample(bucket, date, count, values):
+    bucket["sample_count"] += count
+    is_last = bucket["last_date"] is None or date >= bucket["last_date"]
+    if is_last:
+        bucket["last_date"] = date
+
+    for field in KPI_FIELDS:
+        low, high, mean, last = (values[f"{field}_{agg}"] for agg in AGGREGATES)
+        if is_last:
+            bucket[f"{field}_last"] = last
+        if mean is None:
+            continue
+
+        # Null-safe min/max and count weighted average
+        current_min, current_max = bucket[f"{field}_min"], bucket[f"{field}_max"]
+        bucket[f"{field}_min"] = low if current_min is None else min(current_min, low)
+        bucket[f"{field}_max"] = high if current_max is None else max(current_max, high)
+        bucket[f"_{field}_sum"] += mean * count
+        bucket[f"_{field}_count"] += count
+
+
+# Function to build the rollup rows from the buckets
+def rollups_from_buckets(buckets, resolution):
+    rollups = []
+    for (vendor_id, start), bucket in buckets.items():
+        values = {key: value for key, value in bucket.items() if not key.startswith("_")}
+        for field in KPI_FIELDS:
+            count = bucket[f"_{field}_count"]
+            values[f"{field}_avg"] = bucket[f"_{field}_sum"] / count if count else None
+        rollups.append(
+            HistoricalPerformanceRollup(
+                vendor_id=vendor_id,
+                resolution=resolution,
+                period_start=start,
+                **values,
+            )
+        )
+    return rollups
+
+
+# Function to insert or update the rollup rows
+def write_rollups(rollups):
+    update_fields = ["sample_count", "last_date"] + [
+        f"{field}_{agg}" for field in KPI_FIELDS for agg in AGGREGATES
+    ]
+
+    # Backends without a conflict target (MySQL) use the unique constraint
+    unique_fields = None
+    if connection.features.supports_update_conflicts_with_target:
+        unique_fields = ["vendor", "resolution", "period_start"]
+
+    HistoricalPerformanceRollup.objects.bulk_create(
+        rollups,
+        batch_size=getattr(settings, "HISTORICAL_PERFORMANCE_BATCH_SIZE", 500),
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+
+
+# Function to roll the raw snapshots of the completed days up into daily rows
+def rollup_days(since, until):
+    snapshots = HistoricalPerformance.objects.filter(date__lt=until)
+    if since is not None:
+        snapshots = snapshots.filter(date__gte=since)
+
+    # Single pass over the raw snapshots of the new days
+    buckets = {}
+    for snapshot in snapshots.order_by().values("vendor_id", "date", *KPI_FIELDS).iterator():
+        day = timezone.localtime(snapshot["date"]).date()
+        bucket = buckets.setdefault((snapshot["vendor_id"], day), new_bucket())
+        add_sample(
+            bucket,
+            snapshot["date"],
+            1,
+            {
+                f"{field}_{agg}": snapshot[field]
+                for field in KPI_FIELDS
+                for agg in AGGREGATES
+            },
+        )
+
+    write_rollups(rollups_from_buckets(buckets, DAY))
+    return len(buckets)
+
+
+# Function to roll the daily rows up into a coarser resolution
+def rollup_periods(resolution, since):
+    days = HistoricalPerformanceRollup.objects.filter(resolution=DAY)
+    if since is not None:
+        days = days.filter(period_start__gte=period_start(since, resolution))
+
+    # Rebuild every period touched by the new days
+    buckets = {}
+    fields = [f"{field}_{agg}" for field in KPI_FIELDS for agg in AGGREGATES]
+    for row in days.order_by().values(
+        "vendor_id", "period_start", "sample_count", "last_date", *fields
+    ).iterator():
+        key = (row["vendor_id"], period_start(row["period_start"], resolution))
+        add_sample(
+            buckets.setdefault(key, new_bucket()),
+            row["last_date"],
+            row["sample_count"],
+            row,
+        )
+
+    write_rollups(rollups_from_buckets(buckets, resolution))
+    return len(buckets)
+
+
+# Function to delete the rows past the retention of each resolution
+def purge_expired(today):
+    purged = {}
+    for resolution, days in retention_days().items():
+        if days is None:
+            continue
+        cutoff = today - datetime.timedelta(days=days)
+        if resolution == RAW:
+            # Only the snapshots of the days already rolled up are purged
+            cutoff_date = timezone.make_aware(
+                datetime.datetime.combine(cutoff, datetime.time.min)
+            )
+            purged[resolution] = HistoricalPerformance.objects.filter(
+                date__lt=cutoff_date
+            ).delete()[0]
+        else:
+            purged[resolution] = HistoricalPerformanceRollup.objects.filter(
+                resolution=resolution, period_start__lt=cutoff
+            ).delete()[0]
+    return purged
+
+
+# Function to get the first day not rolled up yet
+def next_day_to_roll_up():
+    last_day = (
+        HistoricalPerformanceRollup.objects.filter(resolution=DAY)
+        .order_by("-period_start")
+        .values_list("period_start", flat=True)
+        .first()
+    )
+    return last_day + datetime.timedelta(days=1) if last_day else None
+
+
+# Function to get the aware start of a local day
+def start_of_day(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+# Function to roll up the completed days and apply the retention
+def rollup_historical_performance(now=None):
+    today = timezone.localtime(now or timezone.now()).date()
+    until = start_of_day(today)
+
+    # Resume after the last rolled up day
+    since_day = next_day_to_roll_up()
+    since = start_of_day(since_day) if since_day else None
+
+    with transaction.atomic():
+        result = {
+            DAY: rollup_days(since, until),
+            WEEK: rollup_periods(WEEK, since_day),
+            MONTH: rollup_periods(MONTH, since_day),
+        }
+        purged = purge_expired(today)
+
+    return {"rolled_up": result, "purged": purged}
+
+
+# Function to choose the resolution of a time range
+def choose_resolution(start, end, max_points=DEFAULT_MAX_POINTS, now=None):
+    today = timezone.localtime(now or timezone.now()).date()
+    retention = retention_days()
+
+    # Finest resolution still covering the start and within the points budget
+    span = end - start
+    for resolution, step in RESOLUTION_STEPS.items():
+        days = retention[resolution]
+        covers = days is None or timezone.localtime(start).date() >= today - datetime.timedelta(days=days)
+        if covers and span / step <= max_points:
+            return resolution
+    return MONTH
+
+
+# Function to get the performance history of a vendor over a time range
+def performance_history(
+    vendor_id, start, end, max_points=DEFAULT_MAX_POINTS, resolution=None, now=None
+):
+    resolution = resolution or choose_resolution(start, end, max_points, now=now)
+
+    # Raw snapshots
+    if resolution == RAW:
+        points = (
+            HistoricalPerformance.objects.filter(
+                vendor_id=vendor_id, date__gte=start, date__lte=end
+            )
+            .order_by("date")
+            .values("date", *KPI_FIELDS)
+        )
+        return resolution, list(points)
+
+    # Rollups of the periods overlapping the range
+    fields = [f"{field}_{agg}" for field in KPI_FIELDS for agg in AGGREGATES]
+    first_period = period_start(timezone.localtime(start).date(), resolution)
+    points = {
+        point["period_start"]: point
+        for point in HistoricalPerformanceRollup.objects.filter(
+            vendor_id=vendor_id,
+            resolution=resolution,
+            period_start__gte=first_period,
+            period_start__lte=timezone.localtime(end).date(),
+        )
+        .order_by("period_start")
+        .values("period_start", "sample_count", *fields)
+    }
+
+    # The snapshots not rolled up yet are bucketed by the database
+    tail_day = next_day_to_roll_up()
+    tail_start = max(start, start_of_day(tail_day)) if tail_day else start
+    for bucket in bucket_snapshots(vendor_id, tail_start, end, resolution):
+        point = points.get(bucket["period_start"])
+        if point is None:
+            points[bucket["period_start"]] = bucket
+        else:
+            merge_points(point, bucket)
+
+    return resolution, [points[key] for key in sorted(points)]
+
+
+# Function to bucket the raw snapshots of a vendor in the database
+def bucket_snapshots(vendor_id, start, end, resolution):
+    truncate = TRUNCATIONS[resolution]
+    aggregates = {"sample_count": models.Count("id")}
+    for field in KPI_FIELDS:
+        aggregates[f"{field}_min"] = models.Min(field)
+        aggregates[f"{field}_max"] = models.Max(field)
+        aggregates[f"{field}_avg"] = models.Avg(field)
+
+    buckets = (
+        HistoricalPerformance.objects.filter(
+            vendor_id=vendor_id, date__gte=start, date__lte=end
+        )
+        .annotate(period_start=truncate("date", output_field=models.DateField()))
+        .order_by()
+        .values("period_start")
+        .annotate(**aggregates)
+    )
+
+    # The last value of a bucket is only known once it is rolled up
+    return [
+        {**bucket, **{f"{field}_last": None for field in KPI_FIELDS}}
+        for bucket in buckets
+    ]
+
+
+# Function to merge a bucket of raw snapshots into a rolled up period
+def merge_points(point, bucket):
+    count, extra = point["sample_count"], bucket["sample_count"]
+    for field in KPI_FIELDS:
+        for agg, pick in (("min", min), ("max", max)):
+            values = [
+                value
+                for value in (point[f"{field}_{agg}"], bucket[f"{field}_{agg}"])
+                if value is not None
+            ]
+            point[f"{field}_{agg}"] = pick(values) if values else None
+
+        # Sample count weighted average
+        means = [
+            (mean, weight)
+            for mean, weight in ((point[f"{field}_avg"], count), (bucket[f"{field}_avg"], extra))
+            if mean is not None
+        ]
+        total = sum(weight for _, weight in means)
+        point[f"{field}_avg"] = (
+            sum(mean * weight for mean, weight in means) / total if total else None
+        )
+        point[f"{field}_last"] = None
+    point["sample_count"] = count + extra
+
+
+# Function to get the performance history of a vendor as columnar arrays
+def performance_series(vendor_id, start, end, max_points=DEFAULT_MAX_POINTS, resolution=None):
+    resolution, points = performance_history(
+        vendor_id, start, end, max_points=max_points, resolution=resolution
+    )
+
+    # Raw snapshots carry the values, rollups the average of the period
+    if resolution == RAW:
+        timestamps = [point["date"] for point in points]
+        column = "{}"
+    else:
+        timestamps = [point["period_start"] for point in points]
+        column = "{}_avg"
+
+    series = {"resolution": resolution, "timestamps": timestamps}
+    for field, key in SERIES_KEYS.items():
+        series[key] = [point[column.format(field)] for point in points]
+    return series
@@ -1,40 +1,151 @@
 # Imports
+import logging
 import time
 import warnings
 
 from celery import shared_task
-from django.db import transaction
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
 
+from vendor_management_system.historical_performances import distributions, rollups
 from vendor_management_system.historical_performances.models import (
     HistoricalPerformance,
 )
+from vendor_management_system.purchase_orders.kpis import (
+    KPI_FIELDS,
+    compute_vendor_kpis,
+)
 
 from vendor_management_system.vendors.models import Vendor
 
 
+logger = logging.getLogger(__name__)
+
+# Function to get the vendors annotated with their last snapshot
+def vendors_with_last_snapshot():
+    # Last snapshot of each vendor
+    last_snapshot = HistoricalPerformance.objects.filter(
+        vendor=models.OuterRef("pk")
+    ).order_by("-date")
+
+    # Get only the KPI columns of the vendors
+    return (
+        Vendor.objects.order_by("pk")
+        .only("pk", *KPI_FIELDS)
+        .annotate(
+            has_snapshot=models.Exists(last_snapshot),
+            **{
+                f"last_{field}": models.Subquery(last_snapshot.values(field)[:1])
+                for field in KPI_FIELDS
+            },
+        )
+    )
+
+
+# Function to write the snapshots of a chunk of vendors
+def snapshot_chunk(vendors, date, batch_size):
+    # Get the KPIs of the chunk from the purchase orders in one query
+    vendor_kpis = compute_vendor_kpis([vendor.pk for vendor in vendors])
+
+    # Build the snapshots of the vendors whose KPIs changed
+    snapshots = []
+    for vendor in vendors:
+        # Metrics without orders keep the value stored on the vendor
+        kpis = vendor_kpis.get(vendor.pk, {})
+        values = {
+            field: getattr(vendor, field) if kpis.get(field) is None else kpis[field]
+            for field in KPI_FIELDS
+        }
+
+        # Skip the vendors whose KPIs did not change since the last snapshot
+        if vendor.has_snapshot and all(
+            getattr(vendor, f"last_{field}") == value for field, value in values.items()
+        ):
+            continue
+
+        snapshots.append(
+            HistoricalPerformance(
+                id=HistoricalPerformance.generate_id(),
+                vendor_id=vendor.pk,
+                date=date,
+                **values,
+            )
+        )
+
+    # Write the snapshots
+    HistoricalPerformance.objects.bulk_create(snapshots, batch_size=batch_size)
+
+    # Return the number of snapshots and of skipped vendors
+    return len(snapshots), len(vendors) - len(snapshots)
+
+
 # Task to add a new record for the historical performance
 @shared_task
 def record_historical_performance(*args):
     # Ignore all the warnings
     warnings.filterwarnings("ignore")
 
+    # Get the pipeline settings
+    batch_size = getattr(settings, "HISTORICAL_PERFORMANCE_BATCH_SIZE", 500)
+
+    # Same date for all the records of the run
+    date = timezone.now()
+    started = time.monotonic()
+    created = skipped = 0
+
     # Run the code and rollback the transaction if an exception occurs
     with transaction.atomic():
-        # Get all the vendors
-        vendors = Vendor.objects.all()
-
-        # Loop through all the vendors
-        for vendor in vendors:
-            # Create a new historical performance record
-            historical_performance = HistoricalPerformance(
-                vendor=vendor,
-                date=timezone.now(),
-                on_time_delivery_rate=vendor.on_time_delivery_rate,
-                quality_rating_avg=vendor.quality_rating_avg,
-                average_response_time=vendor.average_response_time,
-                fulfillment_rate=vendor.fulfillment_rate,
-            )
+        # Loop through the vendors in chunks
+        chunk = []
+        for vendor in vendors_with_last_snapshot().iterator(chunk_size=batch_size):
+            chunk.append(vendor)
+            if len(chunk) == batch_size:
+                chunk_created, chunk_skipped = snapshot_chunk(chunk, date, batch_size)
+                created, skipped = created + chunk_created, skipped + chunk_skipped
+                chunk = []
+
+        if chunk:
+            chunk_created, chunk_skipped = snapshot_chunk(chunk, date, batch_size)
+            created, skipped = created + chunk_created, skipped + chunk_skipped
+
+    # Report the throughput
+    seconds = time.monotonic() - started
+    result = {
+        "created": created,
+        "skipped": skipped,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(created / seconds, 1) if seconds else None,
+    }
+    logger.info("Historical performance snapshot: %s", result)
+
+    # Return the result
+    return result
+
+
+# Task to roll up the historical performance and apply the retention
+@shared_task
+def rollup_historical_performance(*args):
+    # Ignore all the warnings
+    warnings.filterwarnings("ignore")
+
+    # Roll up the completed days and purge the expired rows
+    result = rollups.rollup_historical_performance()
+    logger.info("Historical performance rollup: %s", result)
+
+    # Return the result
+    return result
+
+
+# Task to compute the KPI distribution of the vendors of each category
+@shared_task
+def compute_category_distributions(*args):
+    # Ignore all the warnings
+    warnings.filterwarnings("ignore")
+
+    # Replace the distributions
+    count = distributions.compute_category_distributions()
+    logger.info("Category performance distributions: %s", count)
 
-            # Save the historical performance record
-            historical_performance.save()
+    # Return the number of distributions
+    return count
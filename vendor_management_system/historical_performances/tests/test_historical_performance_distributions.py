@@ -0,0 +1,41 @@
+# Imports
+import pytest
+
+from vendor_management_system.historical_performances import distributions
+from vendor_management_system.historical_performances.models import (
+    CategoryPerformanceDistribution,
+)
+from vendor_management_system.vendors.models import Category
+
+
+# Test a vendor is ranked against the vendors of its category
+@pytest.mark.django_db
+def test_vendor_cohort_percentiles(db, vendor_factory):
+    category = Category.objects.create(name="Packaging", code="PKG")
+    other = Category.objects.create(name="Logistics", code="LOG")
+    vendors = [
+        vendor_factory(
+            address=None,
+            category=category,
+            fulfillment_rate=rate,
+            average_response_time=rate,
+        )
+        for rate in (10.0, 20.0, 30.0, 40.0, 50.0)
+    ]
+    vendor_factory(address=None, category=other, fulfillment_rate=100.0)
+
+    assert distributions.compute_category_distributions() > 0
+    assert CategoryPerformanceDistribution.objects.filter(
+        category=category, metric="fulfillment_rate"
+    ).get().vendor_count == 5
+
+    # The best vendor outperforms its peers, the response time is inverted
+    cohort = distributions.vendor_cohort(vendors[-1])
+    assert cohort["fulfillment_rate"]["peers"] == 5
+    assert cohort["fulfillment_rate"]["percentile"] > 80
+    assert cohort["average_response_time"]["percentile"] < 20
+
+    # The distributions of the categories without vendors are dropped
+    category.vendors.update(category=None)
+    distributions.compute_category_distributions()
+    assert not CategoryPerformanceDistribution.objects.filter(category=category).exists()
@@ -0,0 +1,96 @@
+# Imports
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from vendor_management_system.historical_performances import rollups
+from vendor_management_system.historical_performances.models import (
+    HistoricalPerformance,
+    HistoricalPerformanceRollup,
+)
+
+
+# Test the raw snapshots are downsampled, purged and queried by resolution
+@pytest.mark.django_db
+def test_rollup_downsamples_and_purges(db, settings, vendor_factory):
+    settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS = {"RAW": 7, "DAY": 60}
+    vendor = vendor_factory(address=None)
+    now = timezone.make_aware(datetime.datetime(2024, 6, 30, 12))
+
+    # Four snapshots a day over the last 40 days
+    for day in range(40):
+        for slot, rate in enumerate([10.0, 20.0, 30.0, 40.0]):
+            HistoricalPerformance.objects.create(
+                vendor=vendor,
+                date=now - datetime.timedelta(days=day + 1, hours=6 * slot),
+                fulfillment_rate=rate,
+            )
+
+    result = rollups.rollup_historical_performance(now=now)
+
+    # Daily rows aggregate the snapshots of each day
+    assert result["rolled_up"]["DAY"] == HistoricalPerformanceRollup.objects.filter(
+        resolution="DAY"
+    ).count()
+    day = HistoricalPerformanceRollup.objects.get(
+        resolution="DAY", period_start=datetime.date(2024, 6, 20)
+    )
+    assert day.sample_count == 4
+    assert day.fulfillment_rate_min == 10.0
+    assert day.fulfillment_rate_max == 40.0
+    assert day.fulfillment_rate_avg == 25.0
+    assert day.fulfillment_rate_last == 40.0
+
+    # The monthly rows cover all the snapshots
+    months = HistoricalPerformanceRollup.objects.filter(resolution="MONTH")
+    assert sum(months.values_list("sample_count", flat=True)) == 160
+
+    # The raw snapshots past the retention are purged
+    assert not HistoricalPerformance.objects.filter(
+        date__lt=now - datetime.timedelta(days=8)
+    ).exists()
+
+    # A second run does not duplicate the rollups
+    count = HistoricalPerformanceRollup.objects.count()
+    rollups.rollup_historical_performance(now=now)
+    assert HistoricalPerformanceRollup.objects.count() == count
+
+    # The query picks the raw rows for a short recent range and rollups otherwise
+    resolution, points = rollups.performance_history(
+        vendor.pk, now - datetime.timedelta(days=3), now, now=now
+    )
+    assert resolution == "RAW"
+    resolution, points = rollups.performance_history(
+        vendor.pk, now - datetime.timedelta(days=30), now, now=now
+    )
+    assert resolution == "DAY"
+    assert len(points) == 30
+    resolution, _ = rollups.performance_history(
+        vendor.pk, now - datetime.timedelta(days=30), now, max_points=10, now=now
+    )
+    assert resolution == "WEEK"
+
+
+# Test the series merge the snapshots not rolled up yet into columnar arrays
+@pytest.mark.django_db
+def test_performance_series_includes_tail(db, vendor_factory):
+    vendor = vendor_factory(address=None)
+    now = timezone.now()
+    for days, rate in [(3, 10.0), (2, 20.0), (0, 60.0)]:
+        HistoricalPerformance.objects.create(
+            vendor=vendor, date=now - datetime.timedelta(days=days), fulfillment_rate=rate
+        )
+    rollups.rollup_historical_performance(now=now)
+
+    # Today is only in the raw snapshots
+    HistoricalPerformance.objects.create(vendor=vendor, date=now, fulfillment_rate=80.0)
+    series = rollups.performance_series(
+        vendor.pk, now - datetime.timedelta(days=5), now, resolution="DAY"
+    )
+    assert series["resolution"] == "DAY"
+    assert len(series["timestamps"]) == 3
+    assert series["fulfillment"] == [10.0, 20.0, 70.0]
+    assert set(series) == {
+        "resolution", "timestamps", "on_time", "quality", "response_time", "fulfillment"
+    }
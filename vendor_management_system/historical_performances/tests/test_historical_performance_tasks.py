@@ -0,0 +1,71 @@
+# Imports
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    HistoricalPerformance,
+)
+from vendor_management_system.historical_performances.tasks import (
+    record_historical_performance,
+)
+from vendor_management_system.purchase_orders.kpis import compute_vendor_kpis
+from vendor_management_system.vendors.models import Vendor
+
+
+# Test the snapshot task only records the vendors whose KPIs changed
+@pytest.mark.django_db
+def test_record_historical_performance_skips_unchanged(
+    db, settings, vendor_factory, django_assert_max_num_queries
+):
+    settings.HISTORICAL_PERFORMANCE_BATCH_SIZE = 2
+    vendors = [vendor_factory(address=None) for _ in range(5)]
+
+    # First run: one snapshot per vendor with a bounded number of queries
+    with django_assert_max_num_queries(12):
+        result = record_historical_performance()
+    assert result["created"] == 5
+    assert result["skipped"] == 0
+    assert HistoricalPerformance.objects.count() == 5
+
+    # Second run: nothing changed
+    result = record_historical_performance()
+    assert result["created"] == 0
+    assert result["skipped"] == 5
+
+    # Third run: only the changed vendor is recorded
+    vendors[0].fulfillment_rate = 12.5
+    vendors[0].save()
+    result = record_historical_performance()
+    assert result["created"] == 1
+    latest = HistoricalPerformance.objects.filter(vendor=vendors[0]).first()
+    assert latest.fulfillment_rate == 12.5
+
+
+# Test the snapshot records the KPIs of the orders over drifted vendor columns
+@pytest.mark.django_db
+def test_record_historical_performance_reads_order_kpis(db, vendor_factory, purchase_order_factory):
+    vendor = vendor_factory(address=None)
+    now = timezone.now()
+    purchase_order_factory(
+        vendor=vendor,
+        status="DELIVERED",
+        quality_rating=4,
+        issue_date=now - datetime.timedelta(days=10),
+        acknowledgment_date=now - datetime.timedelta(days=9),
+        expected_delivery_date=now - datetime.timedelta(days=5),
+        actual_delivery_date=now - datetime.timedelta(days=6),
+    )
+
+    # Columns changed behind the signals
+    Vendor.objects.filter(pk=vendor.pk).update(quality_rating_avg=1, fulfillment_rate=0)
+    expected = {
+        field: value
+        for field, value in compute_vendor_kpis([vendor.pk])[vendor.pk].items()
+        if value is not None
+    }
+
+    assert record_historical_performance()["created"] == 1
+    snapshot = HistoricalPerformance.objects.get(vendor=vendor)
+    assert {field: getattr(snapshot, field) for field in expected} == expected
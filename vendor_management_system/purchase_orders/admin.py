@@ -1,7 +1,24 @@
 # Imports
 from django.contrib import admin
 
-from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    PurchaseOrderLine,
+    VendorKPIOutbox,
+    VendorPerformanceCounter,
+)
+
+
+# Read-only lines of a PurchaseOrder, written from its items
+class PurchaseOrderLineInline(admin.TabularInline):
+    model = PurchaseOrderLine
+    fields = ["line_number", "item", "quantity"]
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 # Register PurchaseOrder model in admin
@@ -50,8 +67,10 @@ class PurchaseOrderAdmin(admin.ModelAdmin):
             },
         ),
     )
+    inlines = [PurchaseOrderLineInline]
     readonly_fields = [
         "po_number",
+        "quantity",
         # "vendor",
         # "order_date",
         # "issue_date",
@@ -61,3 +80,39 @@ class PurchaseOrderAdmin(admin.ModelAdmin):
     ]
     ordering = ["order_date"]
     list_filter = ["status"]
+
+
+# Register VendorPerformanceCounter model in admin
+@admin.register(VendorPerformanceCounter)
+class VendorPerformanceCounterAdmin(admin.ModelAdmin):
+    list_display = [
+        "vendor",
+        "delivered_count",
+        "on_time_count",
+        "issued_count",
+        "rated_count",
+        "response_count",
+        "rebuilt_at",
+    ]
+    search_fields = ["vendor__vendor_code", "vendor__name"]
+    ordering = ["vendor"]
+    readonly_fields = [
+        "vendor",
+        "delivered_count",
+        "on_time_count",
+        "issued_count",
+        "rated_sum",
+        "rated_count",
+        "response_hours_sum",
+        "response_count",
+        "rebuilt_at",
+    ]
+
+
+# Register VendorKPIOutbox model in admin
+@admin.register(VendorKPIOutbox)
+class VendorKPIOutboxAdmin(admin.ModelAdmin):
+    list_display = ["vendor", "first_marked_at", "last_marked_at"]
+    search_fields = ["vendor__vendor_code", "vendor__name"]
+    ordering = ["first_marked_at"]
+    readonly_fields = ["vendor", "first_marked_at", "last_marked_at"]
@@ -0,0 +1,514 @@
+# Imports
+import datetime
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+from django.utils import timezone
+
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    VendorKPIOutbox,
+    VendorPerformanceCounter,
+)
+from vendor_management_system.vendors.models import Vendor
+
+
+# Running counters kept for every vendor
+COUNTER_FIELDS = (
+    "delivered_count",
+    "on_time_count",
+    "issued_count",
+    "rated_sum",
+    "rated_count",
+    "response_hours_sum",
+    "response_count",
+)
+
+# Vendor fields derived from the counters
+KPI_FIELDS = (
+    "on_time_delivery_rate",
+    "quality_rating_avg",
+    "average_response_time",
+    "fulfillment_rate",
+)
+
+# Tolerance used when comparing the float counters
+DRIFT_TOLERANCE = 1e-6
+
+
+logger = logging.getLogger(__name__)
+
+
+# Function to check if the KPI recomputation is deferred to Celery
+def is_deferred():
+    return getattr(settings, "VENDOR_KPI_DEFERRED", False)
+
+
+# Function to get the quiet period before a dirty vendor is recomputed
+def debounce_seconds():
+    return getattr(settings, "VENDOR_KPI_DEBOUNCE_SECONDS", 30)
+
+
+# Function to get a value as it is stored in the database
+def stored_value(value):
+    # Dates assigned to DateTimeFields are stored as midnight
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+
+    # Naive datetimes are stored in the default timezone
+    if (
+        isinstance(value, datetime.datetime)
+        and settings.USE_TZ
+        and timezone.is_naive(value)
+    ):
+        value = timezone.make_aware(value, timezone.get_default_timezone())
+
+    return value
+
+
+# Function to get the tracked state of a purchase order as stored in the database
+def order_state(state):
+    if state is None:
+        return None
+
+    return {field: stored_value(value) for field, value in state.items()}
+
+
+# Function to get the counters contributed by a single purchase order state
+def order_contribution(state):
+    # Empty contribution
+    contribution = dict.fromkeys(COUNTER_FIELDS, 0)
+
+    # Orders without a vendor do not count
+    if state is None or state["vendor_id"] is None:
+        return contribution
+
+    # Issued orders
+    if state["issue_date"] is not None:
+        contribution["issued_count"] = 1
+
+    # Completed deliveries, on time and rated
+    if state["status"] == "DELIVERED":
+        contribution["delivered_count"] = 1
+
+        if (
+            state["actual_delivery_date"] is not None
+            and state["expected_delivery_date"] is not None
+            and state["actual_delivery_date"] <= state["expected_delivery_date"]
+        ):
+            contribution["on_time_count"] = 1
+
+        if state["quality_rating"] is not None:
+            contribution["rated_sum"] = state["quality_rating"]
+            contribution["rated_count"] = 1
+
+    # Acknowledged orders with a measurable response time
+    if (
+        state["status"] == "ACKNOWLEDGED"
+        and state["issue_date"] is not None
+        and state["acknowledgment_date"] is not None
+    ):
+        contribution["response_hours_sum"] = (
+            state["acknowledgment_date"] - state["issue_date"]
+        ).total_seconds() / 3600
+        contribution["response_count"] = 1
+
+    # Return the contribution
+    return contribution
+
+
+# Function to get the counter deltas per vendor between two purchase order states
+def order_deltas(old_state, new_state):
+    # Deltas indexed by vendor_id
+    deltas = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+
+    # Remove the old contribution and add the new one
+    for state, sign in ((old_state, -1), (new_state, 1)):
+        if state is None or state["vendor_id"] is None:
+            continue
+
+        for field, value in order_contribution(state).items():
+            deltas[state["vendor_id"]][field] += sign * value
+
+    # Drop the vendors whose counters do not change
+    return {
+        vendor_id: delta
+        for vendor_id, delta in deltas.items()
+        if any(value for value in delta.values())
+    }
+
+
+# Function to apply the counter deltas of a purchase order transition
+def apply_order_transition(old_state, new_state):
+    apply_order_transitions([(old_state, new_state)])
+
+
+# Function to apply the counter deltas of many transitions, once per vendor
+def apply_order_transitions(transitions):
+    # Sum the deltas of the transitions per vendor
+    deltas = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    for old_state, new_state in transitions:
+        for vendor_id, delta in order_deltas(old_state, new_state).items():
+            for field, value in delta.items():
+                deltas[vendor_id][field] += value
+
+    for vendor_id, delta in deltas.items():
+        # Transitions cancelling each other out
+        if not any(value for value in delta.values()):
+            continue
+
+        # Deferred mode: only mark the vendor dirty
+        if is_deferred():
+            mark_vendor_dirty(vendor_id)
+            continue
+
+        # Update the counters in place
+        updated = VendorPerformanceCounter.objects.filter(vendor_id=vendor_id).update(
+            **{
+                field: models.F(field) + value
+                for field, value in delta.items()
+                if value
+            }
+        )
+
+        # First change for this vendor: seed the counters from the orders
+        if not updated:
+            rebuild_vendor_counters([vendor_id])
+
+        # Write the vendor KPIs when the transaction is committed
+        schedule_vendor_kpi_refresh(vendor_id)
+
+
+# Function to get the vendor KPIs from the running counters
+def kpis_from_counters(counters):
+    # KPIs that can be computed (a metric without orders keeps its value)
+    kpis = {}
+
+    if counters["delivered_count"] > 0:
+        kpis["on_time_delivery_rate"] = round(
+            (counters["on_time_count"] / counters["delivered_count"]) * 100, 4
+        )
+
+    if counters["rated_count"] > 0:
+        kpis["quality_rating_avg"] = round(
+            counters["rated_sum"] / counters["rated_count"], 4
+        )
+
+    if counters["response_count"] > 0:
+        kpis["average_response_time"] = round(
+            counters["response_hours_sum"] / counters["response_count"], 4
+        )
+
+    if counters["issued_count"] > 0:
+        kpis["fulfillment_rate"] = round(
+            (counters["delivered_count"] / counters["issued_count"]) * 100, 4
+        )
+
+    # Return the KPIs
+    return kpis
+
+
+# Function to write the KPIs of the vendors
+def refresh_vendor_kpis(vendor_ids, vendor_kpis=None):
+    # Get the vendors, together with their counters when the KPIs are not given
+    vendors = Vendor.objects.filter(pk__in=vendor_ids).only("pk", *KPI_FIELDS)
+    if vendor_kpis is None:
+        vendors = vendors.select_related("kpi_counter")
+
+    # Loop through all the vendors
+    for vendor in vendors:
+        if vendor_kpis is not None:
+            kpis = vendor_kpis.get(vendor.pk, {})
+        else:
+            counter = getattr(vendor, "kpi_counter", None)
+            if counter is None:
+                continue
+            kpis = kpis_from_counters(
+                {field: getattr(counter, field) for field in COUNTER_FIELDS}
+            )
+
+        # Get the KPIs that changed
+        changed_fields = []
+        for field, value in kpis.items():
+            if value is not None and getattr(vendor, field) != value:
+                setattr(vendor, field, value)
+                changed_fields.append(field)
+
+        # Save only the changed KPIs and the modification date
+        if changed_fields:
+            vendor.save(update_fields=[*changed_fields, "updated_at"])
+
+
+# Callable registered with on_commit collecting the vendors to refresh
+class VendorKPIRefreshBatch:
+    def __init__(self):
+        self.vendor_ids = set()
+        self.executed = False
+
+    def __call__(self):
+        self.executed = True
+        refresh_vendor_kpis(self.vendor_ids)
+
+
+# Function to refresh the vendor KPIs once per transaction
+def schedule_vendor_kpi_refresh(vendor_id):
+    connection = transaction.get_connection()
+
+    # Outside of a transaction the refresh happens immediately
+    if not connection.in_atomic_block:
+        refresh_vendor_kpis([vendor_id])
+        return
+
+    # Reuse the batch of the current transaction if it is still registered
+    batch = getattr(connection, "vendor_kpi_refresh_batch", None)
+    if (
+        batch is None
+        or batch.executed
+        or all(entry[1] is not batch for entry in connection.run_on_commit)
+    ):
+        batch = VendorKPIRefreshBatch()
+        connection.vendor_kpi_refresh_batch = batch
+        transaction.on_commit(batch)
+
+    # Add the vendor to the batch
+    batch.vendor_ids.add(vendor_id)
+
+
+# Function to compute the counters of the vendors from scratch
+def compute_vendor_counters(vendor_ids=None):
+    # Filters for the conditional aggregates
+    delivered = models.Q(status="DELIVERED")
+    on_time = delivered & models.Q(
+        actual_delivery_date__lte=models.F("expected_delivery_date")
+    )
+    rated = delivered & models.Q(quality_rating__isnull=False)
+    acknowledged = models.Q(
+        status="ACKNOWLEDGED",
+        issue_date__isnull=False,
+        acknowledgment_date__isnull=False,
+    )
+
+    # Get the orders of the vendors
+    orders = PurchaseOrder.objects.filter(vendor__isnull=False)
+    if vendor_ids is not None:
+        orders = orders.filter(vendor_id__in=vendor_ids)
+
+    # Aggregate the counters per vendor in one query
+    rows = (
+        orders.order_by()
+        .values("vendor_id")
+        .annotate(
+            delivered_count=models.Count("pk", filter=delivered),
+            on_time_count=models.Count("pk", filter=on_time),
+            issued_count=models.Count("pk", filter=models.Q(issue_date__isnull=False)),
+            rated_sum=models.Sum("quality_rating", filter=rated),
+            rated_count=models.Count("pk", filter=rated),
+            response_time_sum=models.Sum(
+                models.ExpressionWrapper(
+                    models.F("acknowledgment_date") - models.F("issue_date"),
+                    output_field=models.DurationField(),
+                ),
+                filter=acknowledged,
+            ),
+            response_count=models.Count("pk", filter=acknowledged),
+        )
+    )
+
+    # Build the counters per vendor
+    counters = {}
+    for row in rows:
+        vendor_id = row.pop("vendor_id")
+        response_time_sum = row.pop("response_time_sum")
+        counters[vendor_id] = {
+            **row,
+            "rated_sum": row["rated_sum"] or 0,
+            "response_hours_sum": (
+                response_time_sum.total_seconds() / 3600 if response_time_sum else 0
+            ),
+        }
+
+    # Return the counters
+    return counters
+
+
+# Function to compute the KPIs of one or many vendors with one grouped query
+def compute_vendor_kpis(vendor_ids=None):
+    # The averages are derived from the grouped sums and counts
+    return {
+        vendor_id: {**dict.fromkeys(KPI_FIELDS), **kpis_from_counters(values)}
+        for vendor_id, values in compute_vendor_counters(vendor_ids).items()
+    }
+
+
+# Function to write the counters of the vendors with a single upsert
+def write_vendor_counters(vendor_codes, counters):
+    now = timezone.now()
+
+    # Conflict handling (MySQL resolves the conflict without a target)
+    conflict_options = {
+        "update_conflicts": True,
+        "update_fields": [*COUNTER_FIELDS, "rebuilt_at"],
+    }
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_options["unique_fields"] = ["vendor"]
+
+    # Write the counters
+    VendorPerformanceCounter.objects.bulk_create(
+        [
+            VendorPerformanceCounter(
+                vendor_id=vendor_code,
+                rebuilt_at=now,
+                **counters.get(vendor_code, dict.fromkeys(COUNTER_FIELDS, 0)),
+            )
+            for vendor_code in vendor_codes
+        ],
+        **conflict_options,
+    )
+
+
+# Function to rebuild the counters of the vendors and report the drift
+def rebuild_vendor_counters(vendor_ids=None, dry_run=False):
+    # Get the vendors to rebuild
+    vendors = Vendor.objects.all()
+    if vendor_ids is not None:
+        vendors = vendors.filter(pk__in=vendor_ids)
+    vendor_codes = list(vendors.values_list("pk", flat=True))
+
+    # Get the expected and the stored counters
+    expected = compute_vendor_counters(vendor_codes)
+    stored = {
+        counter.vendor_id: counter
+        for counter in VendorPerformanceCounter.objects.filter(vendor_id__in=vendor_codes)
+    }
+
+    # Drift indexed by vendor_code
+    drift = {}
+
+    for vendor_code in vendor_codes:
+        values = expected.get(vendor_code, dict.fromkeys(COUNTER_FIELDS, 0))
+        counter = stored.get(vendor_code)
+
+        # Compare the stored counters with the expected ones
+        if counter is not None:
+            differences = {
+                field: (getattr(counter, field), values[field])
+                for field in COUNTER_FIELDS
+                if abs(getattr(counter, field) - values[field]) > DRIFT_TOLERANCE
+            }
+            if differences:
+                drift[vendor_code] = differences
+
+    # Write the expected counters
+    if not dry_run:
+        write_vendor_counters(vendor_codes, expected)
+
+    # Return the drift
+    return drift
+
+
+# Function to mark a vendor for deferred recomputation
+def mark_vendor_dirty(vendor_id):
+    now = timezone.now()
+
+    # Already dirty: only move the debounce window
+    if VendorKPIOutbox.objects.filter(vendor_id=vendor_id).update(last_marked_at=now):
+        return
+
+    # First change: add the vendor to the outbox and schedule a drain
+    try:
+        with transaction.atomic():
+            VendorKPIOutbox.objects.create(
+                vendor_id=vendor_id, first_marked_at=now, last_marked_at=now
+            )
+    except IntegrityError:
+        # Marked concurrently by another transaction
+        VendorKPIOutbox.objects.filter(vendor_id=vendor_id).update(last_marked_at=now)
+        return
+
+    transaction.on_commit(schedule_outbox_drain)
+
+
+# Function to enqueue the Celery task draining the outbox
+def schedule_outbox_drain():
+    from vendor_management_system.purchase_orders.tasks import (
+        recompute_dirty_vendor_kpis,
+    )
+
+    try:
+        recompute_dirty_vendor_kpis.apply_async(countdown=debounce_seconds())
+    except Exception:
+        # The periodic drain picks the vendor up when the broker is back
+        logger.exception("Unable to schedule the vendor KPI recomputation")
+
+
+# Function to recompute the counters and the KPIs of the vendors in one pass
+def recompute_vendor_kpis(vendor_ids):
+    vendor_ids = list(vendor_ids)
+
+    # Get the counters of all the vendors with one aggregate query
+    counters = compute_vendor_counters(vendor_ids)
+
+    # Write the counters of the existing vendors
+    write_vendor_counters(
+        Vendor.objects.filter(pk__in=vendor_ids).values_list("pk", flat=True),
+        counters,
+    )
+
+    # Write the vendor KPIs
+    refresh_vendor_kpis(
+        vendor_ids,
+        {vendor_id: kpis_from_counters(values) for vendor_id, values in counters.items()},
+    )
+
+
+# Function to drain the outbox recomputing every dirty vendor once
+def drain_vendor_outbox(debounce=None, limit=500):
+    if debounce is None:
+        debounce = debounce_seconds()
+
+    # Vendors quiet for the whole debounce window
+    cutoff = timezone.now() - datetime.timedelta(seconds=debounce)
+    vendor_ids = list(
+        VendorKPIOutbox.objects.filter(last_marked_at__lte=cutoff).values_list(
+            "vendor_id", flat=True
+        )[:limit]
+    )
+
+    if vendor_ids:
+        with transaction.atomic():
+            recompute_vendor_kpis(vendor_ids)
+
+            # Changes marked after the cutoff stay in the outbox
+            VendorKPIOutbox.objects.filter(
+                vendor_id__in=vendor_ids, last_marked_at__lte=cutoff
+            ).delete()
+
+    # Return the number of recomputed vendors and the ones still waiting
+    return {
+        "recomputed": len(vendor_ids),
+        "pending": VendorKPIOutbox.objects.count(),
+    }
+
+
+# Function to get the lag of the outbox
+def outbox_lag():
+    # Get the size and the oldest change of the outbox
+    summary = VendorKPIOutbox.objects.aggregate(
+        pending=models.Count("pk"),
+        oldest=models.Min("first_marked_at"),
+        latest=models.Max("last_marked_at"),
+    )
+
+    # Return the lag in seconds
+    oldest = summary["oldest"]
+    return {
+        "deferred": is_deferred(),
+        "pending": summary["pending"],
+        "oldest_marked_at": oldest,
+        "latest_marked_at": summary["latest"],
+        "lag_seconds": (
+            round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0
+        ),
+    }
@@ -0,0 +1,87 @@
+# Imports
+from django.db import models
+from django.db.models.functions import Coalesce
+
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    PurchaseOrderLine,
+)
+
+
+# Rows written per INSERT
+LINE_BATCH_SIZE = 1000
+
+
+# Function to get the lines of the items of a purchase order
+def order_lines(order):
+    return [
+        PurchaseOrderLine(
+            purchase_order_id=order.pk,
+            line_number=line_number,
+            item=str(entry["item"]),
+            quantity=int(entry["quantity"]),
+        )
+        for line_number, entry in enumerate(order.items or [], start=1)
+    ]
+
+
+# Function to get the expression of the total quantity of the lines of an order
+def lines_quantity():
+    return Coalesce(
+        models.Subquery(
+            PurchaseOrderLine.objects.filter(purchase_order=models.OuterRef("pk"))
+            .order_by()
+            .values("purchase_order")
+            .annotate(total=models.Sum("quantity"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+# Function to replace the lines of the purchase orders with their items
+def sync_order_lines(orders):
+    orders = list(orders)
+    po_numbers = [order.pk for order in orders]
+    lines = {order.pk: order_lines(order) for order in orders}
+
+    # Replace the lines
+    PurchaseOrderLine.objects.filter(purchase_order_id__in=po_numbers).delete()
+    PurchaseOrderLine.objects.bulk_create(
+        [line for order_lines in lines.values() for line in order_lines],
+        batch_size=LINE_BATCH_SIZE,
+    )
+
+    # The quantity is the aggregate of the lines
+    PurchaseOrder.objects.filter(pk__in=po_numbers).update(quantity=lines_quantity())
+    for order in orders:
+        order.quantity = sum(line.quantity for line in lines[order.pk])
+
+
+# Function to get the items ordered the most, with their orders and vendors
+def top_items(lines, limit):
+    return (
+        lines.order_by()
+        .values("item")
+        .annotate(
+            quantity=models.Sum("quantity"),
+            orders=models.Count("purchase_order", distinct=True),
+            vendors=models.Count("purchase_order__vendor", distinct=True),
+        )
+        .order_by("-quantity", "item")[:limit]
+    )
+
+
+# Function to get the quantity ordered from each vendor
+def vendor_volume(lines, limit):
+    return (
+        lines.filter(purchase_order__vendor__isnull=False)
+        .order_by()
+        .values(vendor_code=models.F("purchase_order__vendor"))
+        .annotate(
+            quantity=models.Sum("quantity"),
+            orders=models.Count("purchase_order", distinct=True),
+            items=models.Count("item", distinct=True),
+        )
+        .order_by("-quantity", "vendor_code")[:limit]
+    )
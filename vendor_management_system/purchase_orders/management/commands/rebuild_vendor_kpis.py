@@ -0,0 +1,59 @@
+# Imports
+from django.core.management.base import BaseCommand, CommandError
+
+from vendor_management_system.purchase_orders import kpis
+from vendor_management_system.vendors.models import Vendor
+
+
+# Command to rebuild the vendor KPI counters from the purchase orders
+class Command(BaseCommand):
+    help = "Rebuild the vendor KPI counters from scratch and report any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vendor",
+            action="append",
+            dest="vendor_codes",
+            help="Vendor code to rebuild (can be repeated, default: all vendors)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the drift without writing the counters",
+        )
+
+    def handle(self, *args, **options):
+        vendor_codes = options["vendor_codes"]
+        dry_run = options["dry_run"]
+
+        # Check the requested vendors exist
+        if vendor_codes:
+            missing = set(vendor_codes) - set(
+                Vendor.objects.filter(pk__in=vendor_codes).values_list("pk", flat=True)
+            )
+            if missing:
+                raise CommandError(f"Unknown vendor codes: {', '.join(sorted(missing))}")
+
+        # Rebuild the counters
+        drift = kpis.rebuild_vendor_counters(vendor_codes, dry_run=dry_run)
+
+        # Report the drift
+        for vendor_code, differences in sorted(drift.items()):
+            self.stdout.write(self.style.WARNING(f"Drift for vendor {vendor_code}:"))
+            for field, (stored, expected) in differences.items():
+                self.stdout.write(f"  {field}: stored={stored} expected={expected}")
+
+        if dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(f"Dry run: {len(drift)} vendor(s) with drift")
+            )
+            return
+
+        # Write the vendor KPIs from the rebuilt counters
+        if vendor_codes is None:
+            vendor_codes = Vendor.objects.values_list("pk", flat=True)
+        kpis.refresh_vendor_kpis(vendor_codes)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Counters rebuilt: {len(drift)} vendor(s) with drift")
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase_orders', '0001_initial'),
+        ('vendors', '0005_vendor_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorPerformanceCounter',
+            fields=[
+                ('vendor', models.OneToOneField(help_text='Vendor the running counters belong to', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='kpi_counter', serialize=False, to='vendors.vendor', verbose_name='Vendor')),
+                ('delivered_count', models.IntegerField(default=0, help_text='Number of Purchase Orders in status DELIVERED', verbose_name='Delivered Orders')),
+                ('on_time_count', models.IntegerField(default=0, help_text='Number of DELIVERED Purchase Orders delivered by the expected date', verbose_name='On-time Deliveries')),
+                ('issued_count', models.IntegerField(default=0, help_text='Number of Purchase Orders with an issue date', verbose_name='Issued Orders')),
+                ('rated_sum', models.FloatField(default=0, help_text='Sum of the quality ratings of rated DELIVERED Purchase Orders', verbose_name='Quality Rating Sum')),
+                ('rated_count', models.IntegerField(default=0, help_text='Number of rated DELIVERED Purchase Orders', verbose_name='Rated Orders')),
+                ('response_hours_sum', models.FloatField(default=0, help_text='Sum of the issue to acknowledgment hours of ACKNOWLEDGED Purchase Orders', verbose_name='Response Hours Sum')),
+                ('response_count', models.IntegerField(default=0, help_text='Number of ACKNOWLEDGED Purchase Orders with a response time', verbose_name='Acknowledged Orders')),
+                ('rebuilt_at', models.DateTimeField(blank=True, help_text='Date of the last rebuild from the Purchase Orders', null=True, verbose_name='Rebuilt At')),
+            ],
+            options={
+                'verbose_name': 'Vendor Performance Counter',
+                'verbose_name_plural': 'Vendor Performance Counters',
+            },
+        ),
+    ]
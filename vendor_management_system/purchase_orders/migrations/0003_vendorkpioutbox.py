@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase_orders', '0002_vendorperformancecounter'),
+        ('vendors', '0005_vendor_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorKPIOutbox',
+            fields=[
+                ('vendor', models.OneToOneField(help_text='Vendor whose KPIs must be recomputed', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='kpi_outbox', serialize=False, to='vendors.vendor', verbose_name='Vendor')),
+                ('first_marked_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Date of the first change not yet recomputed', verbose_name='First Marked At')),
+                ('last_marked_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Date of the latest change not yet recomputed', verbose_name='Last Marked At')),
+            ],
+            options={
+                'verbose_name': 'Vendor KPI Outbox Entry',
+                'verbose_name_plural': 'Vendor KPI Outbox',
+                'ordering': ['first_marked_at'],
+                'indexes': [models.Index(fields=['last_marked_at'], name='purchase_or_last_ma_47f50a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase_orders', '0003_vendorkpioutbox'),
+        ('vendors', '0005_vendor_is_active'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['vendor', 'status'], name='purchase_or_vendor__7f28bd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['status', 'expected_delivery_date'], name='purchase_or_status_0e86b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['order_date', 'po_number'], name='purchase_or_order_d_e8aea7_idx'),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:41
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Orders read per batch of the backfill
+BACKFILL_BATCH_SIZE = 1000
+
+
+# Function to write the lines of the existing purchase orders from their items
+def backfill_lines(apps, schema_editor):
+    PurchaseOrder = apps.get_model("purchase_orders", "PurchaseOrder")
+    PurchaseOrderLine = apps.get_model("purchase_orders", "PurchaseOrderLine")
+
+    orders = PurchaseOrder.objects.order_by("po_number").only("po_number", "items")
+    last = None
+    while True:
+        batch = orders if last is None else orders.filter(po_number__gt=last)
+        batch = list(batch[:BACKFILL_BATCH_SIZE])
+        if not batch:
+            return
+
+        lines = [
+            PurchaseOrderLine(
+                purchase_order_id=order.po_number,
+                line_number=line_number,
+                item=str(entry["item"]),
+                quantity=int(entry["quantity"]),
+            )
+            for order in batch
+            for line_number, entry in enumerate(order.items or [], start=1)
+        ]
+        PurchaseOrderLine.objects.bulk_create(lines, batch_size=BACKFILL_BATCH_SIZE)
+
+        # The quantity is the aggregate of the lines
+        quantities = {}
+        for line in lines:
+            quantities[line.purchase_order_id] = (
+                quantities.get(line.purchase_order_id, 0) + line.quantity
+            )
+        for order in batch:
+            order.quantity = quantities.get(order.po_number, 0)
+        PurchaseOrder.objects.bulk_update(batch, ["quantity"], batch_size=BACKFILL_BATCH_SIZE)
+
+        last = batch[-1].po_number
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase_orders', '0004_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='purchaseorder',
+            name='quantity',
+            field=models.IntegerField(default=0, help_text='Total Quantity in Purchase Order, aggregated from its lines', validators=[django.core.validators.MinValueValidator(1)], verbose_name='Quantity'),
+        ),
+        migrations.CreateModel(
+            name='PurchaseOrderLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_number', models.PositiveSmallIntegerField(help_text='Position of the item in the Purchase Order', verbose_name='Line Number')),
+                ('item', models.CharField(help_text='Item ordered', max_length=255, verbose_name='Item')),
+                ('quantity', models.IntegerField(help_text='Quantity of the item ordered', verbose_name='Quantity')),
+                ('purchase_order', models.ForeignKey(help_text='Purchase Order the line belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='purchase_orders.purchaseorder', verbose_name='Purchase Order')),
+            ],
+            options={
+                'verbose_name': 'Purchase Order Line',
+                'verbose_name_plural': 'Purchase Order Lines',
+                'ordering': ['purchase_order', 'line_number'],
+                'indexes': [models.Index(fields=['item', 'purchase_order'], name='purchase_or_item_04e451_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='purchaseorderline',
+            constraint=models.UniqueConstraint(fields=('purchase_order', 'line_number'), name='unique_purchase_order_line'),
+        ),
+        migrations.RunPython(backfill_lines, migrations.RunPython.noop),
+    ]
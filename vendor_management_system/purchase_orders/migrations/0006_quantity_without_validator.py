@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase_orders', '0005_purchaseorderline'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='purchaseorder',
+            name='quantity',
+            field=models.IntegerField(default=0, help_text='Total Quantity in Purchase Order, aggregated from its lines', verbose_name='Quantity'),
+        ),
+    ]
@@ -10,6 +10,25 @@ from django.utils.translation import gettext_lazy as _
 
 # Model for PurchaseOrder
 class PurchaseOrder(models.Model):
+    # Fields recorded when the instance is loaded from the database
+    TRACKED_FIELDS = (
+        "vendor_id",
+        "status",
+        "quality_rating",
+        "order_date",
+        "issue_date",
+        "acknowledgment_date",
+        "expected_delivery_date",
+        "actual_delivery_date",
+    )
+
+    # Date field stamped on each status transition
+    STATUS_TRANSITION_DATES = {
+        ("PENDING", "ISSUED"): "issue_date",
+        ("ISSUED", "ACKNOWLEDGED"): "acknowledgment_date",
+        ("ACKNOWLEDGED", "DELIVERED"): "actual_delivery_date",
+    }
+
     # Fields
     po_number = models.CharField(
         _("Purchase Order Number"),
@@ -55,8 +74,8 @@ class PurchaseOrder(models.Model):
     )
     quantity = models.IntegerField(
         _("Quantity"),
-        help_text=_("Total Quantity in Purchase Order"),
-        validators=[validators.MinValueValidator(1)],
+        default=0,
+        help_text=_("Total Quantity in Purchase Order, aggregated from its lines"),
     )
     status = models.CharField(
         _("Status"),
@@ -94,11 +113,80 @@ class PurchaseOrder(models.Model):
         verbose_name = _("Purchase Order")
         verbose_name_plural = _("Purchase Orders")
         ordering = ["order_date"]
+        indexes = [
+            models.Index(fields=["vendor", "status"]),
+            models.Index(fields=["status", "expected_delivery_date"]),
+            models.Index(fields=["order_date", "po_number"]),
+        ]
 
     # String representation
     def __str__(self):
         return self.po_number
 
+    # Method to record the tracked fields when the instance is loaded
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(PurchaseOrder, cls).from_db(db, field_names, values)
+        instance._loaded_state = instance.get_tracked_state()
+        # Items as stored, the lines are rewritten only when they change
+        if "items" in instance.__dict__:
+            instance._loaded_items = instance.items
+        return instance
+
+    # Method to get the current value of the tracked fields
+    def get_tracked_state(self):
+        deferred_fields = self.get_deferred_fields()
+        return {
+            field: getattr(self, field)
+            for field in self.TRACKED_FIELDS
+            if field not in deferred_fields
+        }
+
+    # Method to get the tracked fields as last loaded from or saved to the database
+    def get_loaded_state(self):
+        # New instances have no previous state
+        if self._state.adding:
+            return None
+
+        # Instances not built by from_db, or loaded with deferred fields, read the row once
+        state = getattr(self, "_loaded_state", None)
+        if state is None or len(state) < len(self.TRACKED_FIELDS):
+            state = (
+                type(self)
+                ._base_manager.filter(pk=self.pk)
+                .values(*self.TRACKED_FIELDS)
+                .first()
+            )
+            self._loaded_state = state
+
+        return state
+
+    # Method to remember the tracked fields written to the database
+    def remember_state(self, fields=None):
+        state = self.get_tracked_state()
+
+        # Only the written fields change the recorded state
+        if fields is not None and getattr(self, "_loaded_state", None) is not None:
+            attnames = {self._meta.get_field(field).attname for field in fields}
+            state = {
+                **self._loaded_state,
+                **{field: value for field, value in state.items() if field in attnames},
+            }
+
+        self._loaded_state = state
+
+    # Method to check if the items differ from the stored ones
+    def items_changed(self):
+        # New instances and instances not built by from_db have no stored items
+        if self._state.adding or not hasattr(self, "_loaded_items"):
+            return True
+        return self.items != self._loaded_items
+
+    # Refresh method
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super(PurchaseOrder, self).refresh_from_db(using=using, fields=fields, **kwargs)
+        self.remember_state(fields)
+
     # Save method
     def save(self, *args, **kwargs):
         # If purchase order number is not specified
@@ -113,3 +201,148 @@ class PurchaseOrder(models.Model):
 
         # Save the model
         super(PurchaseOrder, self).save(*args, **kwargs)
+
+        # The saved values are the previous state of the next save
+        update_fields = kwargs.get("update_fields")
+        self.remember_state(update_fields)
+        if update_fields is None or "items" in update_fields:
+            self._loaded_items = self.items
+
+
+# Model for PurchaseOrderLine
+class PurchaseOrderLine(models.Model):
+    # Fields
+    purchase_order = models.ForeignKey(
+        PurchaseOrder,
+        on_delete=models.CASCADE,
+        related_name="lines",
+        verbose_name=_("Purchase Order"),
+        help_text=_("Purchase Order the line belongs to"),
+    )
+    line_number = models.PositiveSmallIntegerField(
+        _("Line Number"),
+        help_text=_("Position of the item in the Purchase Order"),
+    )
+    item = models.CharField(
+        _("Item"),
+        max_length=255,
+        help_text=_("Item ordered"),
+    )
+    quantity = models.IntegerField(
+        _("Quantity"),
+        help_text=_("Quantity of the item ordered"),
+    )
+
+    # Metadata
+    class Meta:
+        verbose_name = _("Purchase Order Line")
+        verbose_name_plural = _("Purchase Order Lines")
+        ordering = ["purchase_order", "line_number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["purchase_order", "line_number"],
+                name="unique_purchase_order_line",
+            )
+        ]
+        indexes = [models.Index(fields=["item", "purchase_order"])]
+
+    # String representation
+    def __str__(self):
+        return f"{self.purchase_order_id} - {self.line_number}"
+
+
+# Model for VendorPerformanceCounter
+class VendorPerformanceCounter(models.Model):
+    # Fields
+    vendor = models.OneToOneField(
+        "vendors.Vendor",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="kpi_counter",
+        verbose_name=_("Vendor"),
+        help_text=_("Vendor the running counters belong to"),
+    )
+    delivered_count = models.IntegerField(
+        _("Delivered Orders"),
+        default=0,
+        help_text=_("Number of Purchase Orders in status DELIVERED"),
+    )
+    on_time_count = models.IntegerField(
+        _("On-time Deliveries"),
+        default=0,
+        help_text=_("Number of DELIVERED Purchase Orders delivered by the expected date"),
+    )
+    issued_count = models.IntegerField(
+        _("Issued Orders"),
+        default=0,
+        help_text=_("Number of Purchase Orders with an issue date"),
+    )
+    rated_sum = models.FloatField(
+        _("Quality Rating Sum"),
+        default=0,
+        help_text=_("Sum of the quality ratings of rated DELIVERED Purchase Orders"),
+    )
+    rated_count = models.IntegerField(
+        _("Rated Orders"),
+        default=0,
+        help_text=_("Number of rated DELIVERED Purchase Orders"),
+    )
+    response_hours_sum = models.FloatField(
+        _("Response Hours Sum"),
+        default=0,
+        help_text=_("Sum of the issue to acknowledgment hours of ACKNOWLEDGED Purchase Orders"),
+    )
+    response_count = models.IntegerField(
+        _("Acknowledged Orders"),
+        default=0,
+        help_text=_("Number of ACKNOWLEDGED Purchase Orders with a response time"),
+    )
+    rebuilt_at = models.DateTimeField(
+        _("Rebuilt At"),
+        null=True,
+        blank=True,
+        help_text=_("Date of the last rebuild from the Purchase Orders"),
+    )
+
+    # Metadata
+    class Meta:
+        verbose_name = _("Vendor Performance Counter")
+        verbose_name_plural = _("Vendor Performance Counters")
+
+    # String representation
+    def __str__(self):
+        return f"{self.vendor_id} - KPI counters"
+
+
+# Model for VendorKPIOutbox
+class VendorKPIOutbox(models.Model):
+    # Fields
+    vendor = models.OneToOneField(
+        "vendors.Vendor",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="kpi_outbox",
+        verbose_name=_("Vendor"),
+        help_text=_("Vendor whose KPIs must be recomputed"),
+    )
+    first_marked_at = models.DateTimeField(
+        _("First Marked At"),
+        default=timezone.now,
+        help_text=_("Date of the first change not yet recomputed"),
+    )
+    last_marked_at = models.DateTimeField(
+        _("Last Marked At"),
+        default=timezone.now,
+        help_text=_("Date of the latest change not yet recomputed"),
+    )
+
+    # Metadata
+    class Meta:
+        verbose_name = _("Vendor KPI Outbox Entry")
+        verbose_name_plural = _("Vendor KPI Outbox")
+        ordering = ["first_marked_at"]
+        indexes = [models.Index(fields=["last_marked_at"])]
+
+    # String representation
+    def __str__(self):
+        return f"{self.vendor_id} - {self.first_marked_at}"
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, ValidationError
 
 from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.purchase_orders.transitions import MAX_BULK_ORDERS
 from vendor_management_system.vendors.models import Vendor
 
 
@@ -228,3 +229,16 @@ class PurchaseOrderSetQualityRatingSerializer(ModelSerializer):
 
         # Return the validated data
         return data
+
+
+# Serializer for an order of a bulk transition
+class PurchaseOrderBulkItemSerializer(serializers.Serializer):
+    po_number = serializers.CharField()
+    vendor = serializers.CharField()
+
+
+# Serializer for the orders of a bulk transition
+class PurchaseOrderBulkTransitionSerializer(serializers.Serializer):
+    orders = PurchaseOrderBulkItemSerializer(
+        many=True, allow_empty=False, max_length=MAX_BULK_ORDERS
+    )
@@ -0,0 +1,18 @@
+# Imports
+from celery import shared_task
+
+from vendor_management_system.purchase_orders import kpis
+
+
+# Task to recompute the KPIs of the vendors marked dirty by the purchase orders
+@shared_task
+def recompute_dirty_vendor_kpis(*args):
+    # Drain the outbox
+    result = kpis.drain_vendor_outbox()
+
+    # Vendors still inside their debounce window are picked up by a later run
+    if result["pending"] and kpis.is_deferred():
+        recompute_dirty_vendor_kpis.apply_async(countdown=kpis.debounce_seconds())
+
+    # Return the result
+    return result
@@ -0,0 +1,75 @@
+# Imports
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from vendor_management_system.purchase_orders import kpis
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+
+
+# Test a bulk delivery reports each order and keeps the vendor KPIs consistent
+@pytest.mark.django_db
+def test_bulk_deliver(
+    client, api_token, vendor_factory, purchase_order_factory,
+    django_capture_on_commit_callbacks,
+):
+    vendor, other = vendor_factory(address=None), vendor_factory(address=None)
+    issue_date = timezone.now() - datetime.timedelta(days=3)
+    with django_capture_on_commit_callbacks(execute=True):
+        acknowledged = [
+            purchase_order_factory(
+                vendor=vendor,
+                status="ACKNOWLEDGED",
+                issue_date=issue_date,
+                acknowledgment_date=issue_date + datetime.timedelta(hours=2),
+                expected_delivery_date=timezone.now() + datetime.timedelta(days=5),
+            )
+            for _ in range(3)
+        ]
+        pending = purchase_order_factory(vendor=vendor, status="PENDING", issue_date=None)
+        foreign = purchase_order_factory(vendor=other, status="ACKNOWLEDGED")
+
+    orders = [{"po_number": order.po_number, "vendor": vendor.vendor_code} for order in acknowledged]
+    orders += [
+        {"po_number": pending.po_number, "vendor": vendor.vendor_code},
+        {"po_number": foreign.po_number, "vendor": vendor.vendor_code},
+        {"po_number": "MISSING", "vendor": vendor.vendor_code},
+        {"po_number": acknowledged[0].po_number, "vendor": vendor.vendor_code},
+    ]
+
+    url = reverse("purchase_orders--bulk-transition", kwargs={"transition": "deliver"})
+    with django_capture_on_commit_callbacks(execute=True):
+        http_response = client.post(
+            f"{url}?token={api_token}", {"orders": orders}, content_type="application/json"
+        )
+    assert http_response.status_code == 200
+    data = http_response.json()
+
+    assert (data["succeeded"], data["failed"]) == (3, 4)
+    assert [result.get("error") for result in data["results"][3:]] == [
+        "This order is not yet acknowledged",
+        "This vendor is not the same as the issued vendor",
+        "Purchase order not found",
+        "Duplicated purchase order",
+    ]
+    assert PurchaseOrder.objects.filter(status="DELIVERED").count() == 3
+    assert PurchaseOrder.objects.get(pk=foreign.pk).status == "ACKNOWLEDGED"
+
+    # The counters match a rebuild from the orders and the KPIs are written
+    assert kpis.rebuild_vendor_counters([vendor.pk], dry_run=True) == {}
+    vendor.refresh_from_db()
+    assert vendor.fulfillment_rate == 100.0
+
+
+# Test an unknown transition
+@pytest.mark.django_db
+def test_bulk_unknown_transition(client, api_token):
+    url = reverse("purchase_orders--bulk-transition", kwargs={"transition": "archive"})
+    http_response = client.post(
+        f"{url}?token={api_token}",
+        {"orders": [{"po_number": "A", "vendor": "B"}]},
+        content_type="application/json",
+    )
+    assert http_response.status_code == 404
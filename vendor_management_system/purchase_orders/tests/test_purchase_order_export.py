@@ -0,0 +1,45 @@
+# Imports
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.urls import reverse
+
+from vendor_management_system.core import exports
+
+
+# Test the purchase orders are streamed in batches as NDJSON, CSV and gzip
+@pytest.mark.django_db
+def test_export_streams_orders(
+    client, api_token, monkeypatch, vendor_factory, purchase_order_factory
+):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    vendor = vendor_factory(address=None)
+    orders = [purchase_order_factory(vendor=vendor, status="PENDING") for _ in range(5)]
+    url = reverse("purchase_orders--export-orders")
+
+    # NDJSON
+    response = client.get(url, {"token": api_token})
+    assert response.streaming
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert sorted(row["po_number"] for row in rows) == sorted(o.po_number for o in orders)
+    assert "items" not in rows[0]
+
+    # Gzip compressed CSV
+    response = client.get(
+        url, {"token": api_token, "output": "csv"}, HTTP_ACCEPT_ENCODING="gzip"
+    )
+    assert response["Content-Encoding"] == "gzip"
+    content = gzip.decompress(b"".join(response.streaming_content)).decode()
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert len(rows) == 5
+    assert rows[0]["vendor_id"] == vendor.vendor_code
+
+    # Incremental export and invalid parameters
+    latest = max(orders, key=lambda order: order.order_date)
+    response = client.get(url, {"token": api_token, "since": latest.order_date.isoformat()})
+    assert len(b"".join(response.streaming_content).splitlines()) == 1
+    assert client.get(url, {"token": api_token, "output": "xml"}).status_code == 400
+    assert client.get(url, {"token": api_token, "since": "2024-13-45"}).status_code == 400
@@ -0,0 +1,77 @@
+# Imports
+import pytest
+from django.urls import reverse
+
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+
+
+# Test the lines follow the items and the quantity is their aggregate
+@pytest.mark.django_db
+def test_order_lines_follow_items(client, api_token):
+    url = reverse("purchase_orders--list-create-order")
+    http_response = client.post(
+        f"{url}?token={api_token}",
+        {
+            "order_date": "2024-05-01T10:00:00Z",
+            "items": [{"item": "bolt", "quantity": 5}, {"item": "nut", "quantity": 7}],
+        },
+        content_type="application/json",
+    )
+    assert http_response.status_code == 201
+    assert http_response.json()["quantity"] == 12
+
+    order = PurchaseOrder.objects.get(pk=http_response.json()["po_number"])
+    assert order.quantity == 12
+    assert [(line.line_number, line.item, line.quantity) for line in order.lines.all()] == [
+        (1, "bolt", 5),
+        (2, "nut", 7),
+    ]
+
+    # A save of other fields keeps the lines
+    line_ids = [*order.lines.values_list("pk", flat=True)]
+    order = PurchaseOrder.objects.get(pk=order.pk)
+    order.status = "CANCELLED"
+    order.save()
+    assert [*order.lines.values_list("pk", flat=True)] == line_ids
+
+    # A save of the items replaces the lines
+    order.items = [{"item": "washer", "quantity": 3}]
+    order.save()
+    order.refresh_from_db()
+    assert order.quantity == 3
+    assert [line.item for line in order.lines.all()] == ["washer"]
+
+
+# Test the item aggregates are grouped in the database
+@pytest.mark.django_db
+def test_item_aggregates(client, api_token, vendor_factory, purchase_order_factory):
+    vendor, other = vendor_factory(address=None), vendor_factory(address=None)
+    purchase_order_factory(
+        vendor=vendor, status="ISSUED", items=[{"item": "bolt", "quantity": 10}]
+    )
+    purchase_order_factory(
+        vendor=other,
+        status="ISSUED",
+        items=[{"item": "bolt", "quantity": 4}, {"item": "nut", "quantity": 20}],
+    )
+    purchase_order_factory(
+        vendor=other, status="CANCELLED", items=[{"item": "nut", "quantity": 50}]
+    )
+
+    url = reverse("purchase_orders--top-items")
+    http_response = client.get(f"{url}?token={api_token}&status=issued")
+    assert http_response.status_code == 200
+    assert http_response.json() == [
+        {"item": "nut", "quantity": 20, "orders": 1, "vendors": 1},
+        {"item": "bolt", "quantity": 14, "orders": 2, "vendors": 2},
+    ]
+    assert len(client.get(f"{url}?token={api_token}&limit=1").json()) == 1
+    assert client.get(f"{url}?token={api_token}&since=never").status_code == 400
+
+    url = reverse("purchase_orders--vendor-volume")
+    http_response = client.get(f"{url}?token={api_token}&item=bolt")
+    assert http_response.status_code == 200
+    assert http_response.json() == [
+        {"vendor_code": vendor.vendor_code, "quantity": 10, "orders": 1, "items": 1},
+        {"vendor_code": other.vendor_code, "quantity": 4, "orders": 1, "items": 1},
+    ]
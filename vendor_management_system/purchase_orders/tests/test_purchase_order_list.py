@@ -0,0 +1,60 @@
+# Imports
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+
+# Test the listing queries do not grow with the number of orders
+@pytest.mark.django_db
+@pytest.mark.parametrize("orders", [1, 20])
+def test_list_query_count_is_flat(
+    client, api_token, vendor_factory, purchase_order_factory, django_assert_num_queries, orders
+):
+    vendors = [vendor_factory(address=None) for _ in range(3)]
+    for index in range(orders):
+        purchase_order_factory(vendor=vendors[index % 3], status="PENDING")
+
+    # Token lookup and one joined query for the page
+    with django_assert_num_queries(2):
+        response = client.get(
+            reverse("purchase_orders--list-create-order"), {"token": api_token}
+        )
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == orders
+    assert "vendor_code" in response.json()["results"][0]["vendor"]
+
+
+# Test the listing filters
+@pytest.mark.django_db
+def test_list_filters(client, api_token, vendor_factory, purchase_order_factory):
+    vendor, other = vendor_factory(address=None), vendor_factory(address=None)
+    now = timezone.now()
+    late = purchase_order_factory(
+        vendor=vendor,
+        status="ISSUED",
+        order_date=now - datetime.timedelta(days=20),
+        expected_delivery_date=now - datetime.timedelta(days=1),
+    )
+    purchase_order_factory(
+        vendor=vendor,
+        status="DELIVERED",
+        order_date=now - datetime.timedelta(days=5),
+        expected_delivery_date=now - datetime.timedelta(days=1),
+    )
+    purchase_order_factory(vendor=other, status="PENDING", order_date=now)
+    url = reverse("purchase_orders--list-create-order")
+
+    def po_numbers(**params):
+        response = client.get(url, {"token": api_token, **params})
+        assert response.status_code == 200
+        return {order["po_number"] for order in response.json()["results"]}
+
+    assert len(po_numbers(vendor_code=vendor.vendor_code)) == 2
+    assert len(po_numbers(status="issued,delivered")) == 2
+    assert po_numbers(overdue="true") == {late.po_number}
+    assert po_numbers(
+        order_date_to=(now - datetime.timedelta(days=10)).date().isoformat()
+    ) == {late.po_number}
+    assert client.get(url, {"token": api_token, "order_date_from": "yesterday"}).status_code == 400
@@ -3,8 +3,12 @@ from datetime import datetime
 
 import pytest
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db.utils import IntegrityError
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
+from vendor_management_system.purchase_orders.models import PurchaseOrder
 from vendor_management_system.vendors.models import Vendor
 
 
@@ -152,3 +156,27 @@ def test_valid_dates_status_cancelled(db, purchase_order_factory):
 
     # If the status is "CANCELLED", the actual_delivery_date should be None
     assert purchase_order.actual_delivery_date is None
+
+
+# Test the status transitions read the loaded state instead of the database
+@pytest.mark.django_db
+def test_status_transition_uses_loaded_state(db, purchase_order_factory):
+    # Load an issued order
+    order = purchase_order_factory(status="ISSUED", vendor=None)
+    order = PurchaseOrder.objects.get(pk=order.pk)
+    assert order.get_loaded_state()["status"] == "ISSUED"
+
+    # Acknowledge the order
+    order.status = "ACKNOWLEDGED"
+    with CaptureQueriesContext(connection) as queries:
+        order.save()
+
+    # No SELECT on the purchase orders and the acknowledgment date is stamped
+    assert not [
+        query
+        for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and "purchase_orders_purchaseorder" in query["sql"]
+    ]
+    assert order.acknowledgment_date == timezone.now().date()
+    assert order.get_loaded_state()["status"] == "ACKNOWLEDGED"
@@ -0,0 +1,168 @@
+# Imports
+import datetime
+
+import pytest
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from vendor_management_system.purchase_orders import kpis
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    VendorKPIOutbox,
+    VendorPerformanceCounter,
+)
+from vendor_management_system.vendors.models import Vendor
+
+
+# Function to create an order in a given state for a vendor
+def create_order(purchase_order_factory, vendor, status, on_time=True, rating=None):
+    issue_date = timezone.now() - datetime.timedelta(days=10)
+    acknowledgment_date = issue_date + datetime.timedelta(hours=6)
+    expected_delivery_date = issue_date + datetime.timedelta(days=5)
+    actual_delivery_date = expected_delivery_date + datetime.timedelta(
+        days=-1 if on_time else 1
+    )
+
+    return purchase_order_factory(
+        vendor=vendor,
+        status=status,
+        quality_rating=rating,
+        issue_date=issue_date,
+        acknowledgment_date=acknowledgment_date,
+        expected_delivery_date=expected_delivery_date,
+        actual_delivery_date=actual_delivery_date if status == "DELIVERED" else None,
+    )
+
+
+# Test the counters follow the order transitions
+@pytest.mark.django_db
+def test_counters_follow_order_transitions(
+    db, vendor_factory, purchase_order_factory, django_capture_on_commit_callbacks
+):
+    vendor = vendor_factory(address=None)
+
+    # Create orders in different states
+    with django_capture_on_commit_callbacks(execute=True):
+        create_order(purchase_order_factory, vendor, "ISSUED")
+        create_order(purchase_order_factory, vendor, "ACKNOWLEDGED")
+        create_order(purchase_order_factory, vendor, "DELIVERED", rating=4)
+        late = create_order(purchase_order_factory, vendor, "DELIVERED", on_time=False)
+
+        # Rate the late order and move another one to another vendor
+        late.quality_rating = 2
+        late.save()
+        moved = create_order(purchase_order_factory, vendor, "DELIVERED", rating=5)
+        moved.vendor = vendor_factory(address=None)
+        moved.save()
+
+        # Delete an order
+        create_order(purchase_order_factory, vendor, "CANCELLED").delete()
+
+    # The running counters match the counters computed from scratch
+    counter = VendorPerformanceCounter.objects.get(vendor=vendor)
+    expected = kpis.compute_vendor_counters([vendor.pk])[vendor.pk]
+    for field in kpis.COUNTER_FIELDS:
+        assert getattr(counter, field) == pytest.approx(expected[field])
+
+    # The vendor KPIs follow the original formulas
+    vendor.refresh_from_db()
+    assert vendor.on_time_delivery_rate == 50.0
+    assert vendor.quality_rating_avg == 3.0
+    assert vendor.average_response_time == 6.0
+    assert vendor.fulfillment_rate == 50.0
+
+
+# Test the vendor is written once per transaction
+@pytest.mark.django_db
+def test_vendor_written_once_per_transaction(
+    db, vendor_factory, purchase_order_factory, django_capture_on_commit_callbacks
+):
+    vendor = vendor_factory(address=None)
+    with django_capture_on_commit_callbacks(execute=True):
+        create_order(purchase_order_factory, vendor, "DELIVERED", rating=3)
+
+    # Count the vendor saves
+    saves = []
+
+    def count_save(sender, instance, **kwargs):
+        saves.append(kwargs["update_fields"])
+
+    post_save.connect(count_save, sender=Vendor)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                for _ in range(5):
+                    create_order(purchase_order_factory, vendor, "DELIVERED", rating=5)
+    finally:
+        post_save.disconnect(count_save, sender=Vendor)
+
+    # A single save of the KPI fields only
+    assert len(saves) == 1
+    assert set(saves[0]) <= {*kpis.KPI_FIELDS, "updated_at"}
+
+
+# Test the rebuild reports the drift of the counters
+@pytest.mark.django_db
+def test_rebuild_reports_drift(db, vendor_factory, purchase_order_factory):
+    vendor = vendor_factory(address=None)
+    order = create_order(purchase_order_factory, vendor, "ACKNOWLEDGED")
+
+    # Bulk updates bypass the signals
+    PurchaseOrder.objects.filter(pk=order.pk).update(status="DELIVERED")
+
+    # The drift is reported and fixed
+    drift = kpis.rebuild_vendor_counters([vendor.pk])
+    assert drift[vendor.pk]["delivered_count"] == (0, 1)
+    assert kpis.rebuild_vendor_counters([vendor.pk]) == {}
+
+
+# Test the deferred mode only marks the vendor and the drain recomputes it once
+@pytest.mark.django_db
+def test_deferred_recomputation(db, settings, vendor_factory, purchase_order_factory):
+    settings.VENDOR_KPI_DEFERRED = True
+    vendor = vendor_factory(address=None, fulfillment_rate=None)
+
+    # Deliver many orders of the same vendor
+    for _ in range(10):
+        create_order(purchase_order_factory, vendor, "DELIVERED", rating=4)
+
+    # The vendor is only marked dirty
+    vendor.refresh_from_db()
+    assert vendor.fulfillment_rate is None
+    assert VendorKPIOutbox.objects.filter(vendor=vendor).count() == 1
+    assert kpis.outbox_lag()["pending"] == 1
+
+    # The drain recomputes the vendor and empties the outbox
+    assert kpis.drain_vendor_outbox(debounce=0) == {"recomputed": 1, "pending": 0}
+    vendor.refresh_from_db()
+    assert vendor.fulfillment_rate == 100.0
+    assert vendor.quality_rating_avg == 4.0
+    assert VendorPerformanceCounter.objects.get(vendor=vendor).delivered_count == 10
+
+
+# Benchmark: the KPI computation is one query whatever the number of orders
+@pytest.mark.django_db
+@pytest.mark.parametrize("orders_per_vendor", [1, 10, 40])
+def test_compute_vendor_kpis_query_count_is_flat(
+    db, vendor_factory, purchase_order_factory, django_assert_num_queries, orders_per_vendor
+):
+    vendors = [vendor_factory(address=None) for _ in range(3)]
+    for vendor in vendors:
+        for index in range(orders_per_vendor):
+            status = ["ISSUED", "ACKNOWLEDGED", "DELIVERED"][index % 3]
+            create_order(purchase_order_factory, vendor, status, rating=3)
+
+    # One grouped query for all the vendors
+    with django_assert_num_queries(1):
+        vendor_kpis = kpis.compute_vendor_kpis([vendor.pk for vendor in vendors])
+
+    # The KPIs match the running counters
+    for vendor in vendors:
+        counter = VendorPerformanceCounter.objects.get(vendor=vendor)
+        assert vendor_kpis[vendor.pk] == {
+            **dict.fromkeys(kpis.KPI_FIELDS),
+            **kpis.kpis_from_counters(
+                {field: getattr(counter, field) for field in kpis.COUNTER_FIELDS}
+            ),
+        }
@@ -0,0 +1,125 @@
+# Imports
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from vendor_management_system.purchase_orders import kpis
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.vendors.models import Vendor
+
+
+# Statuses each transition starts from and the status it sets
+TRANSITIONS = {
+    "issue": (("PENDING",), "ISSUED"),
+    "acknowledge": (("ISSUED",), "ACKNOWLEDGED"),
+    "deliver": (("ACKNOWLEDGED",), "DELIVERED"),
+    "cancel": (("PENDING", "ISSUED", "ACKNOWLEDGED"), "CANCELLED"),
+}
+
+# Statuses not reached yet by the order, with the message of each transition
+NOT_READY_MESSAGES = {
+    "acknowledge": "This order is not yet issued",
+    "deliver": "This order is not yet acknowledged",
+}
+
+# Maximum number of orders of a single request
+MAX_BULK_ORDERS = 1000
+
+
+# Function to get the error of an order that cannot make a transition
+def transition_error(name, order, vendor_code, vendors):
+    sources, _ = TRANSITIONS[name]
+
+    if order is None:
+        return "Purchase order not found"
+    if order.status not in sources:
+        if name in NOT_READY_MESSAGES and order.status in ("PENDING", "ISSUED"):
+            return NOT_READY_MESSAGES[name]
+        return "This order is already processed"
+
+    # Issued orders get the vendor, the next transitions must match it
+    if name == "issue":
+        if vendor_code not in vendors:
+            return "Vendor not found"
+    elif order.vendor_id is not None and order.vendor_id != vendor_code:
+        return "This vendor is not the same as the issued vendor"
+    return None
+
+
+# Function to apply a transition to many purchase orders at once
+def bulk_transition(name, items):
+    """
+    The items are dictionaries with the po_number and the vendor. The orders
+    are locked and validated with one query, updated with one UPDATE per
+    vendor and the vendor KPIs are updated once per affected vendor. Returns
+    the result of each item, in the order of the request.
+    """
+    sources, target = TRANSITIONS[name]
+    now = timezone.now()
+    results = []
+
+    with transaction.atomic():
+        # Lock the orders and get their tracked state in one query
+        po_numbers = [item["po_number"] for item in items]
+        orders = {
+            order.pk: order
+            for order in PurchaseOrder.objects.select_for_update()
+            .filter(pk__in=po_numbers)
+            .only(*PurchaseOrder.TRACKED_FIELDS)
+        }
+        vendors = set()
+        if name == "issue":
+            vendors = set(
+                Vendor.objects.filter(
+                    pk__in={item["vendor"] for item in items}
+                ).values_list("pk", flat=True)
+            )
+
+        # Validate the items
+        accepted = defaultdict(list)
+        seen = set()
+        for item in items:
+            po_number, vendor_code = item["po_number"], item["vendor"]
+            order = orders.get(po_number)
+            error = (
+                "Duplicated purchase order"
+                if po_number in seen
+                else transition_error(name, order, vendor_code, vendors)
+            )
+            seen.add(po_number)
+            if error:
+                results.append({"po_number": po_number, "success": False, "error": error})
+                continue
+
+            accepted[order.vendor_id if name != "issue" else vendor_code].append(order)
+            results.append({"po_number": po_number, "success": True, "status": target})
+
+        # Same date as the single transitions stamp
+        date_field = PurchaseOrder.STATUS_TRANSITION_DATES.get((sources[0], target))
+        changes = {"status": target}
+        if date_field is not None:
+            changes[date_field] = kpis.stored_value(now.date())
+
+        # Write the changes with one UPDATE per vendor
+        transitions = []
+        for vendor_code, vendor_orders in accepted.items():
+            vendor_changes = {**changes, "vendor_id": vendor_code} if name == "issue" else changes
+            PurchaseOrder.objects.filter(
+                pk__in=[order.pk for order in vendor_orders]
+            ).update(**vendor_changes)
+
+            for order in vendor_orders:
+                previous_state = order.get_tracked_state()
+                transitions.append(
+                    (
+                        kpis.order_state(previous_state),
+                        kpis.order_state({**previous_state, **vendor_changes}),
+                    )
+                )
+
+        # The bulk update bypasses the signals: update the KPIs once per vendor
+        kpis.apply_order_transitions(transitions)
+
+    # Return the result of each item
+    return results
@@ -1,7 +1,11 @@
 # Imports
 from django.urls import path
 
-from vendor_management_system.purchase_orders.views import PurchaseOrderViewSet
+from vendor_management_system.purchase_orders.views import (
+    PurchaseOrderItemViewSet,
+    PurchaseOrderViewSet,
+    VendorKPIQueueViewSet,
+)
 
 
 # Define the URL patterns for the purchase_orders app
@@ -11,6 +15,31 @@ urlpatterns = [
         PurchaseOrderViewSet.as_view({"get": "list", "post": "create"}),
         name="purchase_orders--list-create-order",
     ),
+    path(
+        "export/",
+        PurchaseOrderViewSet.as_view({"get": "export"}),
+        name="purchase_orders--export-orders",
+    ),
+    path(
+        "kpi-queue/",
+        VendorKPIQueueViewSet.as_view({"get": "lag"}),
+        name="purchase_orders--kpi-queue-lag",
+    ),
+    path(
+        "items/top/",
+        PurchaseOrderItemViewSet.as_view({"get": "top"}),
+        name="purchase_orders--top-items",
+    ),
+    path(
+        "items/vendors/",
+        PurchaseOrderItemViewSet.as_view({"get": "vendors"}),
+        name="purchase_orders--vendor-volume",
+    ),
+    path(
+        "bulk/<transition>/",
+        PurchaseOrderViewSet.as_view({"post": "bulk_transition"}),
+        name="purchase_orders--bulk-transition",
+    ),
     path(
         "<po_number>/",
         PurchaseOrderViewSet.as_view(
@@ -1,6 +1,8 @@
 # Imports
+import datetime
+
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
+from django.utils import dateparse, timezone
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import permissions, response, status, viewsets
@@ -8,9 +10,20 @@ from rest_framework import permissions, response, status, viewsets
 from vendor_management_system.core.authentication import (
     QueryParameterTokenAuthentication,
 )
+from vendor_management_system.core.exports import (
+    EXPORT_FORMATS,
+    export_response,
+    parse_since,
+)
+from vendor_management_system.core.pagination import KeysetPagination
 
-from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.purchase_orders import kpis, lines, transitions
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    PurchaseOrderLine,
+)
 from vendor_management_system.purchase_orders.serializers import (
+    PurchaseOrderBulkTransitionSerializer,
     PurchaseOrderCreateUpdateSerializer,
     PurchaseOrderListSerializer,
     PurchaseOrderOnlyVendorSerializer,
@@ -21,6 +34,69 @@ from vendor_management_system.purchase_orders.serializers import (
 from vendor_management_system.vendors.models import Vendor
 
 
+# Columns of the purchase order export
+PURCHASE_ORDER_EXPORT_COLUMNS = (
+    "po_number",
+    "vendor_id",
+    "order_date",
+    "expected_delivery_date",
+    "actual_delivery_date",
+    "quantity",
+    "status",
+    "quality_rating",
+    "issue_date",
+    "acknowledgment_date",
+)
+
+# Default and maximum number of rows of the item aggregates
+ITEM_AGGREGATE_LIMIT = 20
+ITEM_AGGREGATE_MAX_LIMIT = 100
+
+# Filters of the item aggregates
+ITEM_AGGREGATE_PARAMETERS = [
+    openapi.Parameter(
+        name="token",
+        format="string",
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        required=True,
+        description="The token to authenticate the user",
+    ),
+    openapi.Parameter(
+        name="status",
+        format="string",
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        required=False,
+        description="Filter by order status (comma separated)",
+    ),
+    openapi.Parameter(
+        name="since",
+        format="date-time",
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        required=False,
+        description="Only the orders placed on or after this date",
+    ),
+    openapi.Parameter(
+        name="until",
+        format="date-time",
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        required=False,
+        description="Only the orders placed before this date",
+    ),
+    openapi.Parameter(
+        name="limit",
+        format="integer",
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_INTEGER,
+        required=False,
+        description="Number of rows (default: 20, max: 100)",
+    ),
+]
+
+
 # Class based ViewSet for PurchaseOrder
 class PurchaseOrderViewSet(viewsets.ViewSet):
     # Set the permission and authentication classes
@@ -30,7 +106,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
     # Method to handle listing all purchase orders
     @swagger_auto_schema(
         operation_id="purchase_orders--list-orders",
-        operation_description="List all purchase orders",
+        operation_description="List the purchase orders by order date, one page at a time",
         manual_parameters=[
             openapi.Parameter(
                 name="token",
@@ -39,25 +115,208 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
                 type=openapi.TYPE_STRING,
                 required=True,
                 description="The token to authenticate the user",
-            )
+            ),
+            openapi.Parameter(
+                name="status",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Filter by status (comma separated)",
+            ),
+            openapi.Parameter(
+                name="vendor_code",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Filter by vendor code",
+            ),
+            openapi.Parameter(
+                name="order_date_from",
+                format="date-time",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Orders placed on or after this date",
+            ),
+            openapi.Parameter(
+                name="order_date_to",
+                format="date-time",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Orders placed on or before this date",
+            ),
+            openapi.Parameter(
+                name="overdue",
+                format="boolean",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+                description="Only the open orders past their expected delivery date",
+            ),
+            openapi.Parameter(
+                name="cursor",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Opaque cursor of the page (from the next/previous links)",
+            ),
+            openapi.Parameter(
+                name="page_size",
+                format="integer",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="Number of orders per page (default: 50, max: 500)",
+            ),
         ],
         responses={
             status.HTTP_200_OK: openapi.Response(
-                "List of all purchase orders", schema=PurchaseOrderSerializer(many=True)
+                "Page of purchase orders",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "next": openapi.Schema(type=openapi.TYPE_STRING),
+                        "previous": openapi.Schema(type=openapi.TYPE_STRING),
+                        "results": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                        ),
+                    },
+                ),
             ),
+            status.HTTP_400_BAD_REQUEST: "Invalid filter",
             status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+            status.HTTP_404_NOT_FOUND: "Invalid cursor",
         },
         tags=["Purchase Orders"],
     )
     def list(self, request):
-        # Get all purchase orders
-        orders = PurchaseOrder.objects.all()
+        # Get the purchase orders with their vendor, without the items
+        orders = PurchaseOrder.objects.select_related("vendor").defer("items")
+
+        # Filter by status and vendor
+        order_status = request.query_params.get("status")
+        if order_status:
+            orders = orders.filter(status__in=order_status.upper().split(","))
+
+        vendor_code = request.query_params.get("vendor_code")
+        if vendor_code:
+            orders = orders.filter(vendor_id=vendor_code)
+
+        # Filter by order date range
+        for name, lookup in (("order_date_from", "gte"), ("order_date_to", "lte")):
+            value = request.query_params.get(name)
+            if not value:
+                continue
+            # A day covers the whole day
+            day = dateparse.parse_date(value)
+            if day is not None:
+                date = datetime.datetime.combine(
+                    day, datetime.time.min if lookup == "gte" else datetime.time.max
+                )
+            else:
+                date = dateparse.parse_datetime(value)
+            if date is None:
+                return response.Response(
+                    {"detail": f"Invalid '{name}' date: {value}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if timezone.is_naive(date):
+                date = timezone.make_aware(date)
+            orders = orders.filter(**{f"order_date__{lookup}": date})
+
+        # Filter the open orders past their expected delivery date
+        if request.query_params.get("overdue", "").lower() == "true":
+            orders = orders.filter(
+                status__in=["PENDING", "ISSUED", "ACKNOWLEDGED"],
+                expected_delivery_date__lt=timezone.now(),
+            )
+
+        # Get the page of purchase orders after the cursor
+        pagination = KeysetPagination(ordering=("order_date", "po_number"))
+        page = pagination.paginate_queryset(orders, request)
 
         # Serialize the purchase orders
-        serializer = PurchaseOrderListSerializer(orders, many=True)
+        serializer = PurchaseOrderListSerializer(page, many=True)
 
         # Return the response
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        return pagination.get_paginated_response(serializer.data)
+
+    # Method to stream all the purchase orders as a file
+    @swagger_auto_schema(
+        operation_id="purchase_orders--export-orders",
+        operation_description=(
+            "Stream all the purchase orders as NDJSON or CSV, gzip compressed "
+            "when the client accepts it"
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+            openapi.Parameter(
+                name="output",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                enum=["ndjson", "csv"],
+                description="Format of the export (default: ndjson)",
+            ),
+            openapi.Parameter(
+                name="since",
+                format="date-time",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Only the rows ordered on or after this date",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: "Stream of purchase orders",
+            status.HTTP_400_BAD_REQUEST: "Invalid format or date",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Purchase Orders"],
+    )
+    def export(self, request):
+        export_format = request.query_params.get("output", "ndjson").lower()
+        if export_format not in EXPORT_FORMATS:
+            return response.Response(
+                {"detail": f"Invalid output format: {export_format}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        orders = PurchaseOrder.objects.all()
+
+        # Incremental export of the orders placed since a date
+        since = request.query_params.get("since")
+        if since:
+            since_date = parse_since(since)
+            if since_date is None:
+                return response.Response(
+                    {"detail": f"Invalid 'since' date: {since}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            orders = orders.filter(order_date__gte=since_date)
+
+        # Stream a projection of the columns
+        return export_response(
+            request,
+            orders.values_list(*PURCHASE_ORDER_EXPORT_COLUMNS),
+            columns=PURCHASE_ORDER_EXPORT_COLUMNS,
+            key="po_number",
+            filename="purchase_orders",
+            export_format=export_format,
+        )
 
     # Method to handle new purchase order creation
     @swagger_auto_schema(
@@ -92,12 +351,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
             # Get the data from order_create_serializer
             order_create_serializer_data = order_create_serializer.validated_data
 
-            # Update the quantity
-            order_create_serializer_data["quantity"] = sum(
-                item["quantity"] for item in order_create_serializer_data["items"]
-            )
-
-            # Create a new PurchaseOrder instance
+            # Create a new PurchaseOrder instance (the quantity comes from its lines)
             purchase_order = PurchaseOrder.objects.create(
                 **order_create_serializer_data
             )
@@ -210,12 +464,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
             # Add the vendor to the validated data
             validated_data["vendor"] = vendor
 
-            # Update the quantity
-            validated_data["quantity"] = sum(
-                item["quantity"] for item in validated_data["items"]
-            )
-
-            # Update the order
+            # Update the order (the quantity comes from its lines)
             order = order_create_serializer.save()
 
             # Serialize the updated purchase order
@@ -328,8 +577,8 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
             # Set the status to ISSUED
             order.status = "ISSUED"
 
-            # Save the order
-            order.save()
+            # Save the order (the issue date is stamped by the signal)
+            order.save(update_fields=["vendor", "status", "issue_date"])
 
             # Serialize the updated purchase order
             serializer = PurchaseOrderSerializer(order)
@@ -410,8 +659,8 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
             # Set the status to ACKNOWLEDGED
             order.status = "ACKNOWLEDGED"
 
-            # Save the order
-            order.save()
+            # Save the order (the acknowledgment date is stamped by the signal)
+            order.save(update_fields=["status", "acknowledgment_date"])
 
             # Serialize the updated purchase order
             serializer = PurchaseOrderSerializer(order)
@@ -491,8 +740,8 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
             # Set the status to DELIVERED
             order.status = "DELIVERED"
 
-            # Save the order
-            order.save()
+            # Save the order (the delivery date is stamped by the signal)
+            order.save(update_fields=["status", "actual_delivery_date"])
 
             # Serialize the updated purchase order
             serializer = PurchaseOrderSerializer(order)
@@ -564,7 +813,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
             order.status = "CANCELLED"
 
             # Save the order
-            order.save()
+            order.save(update_fields=["status"])
 
             # Serialize the updated purchase order
             serializer = PurchaseOrderSerializer(order)
@@ -577,6 +826,93 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
             cancel_serializer.errors, status=status.HTTP_400_BAD_REQUEST
         )
 
+    # Method to apply a transition to many purchase orders in one call
+    @swagger_auto_schema(
+        operation_id="purchase_orders--bulk-transition",
+        operation_description=(
+            "Issue, acknowledge, deliver or cancel many orders in one call; "
+            "returns the result of each order"
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+            openapi.Parameter(
+                name="transition",
+                format="string",
+                in_=openapi.IN_PATH,
+                type=openapi.TYPE_STRING,
+                required=True,
+                enum=[*transitions.TRANSITIONS],
+                description="The transition to apply to the orders",
+            ),
+        ],
+        request_body=PurchaseOrderBulkTransitionSerializer,
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                "The result of each order",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "succeeded": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "failed": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "results": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    "po_number": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "success": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                                    "status": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "error": openapi.Schema(type=openapi.TYPE_STRING),
+                                },
+                            ),
+                        ),
+                    },
+                ),
+            ),
+            status.HTTP_400_BAD_REQUEST: "Bad request",
+            status.HTTP_404_NOT_FOUND: "Unknown transition",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Purchase Orders Process Operations"],
+    )
+    def bulk_transition(self, request, transition=None):
+        # Check the transition exists
+        if transition not in transitions.TRANSITIONS:
+            return response.Response(
+                {"detail": f"Unknown transition: {transition}"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        # Deserialize and validate the data
+        serializer = PurchaseOrderBulkTransitionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return response.Response(
+                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Apply the transition
+        results = transitions.bulk_transition(
+            transition, serializer.validated_data["orders"]
+        )
+        succeeded = sum(result["success"] for result in results)
+
+        # Return the result of each order
+        return response.Response(
+            {
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
     # Method to update the purchase order and set the quality rating
     @swagger_auto_schema(
         operation_id="purchase_orders--rate-quality",
@@ -648,7 +984,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
             ]
 
             # Save the order
-            order.save()
+            order.save(update_fields=["quality_rating"])
 
             # Serialize the updated purchase order
             serializer = PurchaseOrderSerializer(order)
@@ -660,3 +996,139 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
         return response.Response(
             rate_quality_serializer.errors, status=status.HTTP_400_BAD_REQUEST
         )
+
+
+# Class based ViewSet for the aggregates of the purchase order lines
+class PurchaseOrderItemViewSet(viewsets.ViewSet):
+    # Set the permission and authentication classes
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [QueryParameterTokenAuthentication]
+
+    # Method to get the lines matching the filters, or the error of a filter
+    def filter_lines(self, request):
+        order_lines = PurchaseOrderLine.objects.all()
+
+        # Filter by order status
+        order_status = request.query_params.get("status")
+        if order_status:
+            order_lines = order_lines.filter(
+                purchase_order__status__in=order_status.upper().split(",")
+            )
+
+        # Filter by order date range
+        for name, lookup in (("since", "gte"), ("until", "lt")):
+            value = request.query_params.get(name)
+            if not value:
+                continue
+            date = parse_since(value)
+            if date is None:
+                return None, f"Invalid '{name}' date: {value}"
+            order_lines = order_lines.filter(**{f"purchase_order__order_date__{lookup}": date})
+
+        return order_lines, None
+
+    # Method to get the number of rows requested by the client
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params["limit"])
+        except (KeyError, ValueError):
+            return ITEM_AGGREGATE_LIMIT
+        return max(1, min(limit, ITEM_AGGREGATE_MAX_LIMIT))
+
+    # Method to list the items ordered the most
+    @swagger_auto_schema(
+        operation_id="purchase_orders--top-items",
+        operation_description=(
+            "List the items ordered the most, with the number of orders and "
+            "vendors of each item"
+        ),
+        manual_parameters=ITEM_AGGREGATE_PARAMETERS,
+        responses={
+            status.HTTP_200_OK: "Items by ordered quantity",
+            status.HTTP_400_BAD_REQUEST: "Invalid filter",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Purchase Orders"],
+    )
+    def top(self, request):
+        order_lines, error = self.filter_lines(request)
+        if error:
+            return response.Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Group the lines by item in the database
+        items = lines.top_items(order_lines, self.get_limit(request))
+
+        # Return the response
+        return response.Response([*items], status=status.HTTP_200_OK)
+
+    # Method to list the quantity ordered from each vendor
+    @swagger_auto_schema(
+        operation_id="purchase_orders--vendor-volume",
+        operation_description=(
+            "List the quantity ordered from each vendor, optionally for a "
+            "single item"
+        ),
+        manual_parameters=[
+            *ITEM_AGGREGATE_PARAMETERS,
+            openapi.Parameter(
+                name="item",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Filter by item",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: "Vendors by ordered quantity",
+            status.HTTP_400_BAD_REQUEST: "Invalid filter",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Purchase Orders"],
+    )
+    def vendors(self, request):
+        order_lines, error = self.filter_lines(request)
+        if error:
+            return response.Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Filter by item
+        item = request.query_params.get("item")
+        if item:
+            order_lines = order_lines.filter(item=item)
+
+        # Group the lines by vendor in the database
+        vendors = lines.vendor_volume(order_lines, self.get_limit(request))
+
+        # Return the response
+        return response.Response([*vendors], status=status.HTTP_200_OK)
+
+
+# Class based ViewSet for the deferred vendor KPI recomputation queue
+class VendorKPIQueueViewSet(viewsets.ViewSet):
+    # Set the permission and authentication classes
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [QueryParameterTokenAuthentication]
+
+    # Method to report the lag of the vendor KPI outbox
+    @swagger_auto_schema(
+        operation_id="purchase_orders--kpi-queue-lag",
+        operation_description="Report the vendors waiting for the KPI recomputation and the queue lag",
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            )
+        ],
+        responses={
+            status.HTTP_200_OK: "Queue lag",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Purchase Orders"],
+    )
+    def lag(self, request):
+        # Return the lag of the outbox
+        return response.Response(kpis.outbox_lag(), status=status.HTTP_200_OK)
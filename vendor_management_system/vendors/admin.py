@@ -6,6 +6,12 @@ from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Count
 
+from vendor_management_system.core.cache import invalidate_tags
+from vendor_management_system.vendors.alerts import refresh_vendor_alert_state
+from vendor_management_system.vendors.hierarchy import (
+    invalidate_category_tree,
+    refresh_category_stats,
+)
 from vendor_management_system.vendors.models import Vendor, Address, Category
 
 
@@ -170,6 +176,8 @@ class CategoryAdmin(admin.ModelAdmin):
     
     def activate_categories(self, request, queryset):
         updated = queryset.update(is_active=True)
+        invalidate_category_tree()
+        invalidate_tags("categories:all")
         self.message_user(
             request,
             f'{updated} categoria/e attivata/e.'
@@ -178,6 +186,8 @@ class CategoryAdmin(admin.ModelAdmin):
     
     def deactivate_categories(self, request, queryset):
         updated = queryset.update(is_active=False)
+        invalidate_category_tree()
+        invalidate_tags("categories:all")
         self.message_user(
             request,
             f'{updated} categoria/e disattivata/e.'
@@ -545,7 +555,12 @@ class VendorAdmin(admin.ModelAdmin):
     
     # Add custom actions
     def mark_as_approved(self, request, queryset):
+        # Read the rows first, the update may take them out of a filtered changelist
+        vendors = [*queryset.values_list('pk', 'category', 'vendor_code')]
         updated = queryset.update(qualification_status='APPROVED')
+        refresh_category_stats({category for _, category, _ in vendors})
+        refresh_vendor_alert_state([pk for pk, _, _ in vendors])
+        invalidate_tags('vendors:list', *(f'vendor:{code}' for _, _, code in vendors))
         self.message_user(
             request,
             f'{updated} vendor(s) marked as approved.'
@@ -553,7 +568,12 @@ class VendorAdmin(admin.ModelAdmin):
     mark_as_approved.short_description = _('Mark selected vendors as approved')
     
     def mark_as_pending(self, request, queryset):
+        # Read the rows first, the update may take them out of a filtered changelist
+        vendors = [*queryset.values_list('pk', 'category', 'vendor_code')]
         updated = queryset.update(qualification_status='PENDING')
+        refresh_category_stats({category for _, category, _ in vendors})
+        refresh_vendor_alert_state([pk for pk, _, _ in vendors])
+        invalidate_tags('vendors:list', *(f'vendor:{code}' for _, _, code in vendors))
         self.message_user(
             request,
             f'{updated} vendor(s) marked as pending.'
@@ -561,7 +581,12 @@ class VendorAdmin(admin.ModelAdmin):
     mark_as_pending.short_description = _('Mark selected vendors as pending')
     
     def mark_as_rejected(self, request, queryset):
+        # Read the rows first, the update may take them out of a filtered changelist
+        vendors = [*queryset.values_list('pk', 'category', 'vendor_code')]
         updated = queryset.update(qualification_status='REJECTED')
+        refresh_category_stats({category for _, category, _ in vendors})
+        refresh_vendor_alert_state([pk for pk, _, _ in vendors])
+        invalidate_tags('vendors:list', *(f'vendor:{code}' for _, _, code in vendors))
         self.message_user(
             request,
             f'{updated} vendor(s) marked as rejected.'
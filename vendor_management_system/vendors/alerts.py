@@ -0,0 +1,121 @@
+# Imports
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Min, Q, Value, When
+from django.utils import timezone
+
+from vendor_management_system.vendors.models import Vendor, VendorAlertState
+
+
+# Bit of each alert reason, in the order of the response
+ALERT_REASONS = {
+    "overdue_audits": 1,
+    "expired_qualifications": 2,
+    "high_risk_vendors": 4,
+    "missing_certification": 8,
+    "no_category": 16,
+}
+
+
+# Function to get the condition of each alert reason on a day
+def alert_conditions(today):
+    return {
+        "overdue_audits": Q(next_audit_due__lt=today),
+        "expired_qualifications": Q(
+            qualification_expiry__lt=today, qualification_status="APPROVED"
+        ),
+        "high_risk_vendors": Q(risk_level="HIGH"),
+        "missing_certification": Q(
+            category__requires_certification=True,
+            qualification_status__in=["PENDING", "REJECTED"],
+        ),
+        "no_category": Q(category__isnull=True),
+    }
+
+
+# Function to get the expression of the alert bitmask of a vendor
+def alert_flags_expression(today):
+    flags = Value(0)
+    for reason, condition in alert_conditions(today).items():
+        flags = flags + Case(
+            When(condition, then=Value(ALERT_REASONS[reason])),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    return flags
+
+
+# Function to get the reasons of a bitmask
+def alert_reasons(flags):
+    return [reason for reason, bit in ALERT_REASONS.items() if flags & bit]
+
+
+# Function to get the vendors with at least one alert, each once with its bitmask
+def compute_vendor_alerts(today=None, vendor_ids=None):
+    today = today or timezone.localdate()
+    vendors = Vendor.objects.annotate(
+        alert_flags=alert_flags_expression(today)
+    ).filter(alert_flags__gt=0)
+    if vendor_ids is not None:
+        vendors = vendors.filter(pk__in=vendor_ids)
+    return vendors
+
+
+# Function to refresh the precomputed alerts of some (or all) vendors
+def refresh_vendor_alert_state(vendor_ids=None, today=None):
+    today = today or timezone.localdate()
+    now = timezone.now()
+    if vendor_ids is not None:
+        vendor_ids = [pk for pk in vendor_ids if pk]
+        if not vendor_ids:
+            return 0
+
+    # Evaluate the alerts in one scan
+    flagged = compute_vendor_alerts(today, vendor_ids).values_list("pk", "alert_flags")
+
+    # Backends without a conflict target (MySQL) use the primary key
+    unique_fields = None
+    if connection.features.supports_update_conflicts_with_target:
+        unique_fields = ["vendor"]
+
+    states = VendorAlertState.objects.bulk_create(
+        [
+            VendorAlertState(
+                vendor_id=vendor_id, flags=flags, computed_on=today, refreshed_at=now
+            )
+            for vendor_id, flags in flagged
+        ],
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=["flags", "computed_on", "refreshed_at"],
+    )
+
+    # Drop the rows of the vendors not flagged anymore
+    stale = VendorAlertState.objects.filter(refreshed_at__lt=now)
+    if vendor_ids is not None:
+        stale = stale.filter(vendor_id__in=vendor_ids)
+    stale.delete()
+
+    # Return the number of flagged vendors
+    return len(states)
+
+
+# Function to get the vendors with at least one precomputed alert
+def precomputed_vendor_alerts():
+    return Vendor.objects.filter(alert_state__flags__gt=0).annotate(
+        alert_flags=F("alert_state__flags")
+    )
+
+
+# Function to get the vendors requiring attention with their alert bitmask
+def get_vendor_alerts(today=None):
+    today = today or timezone.localdate()
+
+    # Pre-filtered rows of the precomputed table, when fully refreshed today
+    if getattr(settings, "VENDOR_ALERTS_PRECOMPUTED", False):
+        oldest = VendorAlertState.objects.aggregate(oldest=Min("computed_on"))["oldest"]
+        if oldest is not None and oldest >= today:
+            return precomputed_vendor_alerts()
+
+    # Otherwise the alerts of one scan
+    return compute_vendor_alerts(today)
@@ -8,3 +8,8 @@ class VendorsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "vendor_management_system.vendors"
     verbose_name = _("Vendors")
+
+    # Ready method
+    def ready(self):
+        # Import the signals module
+        import vendor_management_system.vendors.signals
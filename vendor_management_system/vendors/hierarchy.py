@@ -0,0 +1,196 @@
+# Imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Q
+
+from vendor_management_system.vendors.models import Category, CategoryStats, Vendor
+
+
+# Cache of the category tree, dropped on every category or vendor category change
+CATEGORY_TREE_CACHE_KEY = "vendors:category-tree"
+CATEGORY_TREE_CACHE_TIMEOUT = 60 * 60
+
+# Vendor fields changing the vendor counts of the categories
+CATEGORY_COUNT_FIELDS = {"category", "category_id", "is_active"}
+
+# Vendor fields changing the category statistics
+CATEGORY_STATS_FIELDS = {
+    *CATEGORY_COUNT_FIELDS,
+    "qualification_status",
+    "risk_level",
+}
+
+# Category fields rendered in the tree
+CATEGORY_TREE_FIELDS = (
+    "id",
+    "code",
+    "name",
+    "description",
+    "color_code",
+    "sort_order",
+)
+
+
+# Vendor counts of the category statistics
+CATEGORY_STATS_COUNTS = {
+    "vendor_count": Q(is_active=True),
+    "approved_vendors": Q(qualification_status="APPROVED"),
+    "pending_vendors": Q(qualification_status="PENDING"),
+    "rejected_vendors": Q(qualification_status="REJECTED"),
+    "high_risk_vendors": Q(risk_level="HIGH"),
+}
+
+
+# Function to get the number of active vendors of each category in one query
+def category_vendor_counts():
+    return dict(
+        Vendor.objects.filter(is_active=True, category__isnull=False)
+        .order_by()
+        .values("category")
+        .annotate(count=Count("pk"))
+        .values_list("category", "count")
+    )
+
+
+# Function to load all the categories with their own and subtree vendor counts
+def load_category_nodes(counts=None):
+    if counts is None:
+        counts = category_vendor_counts()
+    nodes = {}
+    for category in (
+        Category.objects.order_by("sort_order", "name")
+        .values(*CATEGORY_TREE_FIELDS, "parent_id", "is_active", "depth")
+        .iterator()
+    ):
+        vendor_count = counts.get(category["id"], 0)
+        nodes[category["id"]] = {
+            **category,
+            "vendor_count": vendor_count,
+            "total_vendor_count": vendor_count,
+            "subcategories": [],
+        }
+
+    # Link the children in the category order and roll the totals up, deepest first
+    for node in nodes.values():
+        parent = nodes.get(node["parent_id"])
+        if parent is not None:
+            parent["subcategories"].append(node)
+    for node in sorted(nodes.values(), key=lambda node: node["depth"], reverse=True):
+        parent = nodes.get(node["parent_id"])
+        if parent is not None:
+            parent["total_vendor_count"] += node["total_vendor_count"]
+
+    return nodes
+
+
+# Function to render a node and its active subcategories
+def render_node(node):
+    return {
+        **{field: node[field] for field in CATEGORY_TREE_FIELDS},
+        "vendor_count": node["vendor_count"],
+        "total_vendor_count": node["total_vendor_count"],
+        "subcategories": [
+            render_node(child) for child in node["subcategories"] if child["is_active"]
+        ],
+    }
+
+
+# Function to build the tree of the active categories
+def build_category_tree():
+    nodes = load_category_nodes()
+    return [
+        render_node(node)
+        for node in nodes.values()
+        if node["parent_id"] is None and node["is_active"]
+    ]
+
+
+# Function to get the cached tree of the active categories
+def get_category_tree():
+    return cache.get_or_set(
+        CATEGORY_TREE_CACHE_KEY, build_category_tree, CATEGORY_TREE_CACHE_TIMEOUT
+    )
+
+
+# Function to drop the cached tree
+def invalidate_category_tree():
+    cache.delete(CATEGORY_TREE_CACHE_KEY)
+
+
+# Function to get the statistics of the categories in one grouped query
+def compute_category_stats(category_ids=None):
+    vendors = Vendor.objects.filter(category__isnull=False)
+    if category_ids is not None:
+        vendors = vendors.filter(category__in=category_ids)
+
+    return {
+        row.pop("category"): row
+        for row in vendors.order_by()
+        .values("category")
+        .annotate(
+            **{
+                name: Count("pk", filter=condition)
+                for name, condition in CATEGORY_STATS_COUNTS.items()
+            }
+        )
+    }
+
+
+# Function to write the precomputed statistics of some (or all) categories
+def refresh_category_stats(category_ids=None):
+    # Only the categories still existing
+    categories = Category.objects.all()
+    if category_ids is not None:
+        categories = categories.filter(pk__in=[pk for pk in category_ids if pk])
+    category_ids = list(categories.values_list("pk", flat=True))
+    if not category_ids:
+        return
+
+    stats = compute_category_stats(category_ids)
+    empty = dict.fromkeys(CATEGORY_STATS_COUNTS, 0)
+
+    # Backends without a conflict target (MySQL) use the primary key
+    unique_fields = None
+    if connection.features.supports_update_conflicts_with_target:
+        unique_fields = ["category"]
+
+    CategoryStats.objects.bulk_create(
+        [
+            CategoryStats(category_id=category_id, **stats.get(category_id, empty))
+            for category_id in category_ids
+        ],
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=[*CATEGORY_STATS_COUNTS, "updated_at"],
+    )
+
+
+# Function to get the statistics of the active categories with the subtree totals
+def get_category_stats():
+    # Counts from the precomputed table or from one grouped query
+    if getattr(settings, "CATEGORY_STATS_PRECOMPUTED", False):
+        stats = {
+            row.pop("category"): row
+            for row in CategoryStats.objects.values("category", *CATEGORY_STATS_COUNTS)
+        }
+    else:
+        stats = compute_category_stats()
+
+    # Merge the counts with the hierarchy rollup
+    nodes = load_category_nodes(
+        {category_id: row["vendor_count"] for category_id, row in stats.items()}
+    )
+    empty = dict.fromkeys(CATEGORY_STATS_COUNTS, 0)
+    return [
+        {
+            "id": node["id"],
+            "code": node["code"],
+            "name": node["name"],
+            **empty,
+            **stats.get(node["id"], {}),
+            "total_vendor_count": node["total_vendor_count"],
+        }
+        for node in nodes.values()
+        if node["is_active"]
+    ]
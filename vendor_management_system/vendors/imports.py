@@ -0,0 +1,288 @@
+# Imports
+import csv
+import io
+import itertools
+import time
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+
+from vendor_management_system.core.cache import invalidate_tags
+from vendor_management_system.vendors import alerts, hierarchy
+from vendor_management_system.vendors.models import Address, Category, Vendor
+
+
+# Supported import formats
+IMPORT_FORMATS = ("csv", "xlsx")
+
+# Rows validated and written per batch
+IMPORT_CHUNK_SIZE = 1000
+
+# Vendor columns of the import file (the export columns are accepted as well)
+VENDOR_IMPORT_COLUMNS = (
+    "vendor_code",
+    "name",
+    "contact_details",
+    "vat_number",
+    "fiscal_code",
+    "email",
+    "reference_contact",
+    "phone",
+    "website",
+    "country",
+    "iso_certifications",
+    "qualification_status",
+    "qualification_date",
+    "qualification_expiry",
+    "risk_level",
+    "last_audit_date",
+    "next_audit_due",
+    "review_notes",
+    "is_active",
+)
+
+# Address columns of the import file and the fields they map to
+ADDRESS_IMPORT_COLUMNS = {
+    "street_address": "street_address",
+    "street_address_2": "street_address_2",
+    "city": "city",
+    "state_province": "state_province",
+    "postal_code": "postal_code",
+    "address_country": "country",
+}
+
+# Column of the category code
+CATEGORY_IMPORT_COLUMN = "category_code"
+
+# Relations not validated row by row (the categories come from the lookup map)
+VENDOR_EXCLUDED_FIELDS = ["address", "category"]
+
+
+# Function to read the rows of a CSV file as dictionaries
+def read_csv(file):
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    header = [column.strip().lower() for column in next(reader, [])]
+    for row in reader:
+        yield dict(zip(header, row))
+
+
+# Function to read the rows of the first sheet of an XLSX file as dictionaries
+def read_xlsx(file):
+    # Imported here, only the XLSX imports need it
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(column or "").strip().lower() for column in next(rows, [])]
+        for row in rows:
+            if any(value not in (None, "") for value in row):
+                yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+# Function to read the rows of an import file
+def read_rows(file, file_format):
+    if file_format == "xlsx":
+        return read_xlsx(file)
+    return read_csv(file)
+
+
+# Function to convert a cell to the value of a model field
+def field_value(field, value):
+    if isinstance(value, str):
+        value = value.strip()
+    if value in (None, ""):
+        return None if field.null else ""
+    try:
+        return field.to_python(value)
+    except ValidationError:
+        # Left to the validation of the row, which reports the message
+        return value
+
+
+# Function to build the vendor and the address of a row
+def build_row(values, columns, categories):
+    errors = {}
+
+    # Vendor fields
+    vendor = Vendor(
+        **{
+            column: field_value(Vendor._meta.get_field(column), values.get(column))
+            for column in columns
+            if column in VENDOR_IMPORT_COLUMNS
+        }
+    )
+    if not vendor.vendor_code:
+        vendor.vendor_code = str(uuid.uuid4()).replace("-", "")[:10].upper()
+
+    # Category from the lookup map of the active categories
+    if CATEGORY_IMPORT_COLUMN in columns:
+        code = str(values.get(CATEGORY_IMPORT_COLUMN) or "").strip()
+        if code and code not in categories:
+            errors[CATEGORY_IMPORT_COLUMN] = ["Categoria non trovata o non attiva."]
+        vendor.category_id = categories.get(code)
+
+    try:
+        vendor.clean_fields(exclude=VENDOR_EXCLUDED_FIELDS)
+    except ValidationError as error:
+        errors.update(error.message_dict)
+
+    # Address, when the row has one
+    address = None
+    address_values = {
+        field: field_value(Address._meta.get_field(field), values.get(column))
+        for column, field in ADDRESS_IMPORT_COLUMNS.items()
+        if column in columns
+    }
+    if any(address_values.values()):
+        address = Address(**address_values)
+        try:
+            address.clean_fields(exclude=["id"])
+        except ValidationError as error:
+            errors.update(
+                {f"address.{field}": messages for field, messages in error.message_dict.items()}
+            )
+
+    return vendor, address, errors
+
+
+# Function to validate and upsert a chunk of rows
+def import_chunk(rows, columns, categories, seen, dry_run=False):
+    errors = []
+    valid = []
+
+    # Validate the rows
+    for line, values in rows:
+        vendor, address, row_errors = build_row(values, columns, categories)
+        if vendor.vendor_code in seen:
+            row_errors.setdefault("vendor_code", []).append("Codice fornitore duplicato nel file.")
+        seen.add(vendor.vendor_code)
+        if row_errors:
+            errors.append({"row": line, "vendor_code": vendor.vendor_code, "errors": row_errors})
+        else:
+            valid.append((vendor, address))
+
+    # Current address and category of the vendors already existing
+    existing = {
+        vendor_code: (address_id, category_id)
+        for vendor_code, address_id, category_id in Vendor.objects.filter(
+            pk__in=[vendor.vendor_code for vendor, _ in valid]
+        ).values_list("pk", "address_id", "category_id")
+    }
+    result = {
+        "created": sum(vendor.vendor_code not in existing for vendor, _ in valid),
+        "updated": sum(vendor.vendor_code in existing for vendor, _ in valid),
+        "errors": errors,
+    }
+    if dry_run or not valid:
+        return result
+
+    # Existing vendors keep their address, which is updated in place
+    new_addresses, changed_addresses = [], []
+    for vendor, address in valid:
+        vendor.address_id = existing.get(vendor.vendor_code, (None, None))[0]
+        if address is None:
+            continue
+        if vendor.address_id:
+            address.id = vendor.address_id
+            changed_addresses.append(address)
+        else:
+            vendor.address_id = address.id
+            new_addresses.append(address)
+
+    # Fields written on the vendors already existing
+    update_fields = [
+        column for column in VENDOR_IMPORT_COLUMNS[1:] if column in columns
+    ]
+    if CATEGORY_IMPORT_COLUMN in columns:
+        update_fields.append("category")
+    if new_addresses:
+        update_fields.append("address")
+    update_fields.append("updated_at")
+    address_fields = [
+        field for column, field in ADDRESS_IMPORT_COLUMNS.items() if column in columns
+    ]
+
+    # Backends without a conflict target (MySQL) use the primary key
+    unique_fields = None
+    if connection.features.supports_update_conflicts_with_target:
+        unique_fields = ["vendor_code"]
+
+    # Write the chunk
+    with transaction.atomic():
+        Address.objects.bulk_create(new_addresses)
+        if changed_addresses:
+            Address.objects.bulk_update(changed_addresses, address_fields)
+        Vendor.objects.bulk_create(
+            [vendor for vendor, _ in valid],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+
+    # The bulk writes bypass the signals: refresh the derived data
+    vendor_codes = [vendor.vendor_code for vendor, _ in valid]
+    category_ids = {vendor.category_id for vendor, _ in valid}
+    category_ids |= {category_id for _, category_id in existing.values()}
+    hierarchy.refresh_category_stats(category_ids)
+    alerts.refresh_vendor_alert_state(vendor_codes)
+    invalidate_tags("vendors:list", *(f"vendor:{code}" for code in vendor_codes))
+
+    return result
+
+
+# Function to import the vendors of a file in chunks
+def import_vendors(file, file_format="csv", chunk_size=IMPORT_CHUNK_SIZE, dry_run=False):
+    """
+    Rows are validated and upserted on the vendor code in chunks. The columns
+    missing from the file are left unchanged on the existing vendors and a row
+    without a vendor code creates a new vendor. The invalid rows are skipped
+    and reported with their line number.
+    """
+    started = time.monotonic()
+
+    # One lookup map for the category codes
+    categories = dict(
+        Category.objects.filter(is_active=True).values_list("code", "id")
+    )
+
+    rows = read_rows(file, file_format)
+    first = next(rows, None)
+    columns = set(first or {})
+    known = {*VENDOR_IMPORT_COLUMNS, *ADDRESS_IMPORT_COLUMNS, CATEGORY_IMPORT_COLUMN}
+
+    # Line numbers start after the header
+    numbered = enumerate(itertools.chain([first] if first else [], rows), start=2)
+    seen = set()
+    result = {"rows": 0, "created": 0, "updated": 0, "failed": 0, "errors": []}
+
+    while True:
+        chunk = list(itertools.islice(numbered, chunk_size))
+        if not chunk:
+            break
+        chunk_result = import_chunk(chunk, columns, categories, seen, dry_run=dry_run)
+        result["rows"] += len(chunk)
+        result["created"] += chunk_result["created"]
+        result["updated"] += chunk_result["updated"]
+        result["failed"] += len(chunk_result["errors"])
+        result["errors"].extend(chunk_result["errors"])
+
+    # The category counts may have changed
+    if not dry_run and result["created"] + result["updated"]:
+        hierarchy.invalidate_category_tree()
+
+    # Report the throughput
+    seconds = time.monotonic() - started
+    result.update(
+        {
+            "dry_run": dry_run,
+            "ignored_columns": sorted(columns - known),
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(result["rows"] / seconds, 1) if seconds else None,
+        }
+    )
+    return result
@@ -0,0 +1,79 @@
+# Imports
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vendor_management_system.vendors import imports
+
+
+# Command to import the vendors of a CSV or XLSX file
+class Command(BaseCommand):
+    help = "Import the vendors of a CSV or XLSX file, upserted on the vendor code in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or XLSX file with a header row")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=imports.IMPORT_CHUNK_SIZE,
+            help="Rows validated and written per batch",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only validate the rows without writing the vendors",
+        )
+        parser.add_argument(
+            "--errors",
+            dest="errors_path",
+            help="Write the errors of the invalid rows to this CSV file",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = path.rsplit(".", 1)[-1].lower()
+        if file_format not in imports.IMPORT_FORMATS:
+            raise CommandError(f"Unsupported file format: {file_format}")
+
+        # Import the file
+        try:
+            with open(path, "rb") as file:
+                result = imports.import_vendors(
+                    file,
+                    file_format=file_format,
+                    chunk_size=options["chunk_size"],
+                    dry_run=options["dry_run"],
+                )
+        except OSError as error:
+            raise CommandError(str(error))
+
+        # Report the errors, one row per field
+        if options["errors_path"]:
+            with open(options["errors_path"], "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["row", "vendor_code", "field", "message"])
+                for error in result["errors"]:
+                    for field, messages in error["errors"].items():
+                        for message in messages:
+                            writer.writerow([error["row"], error["vendor_code"], field, message])
+        else:
+            for error in result["errors"]:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Row {error['row']} ({error['vendor_code']}): "
+                        f"{json.dumps(error['errors'], ensure_ascii=False)}"
+                    )
+                )
+
+        # Report the throughput
+        if result["ignored_columns"]:
+            self.stdout.write(f"Ignored columns: {', '.join(result['ignored_columns'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Dry run: ' if result['dry_run'] else ''}"
+                f"{result['rows']} rows, {result['created']} created, "
+                f"{result['updated']} updated, {result['failed']} failed "
+                f"in {result['seconds']}s ({result['rows_per_second']} rows/s)"
+            )
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0005_vendor_is_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now, help_text="Data dell'ultima modifica del fornitore", verbose_name='Aggiornato il'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:05
+
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    Category = apps.get_model('vendors', 'Category')
+
+    # Walk the hierarchy from the roots, one level at a time
+    level = list(Category.objects.filter(parent__isnull=True))
+    depth = 0
+    while level:
+        for category in level:
+            parent_path = category.parent.path if category.parent_id else ''
+            category.path = f"{parent_path}{category.id.hex}/"
+            category.depth = depth
+        Category.objects.bulk_update(level, ['path', 'depth'])
+        level = list(
+            Category.objects.filter(parent__in=level).select_related('parent')
+        )
+        depth += 1
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0006_vendor_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Livello di profondità nella gerarchia (0 per le radici)', verbose_name='Profondità'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, help_text='Percorso materializzato della categoria nella gerarchia', max_length=700, verbose_name='Percorso'),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
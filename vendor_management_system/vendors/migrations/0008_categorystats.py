@@ -0,0 +1,59 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_category_stats(apps, schema_editor):
+    Category = apps.get_model('vendors', 'Category')
+    CategoryStats = apps.get_model('vendors', 'CategoryStats')
+    Vendor = apps.get_model('vendors', 'Vendor')
+
+    # One grouped query for the counts of all the categories
+    counts = {
+        row.pop('category'): row
+        for row in Vendor.objects.filter(category__isnull=False)
+        .order_by()
+        .values('category')
+        .annotate(
+            vendor_count=Count('pk', filter=Q(is_active=True)),
+            approved_vendors=Count('pk', filter=Q(qualification_status='APPROVED')),
+            pending_vendors=Count('pk', filter=Q(qualification_status='PENDING')),
+            rejected_vendors=Count('pk', filter=Q(qualification_status='REJECTED')),
+            high_risk_vendors=Count('pk', filter=Q(risk_level='HIGH')),
+        )
+    }
+    CategoryStats.objects.bulk_create(
+        [
+            CategoryStats(category_id=category_id, **counts.get(category_id, {}))
+            for category_id in Category.objects.values_list('pk', flat=True)
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0007_category_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='vendors.category', verbose_name='Categoria')),
+                ('vendor_count', models.PositiveIntegerField(default=0, verbose_name='Fornitori Attivi')),
+                ('approved_vendors', models.PositiveIntegerField(default=0, verbose_name='Fornitori Approvati')),
+                ('pending_vendors', models.PositiveIntegerField(default=0, verbose_name='Fornitori in Attesa')),
+                ('rejected_vendors', models.PositiveIntegerField(default=0, verbose_name='Fornitori Respinti')),
+                ('high_risk_vendors', models.PositiveIntegerField(default=0, verbose_name='Fornitori ad Alto Rischio')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Aggiornato il')),
+            ],
+            options={
+                'verbose_name': 'Statistiche Categoria',
+                'verbose_name_plural': 'Statistiche Categorie',
+            },
+        ),
+        migrations.RunPython(build_category_stats, migrations.RunPython.noop),
+    ]
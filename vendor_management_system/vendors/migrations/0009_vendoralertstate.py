@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0008_categorystats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorAlertState',
+            fields=[
+                ('vendor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='alert_state', serialize=False, to='vendors.vendor', verbose_name='Fornitore')),
+                ('flags', models.PositiveIntegerField(db_index=True, default=0, verbose_name='Motivi')),
+                ('computed_on', models.DateField(verbose_name='Calcolato per il')),
+                ('refreshed_at', models.DateTimeField(verbose_name='Aggiornato il')),
+            ],
+            options={
+                'verbose_name': 'Stato Avvisi Fornitore',
+                'verbose_name_plural': 'Stati Avvisi Fornitori',
+                'db_table': 'vendor_alert_state',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0009_vendoralertstate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['next_audit_due'], name='vendors_ven_next_au_84d5e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['qualification_status', 'qualification_expiry'], name='vendors_ven_qualifi_85dba5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['risk_level', 'name', 'vendor_code'], name='vendors_ven_risk_le_038517_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'qualification_status'], name='vendors_ven_categor_ae61b5_idx'),
+        ),
+    ]
@@ -2,7 +2,9 @@
 import uuid
 
 from django.core import validators
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
@@ -50,6 +52,23 @@ class Category(models.Model):
         help_text=_("Categoria padre per struttura gerarchica")
     )
     
+    # Materialized path of the ids from the root (e.g. "<root>/<parent>/<id>/")
+    path = models.CharField(
+        _("Percorso"),
+        max_length=700,
+        editable=False,
+        db_index=True,
+        default="",
+        help_text=_("Percorso materializzato della categoria nella gerarchia")
+    )
+    
+    depth = models.PositiveSmallIntegerField(
+        _("Profondità"),
+        editable=False,
+        default=0,
+        help_text=_("Livello di profondità nella gerarchia (0 per le radici)")
+    )
+    
     # Status and classification
     is_active = models.BooleanField(
         _("È Attiva"),
@@ -117,19 +136,25 @@ class Category(models.Model):
             return f"{self.parent.name} > {self.name}"
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Path as stored, to move the descendants when the category is reparented
+        instance._loaded_path = instance.__dict__.get('path')
+        return instance
+
     @property
     def full_name(self):
         """Ritorna il nome completo inclusi i parent"""
-        if self.parent:
-            return f"{self.parent.full_name} > {self.name}"
-        return self.name
+        if not self.parent_id:
+            return self.name
+        names = [ancestor.name for ancestor in reversed(self.get_ancestors())]
+        return " > ".join(names + [self.name])
     
     @property
     def level(self):
         """Ritorna il livello di profondità nella gerarchia"""
-        if self.parent:
-            return self.parent.level + 1
-        return 0
+        return self.depth
     
     @property
     def vendor_count(self):
@@ -139,23 +164,28 @@ class Category(models.Model):
     @property
     def total_vendor_count(self):
         """Ritorna il numero totale di vendor incluse le sottocategorie"""
-        count = self.vendor_count
-        for subcategory in self.subcategories.all():
-            count += subcategory.total_vendor_count
-        return count
+        return Vendor.objects.filter(
+            is_active=True, category__path__startswith=self.path
+        ).count()
+
+    def build_path(self):
+        """Calcola percorso e profondità a partire dal parent"""
+        if self.parent_id:
+            parent = self.parent
+            return f"{parent.path}{self.id.hex}/", parent.depth + 1
+        return f"{self.id.hex}/", 0
 
     def clean(self):
         """Validazioni custom"""
         super().clean()
         
-        # Evita cicli nella gerarchia
-        if self.parent:
-            parent = self.parent
-            while parent:
-                if parent == self:
-                    from django.core.exceptions import ValidationError
-                    raise ValidationError(_("Una categoria non può essere genitore di se stessa"))
-                parent = parent.parent
+        # Evita cicli nella gerarchia: il parent non può essere un discendente
+        if self.parent_id:
+            if self.parent_id == self.id or (
+                self.path and self.parent.path.startswith(self.path)
+            ):
+                from django.core.exceptions import ValidationError
+                raise ValidationError(_("Una categoria non può essere genitore di se stessa"))
         
         # Valida il codice colore
         if self.color_code:
@@ -170,30 +200,92 @@ class Category(models.Model):
             self.code = self.name[:20].upper().replace(' ', '_')
         
         self.full_clean()
-        super().save(*args, **kwargs)
+
+        # Aggiorna il percorso materializzato
+        old_path = getattr(self, '_loaded_path', None)
+        self.path, self.depth = self.build_path()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'parent' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'path', 'depth'}
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            # Sposta i discendenti in caso di cambio del parent
+            if old_path and old_path != self.path:
+                Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(self.path), Substr('path', len(old_path) + 1)),
+                    depth=F('depth') + (self.path.count('/') - old_path.count('/')),
+                )
+        self._loaded_path = self.path
 
     def get_descendants(self, include_self=False):
         """Ritorna tutti i discendenti di questa categoria"""
-        descendants = []
-        if include_self:
-            descendants.append(self)
-        
-        for child in self.subcategories.all():
-            descendants.extend(child.get_descendants(include_self=True))
-        
-        return descendants
+        descendants = Category.objects.filter(path__startswith=self.path).order_by('path')
+        if not include_self:
+            descendants = descendants.exclude(pk=self.pk)
+        return list(descendants)
 
     def get_ancestors(self, include_self=False):
-        """Ritorna tutti gli antenati di questa categoria"""
-        ancestors = []
-        if include_self:
-            ancestors.append(self)
-        
-        if self.parent:
-            ancestors.extend(self.parent.get_ancestors(include_self=True))
-        
-        return ancestors
+        """Ritorna tutti gli antenati di questa categoria, dal parent alla radice"""
+        ids = [uuid.UUID(segment) for segment in self.path.split('/') if segment]
+        if not include_self:
+            ids = ids[:-1]
+        return list(Category.objects.filter(id__in=ids).order_by('-depth'))
 
+# Model for CategoryStats
+class CategoryStats(models.Model):
+    """
+    Conteggi precalcolati dei fornitori di una categoria, aggiornati quando
+    cambiano categoria, stato, qualifica o rischio di un fornitore
+    """
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name=_("Categoria"),
+    )
+    vendor_count = models.PositiveIntegerField(_("Fornitori Attivi"), default=0)
+    approved_vendors = models.PositiveIntegerField(_("Fornitori Approvati"), default=0)
+    pending_vendors = models.PositiveIntegerField(_("Fornitori in Attesa"), default=0)
+    rejected_vendors = models.PositiveIntegerField(_("Fornitori Respinti"), default=0)
+    high_risk_vendors = models.PositiveIntegerField(_("Fornitori ad Alto Rischio"), default=0)
+    updated_at = models.DateTimeField(_("Aggiornato il"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Statistiche Categoria")
+        verbose_name_plural = _("Statistiche Categorie")
+
+    def __str__(self):
+        return f"{self.category_id} - stats"
+
+
+# Model for the precomputed vendor alerts
+class VendorAlertState(models.Model):
+    """
+    Motivi di attenzione di un fornitore come bitmask, aggiornati ogni notte
+    e quando cambiano i campi da cui dipendono; solo i fornitori segnalati
+    hanno una riga
+    """
+    vendor = models.OneToOneField(
+        "Vendor",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="alert_state",
+        verbose_name=_("Fornitore"),
+    )
+    flags = models.PositiveIntegerField(_("Motivi"), default=0, db_index=True)
+    computed_on = models.DateField(_("Calcolato per il"))
+    refreshed_at = models.DateTimeField(_("Aggiornato il"))
+
+    class Meta:
+        db_table = "vendor_alert_state"
+        verbose_name = _("Stato Avvisi Fornitore")
+        verbose_name_plural = _("Stati Avvisi Fornitori")
+
+    def __str__(self):
+        return f"{self.vendor_id} - {self.flags}"
 
 
 # Model for Address
@@ -532,17 +624,65 @@ class Vendor(models.Model):
         default=True,
         help_text=_("Fornitore attivo")
     )
+    updated_at = models.DateTimeField(
+        _("Aggiornato il"),
+        auto_now=True,
+        db_index=True,
+        help_text=_("Data dell'ultima modifica del fornitore")
+    )
 
     # Metadata
     class Meta:
         verbose_name = _("Fornitore")
         verbose_name_plural = _("Fornitori")
         ordering = ["name"]
+        # Indexes of the alerts and of the list filters (composite rather than
+        # partial, MySQL does not support the partial indexes)
+        indexes = [
+            models.Index(fields=["next_audit_due"]),
+            models.Index(fields=["qualification_status", "qualification_expiry"]),
+            models.Index(fields=["risk_level", "name", "vendor_code"]),
+            models.Index(fields=["category", "qualification_status"]),
+        ]
 
     # String representation
     def __str__(self):
         return self.name
 
+    # Fields counted in the category statistics
+    CATEGORY_STATS_FIELDS = ("category_id", "is_active", "qualification_status", "risk_level")
+
+    # Fields the alerts depend on
+    ALERT_FIELDS = (
+        "category_id",
+        "next_audit_due",
+        "qualification_expiry",
+        "qualification_status",
+        "risk_level",
+    )
+
+    # Method to record the counted and the alert fields when the instance is loaded
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(Vendor, cls).from_db(db, field_names, values)
+        instance._loaded_stats_state = instance.get_stats_state()
+        instance._loaded_alert_state = instance.get_alert_state()
+        return instance
+
+    # Method to get the values of some fields (None when some were not loaded)
+    def get_field_state(self, fields):
+        if any(field not in self.__dict__ for field in fields):
+            return None
+        return {field: self.__dict__[field] for field in fields}
+
+    # Method to get the counted fields
+    def get_stats_state(self):
+        return self.get_field_state(self.CATEGORY_STATS_FIELDS)
+
+    # Method to get the alert fields
+    def get_alert_state(self):
+        return self.get_field_state(self.ALERT_FIELDS)
+
     # Save method
     def save(self, *args, **kwargs):
         # If vendor code is not specified
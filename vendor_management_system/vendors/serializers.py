@@ -48,10 +48,9 @@ class CategorySerializer(ModelSerializer):
                     'parent': 'Una categoria non può essere genitore di se stessa.'
                 })
             
-            # Controlla cicli più profondi
+            # Controlla cicli più profondi: il parent non può essere un discendente
             if instance:
-                ancestors = parent.get_ancestors(include_self=True)
-                if instance in ancestors:
+                if instance.path and parent.path.startswith(instance.path):
                     raise ValidationError({
                         'parent': 'Questa relazione creerebbe un ciclo nella gerarchia.'
                     })
@@ -464,6 +463,28 @@ class VendorListSerializer(ModelSerializer):
             "address",
         ]
 
+    # Model columns needed by each field when only some fields are requested
+    model_fields = {
+        "is_qualified": ["qualification_status", "qualification_expiry"],
+        "audit_overdue": ["next_audit_due"],
+    }
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Keep only the requested fields
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def get_model_fields(cls, fields):
+        """Model columns to select to serialize the given fields"""
+        columns = []
+        for name in fields:
+            columns.extend(cls.model_fields.get(name, [name]))
+        return columns
+
 
 # Serializer specifico per category tree/hierarchy
 class CategoryTreeSerializer(ModelSerializer):
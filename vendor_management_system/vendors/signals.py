@@ -0,0 +1,124 @@
+# Imports
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from vendor_management_system.core.cache import invalidate_tags
+from vendor_management_system.purchase_orders.kpis import KPI_FIELDS
+from vendor_management_system.vendors import alerts, hierarchy
+from vendor_management_system.vendors.models import Address, Category, Vendor
+
+
+# Vendor fields not shown by the list endpoints
+VENDOR_DETAIL_ONLY_FIELDS = {*KPI_FIELDS, "updated_at"}
+
+
+# Create a signal to drop the cached category tree when a category changes
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree_on_category_change(sender, instance, **kwargs):
+    transaction.on_commit(hierarchy.invalidate_category_tree)
+
+
+# Create a signal to drop the cached category tree when the vendor counts may change
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+def invalidate_category_tree_on_vendor_change(sender, instance, **kwargs):
+    # Saves of other fields (e.g. the KPIs) do not change the counts
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not set(update_fields) & hierarchy.CATEGORY_COUNT_FIELDS:
+        return
+
+    transaction.on_commit(hierarchy.invalidate_category_tree)
+
+
+# Create a signal to refresh the statistics of the categories of a changed vendor
+@receiver(post_save, sender=Vendor)
+def refresh_category_stats_on_vendor_save(sender, instance, created, **kwargs):
+    # Saves of other fields (e.g. the KPIs) do not change the statistics
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not set(update_fields) & hierarchy.CATEGORY_STATS_FIELDS:
+        return
+
+    previous = getattr(instance, "_loaded_stats_state", None)
+    current = instance.get_stats_state()
+    if not created and previous is not None and previous == current:
+        return
+
+    # Refresh the previous and the current category
+    category_ids = {instance.category_id}
+    if previous is not None:
+        category_ids.add(previous["category_id"])
+    transaction.on_commit(lambda: hierarchy.refresh_category_stats(category_ids))
+    instance._loaded_stats_state = current
+
+
+# Create a signal to refresh the statistics of the category of a deleted vendor
+@receiver(post_delete, sender=Vendor)
+def refresh_category_stats_on_vendor_delete(sender, instance, **kwargs):
+    category_ids = {instance.category_id}
+    transaction.on_commit(lambda: hierarchy.refresh_category_stats(category_ids))
+
+
+# Create a signal to refresh the precomputed alerts of a changed vendor
+@receiver(post_save, sender=Vendor)
+def refresh_vendor_alert_state_on_vendor_save(sender, instance, created, **kwargs):
+    # Saves of other fields (e.g. the KPIs) do not change the alerts
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not set(update_fields) & set(Vendor.ALERT_FIELDS):
+        return
+
+    previous = getattr(instance, "_loaded_alert_state", None)
+    current = instance.get_alert_state()
+    if not created and previous is not None and previous == current:
+        return
+
+    vendor_ids = [instance.pk]
+    transaction.on_commit(lambda: alerts.refresh_vendor_alert_state(vendor_ids))
+    instance._loaded_alert_state = current
+
+
+# Create a signal to refresh the precomputed alerts of the vendors of a changed category
+@receiver(post_save, sender=Category)
+def refresh_vendor_alert_state_on_category_save(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    # The certification requirement decides the missing certification alert
+    vendor_ids = list(instance.vendors.values_list("pk", flat=True))
+    transaction.on_commit(lambda: alerts.refresh_vendor_alert_state(vendor_ids))
+
+
+# Create a signal to invalidate the cached responses showing a changed vendor
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+def invalidate_vendor_responses(sender, instance, **kwargs):
+    tags = [f"vendor:{instance.vendor_code}"]
+
+    # Saves of the KPIs only do not change the lists
+    update_fields = kwargs.get("update_fields")
+    if update_fields is None or not set(update_fields) <= VENDOR_DETAIL_ONLY_FIELDS:
+        tags.append("vendors:list")
+
+    # After the commit, or a concurrent read would cache the previous rows
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+# Create a signal to invalidate the cached responses showing a changed category
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_responses(sender, instance, **kwargs):
+    tags = [f"category:{instance.pk}", "categories:all"]
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+# Create a signal to invalidate the cached responses showing a changed address
+@receiver(post_save, sender=Address)
+@receiver(pre_delete, sender=Address)
+def invalidate_address_responses(sender, instance, **kwargs):
+    # Read before a delete, when the vendors still point to the address
+    vendor_codes = [
+        *Vendor.objects.filter(address=instance).values_list("vendor_code", flat=True)
+    ]
+    tags = ["vendors:list", *(f"vendor:{code}" for code in vendor_codes)]
+    transaction.on_commit(lambda: invalidate_tags(*tags))
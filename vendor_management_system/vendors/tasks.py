@@ -0,0 +1,20 @@
+# Imports
+import logging
+
+from celery import shared_task
+
+from vendor_management_system.vendors import alerts
+
+
+logger = logging.getLogger(__name__)
+
+
+# Task to refresh the precomputed alerts of all the vendors for the new day
+@shared_task
+def refresh_vendor_alerts(*args):
+    # Re-evaluate the date based alerts in one scan
+    count = alerts.refresh_vendor_alert_state()
+    logger.info("Vendor alerts: %s flagged vendors", count)
+
+    # Return the number of flagged vendors
+    return count
@@ -0,0 +1,102 @@
+# Imports
+import pytest
+from django.core.exceptions import ValidationError
+
+from vendor_management_system.vendors import hierarchy
+from vendor_management_system.vendors.models import Category, Vendor
+
+
+# Test the materialized path follows the hierarchy and the reparenting
+@pytest.mark.django_db
+def test_category_path_follows_reparenting(db, vendor_factory, django_assert_num_queries):
+    root = Category.objects.create(code="ROOT", name="Root")
+    other = Category.objects.create(code="OTHER", name="Other")
+    child = Category.objects.create(code="CHILD", name="Child", parent=root)
+    leaf = Category.objects.create(code="LEAF", name="Leaf", parent=child)
+    vendor_factory(address=None, category=leaf)
+
+    assert leaf.path == f"{root.id.hex}/{child.id.hex}/{leaf.id.hex}/"
+    assert leaf.level == 2
+
+    # Single query lookups
+    with django_assert_num_queries(1):
+        assert [c.code for c in root.get_descendants()] == ["CHILD", "LEAF"]
+    with django_assert_num_queries(1):
+        assert [c.code for c in leaf.get_ancestors()] == ["CHILD", "ROOT"]
+    with django_assert_num_queries(1):
+        assert root.total_vendor_count == 1
+
+    # Moving a subtree moves its descendants
+    child.parent = other
+    child.save()
+    leaf.refresh_from_db()
+    assert leaf.path == f"{other.id.hex}/{child.id.hex}/{leaf.id.hex}/"
+    assert leaf.full_name == "Other > Child > Leaf"
+    assert root.total_vendor_count == 0
+    assert other.total_vendor_count == 1
+
+    # A category cannot be moved under its descendants
+    other.parent = leaf
+    with pytest.raises(ValidationError):
+        other.save()
+
+
+# Test the category tree is built with two queries and cached
+@pytest.mark.django_db
+def test_category_tree(
+    db, vendor_factory, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    hierarchy.invalidate_category_tree()
+    root = Category.objects.create(code="ROOT", name="Root")
+    child = Category.objects.create(code="CHILD", name="Child", parent=root)
+    hidden = Category.objects.create(code="HIDDEN", name="Hidden", parent=root, is_active=False)
+    vendor_factory(address=None, category=root)
+    vendor_factory(address=None, category=child)
+    vendor_factory(address=None, category=hidden)
+
+    with django_assert_num_queries(2):
+        tree = hierarchy.get_category_tree()
+    with django_assert_num_queries(0):
+        assert hierarchy.get_category_tree() == tree
+
+    # Inactive subcategories are hidden but still counted in the totals
+    assert [node["code"] for node in tree] == ["ROOT"]
+    assert tree[0]["vendor_count"] == 1
+    assert tree[0]["total_vendor_count"] == 3
+    assert [node["code"] for node in tree[0]["subcategories"]] == ["CHILD"]
+
+    # A new vendor drops the cache once committed
+    with django_capture_on_commit_callbacks(execute=True):
+        vendor_factory(address=None, category=child)
+    assert hierarchy.get_category_tree()[0]["total_vendor_count"] == 4
+
+
+# Test the category stats come from one grouped query, live or precomputed
+@pytest.mark.django_db
+@pytest.mark.parametrize("precomputed", [False, True])
+def test_category_stats(
+    db, settings, vendor_factory, django_assert_num_queries, django_capture_on_commit_callbacks, precomputed
+):
+    settings.CATEGORY_STATS_PRECOMPUTED = precomputed
+    root = Category.objects.create(code="ROOT", name="Root")
+    child = Category.objects.create(code="CHILD", name="Child", parent=root)
+    with django_capture_on_commit_callbacks(execute=True):
+        vendor_factory(address=None, category=root, qualification_status="APPROVED")
+        moving = vendor_factory(address=None, category=child, risk_level="HIGH")
+        moving = Vendor.objects.get(pk=moving.pk)
+        moving.category = root
+        moving.qualification_status = "REJECTED"
+        moving.save()
+        vendor_factory(address=None, category=child, qualification_status="PENDING")
+
+    # Categories and counts
+    with django_assert_num_queries(2):
+        stats = {row["code"]: row for row in hierarchy.get_category_stats()}
+
+    assert stats["ROOT"]["vendor_count"] == 2
+    assert stats["ROOT"]["approved_vendors"] == 1
+    assert stats["ROOT"]["rejected_vendors"] == 1
+    assert stats["ROOT"]["high_risk_vendors"] == 1
+    assert stats["ROOT"]["total_vendor_count"] == 3
+    assert stats["CHILD"]["pending_vendors"] == 1
+    assert stats["CHILD"]["high_risk_vendors"] == 0
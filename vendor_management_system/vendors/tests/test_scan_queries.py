@@ -0,0 +1,47 @@
+# Imports
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+
+from vendor_management_system.core import query_plans
+from vendor_management_system.core.management.commands import scan_queries
+from vendor_management_system.core.query_plans import explain_query
+from vendor_management_system.vendors.models import Vendor
+
+
+# Test the alert and filter queries are served by the indexes
+@pytest.mark.django_db
+def test_scan_queries_uses_indexes():
+    out = StringIO()
+    call_command(
+        "scan_queries",
+        "--query", "vendors.alerts",
+        "--query", "vendors.list.risk_level",
+        "--query", "documents",
+        "--fail-on-scan",
+        stdout=out,
+    )
+    assert "0 of 8 queries" in out.getvalue()
+
+
+# Test a query on an unindexed column is flagged
+@pytest.mark.django_db
+def test_scan_queries_flags_sequential_scans():
+    _, scans = explain_query(Vendor.objects.filter(website="https://example.com"))
+    assert scans == [Vendor._meta.db_table]
+
+
+# Test the plan is still reported on a database without scan detection
+@pytest.mark.django_db
+def test_scan_queries_unsupported_database(monkeypatch):
+    oracle = SimpleNamespace(vendor="oracle")
+    monkeypatch.setattr(query_plans, "connection", oracle)
+    monkeypatch.setattr(scan_queries, "connection", oracle)
+    plan, scans = explain_query(Vendor.objects.filter(website="https://example.com"))
+    assert plan and scans is None
+
+    out = StringIO()
+    call_command("scan_queries", "--query", "vendors.list", "--fail-on-scan", stdout=out)
+    assert "not checked: unsupported database oracle" in out.getvalue()
@@ -0,0 +1,67 @@
+# Imports
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from vendor_management_system.core.cache import tag_versions
+from vendor_management_system.vendors.alerts import refresh_vendor_alert_state
+from vendor_management_system.vendors.models import Category, CategoryStats, VendorAlertState
+
+
+# Function to run an action of the vendor changelist filtered by status
+def run_status_action(client, action, vendors, status):
+    admin = get_user_model().objects.create(
+        email="admin@example.com", role="admin", is_staff=True, is_superuser=True
+    )
+    client.force_login(admin)
+    url = reverse("admin:vendors_vendor_changelist") + f"?qualification_status__exact={status}"
+    return client.post(
+        url, {"action": action, ACTION_CHECKBOX_NAME: [vendor.pk for vendor in vendors]}
+    )
+
+
+# Test a status action on a filtered changelist refreshes the statistics
+@pytest.mark.django_db
+def test_mark_as_approved_filtered_changelist(client, vendor_factory):
+    category = Category.objects.create(code="SERV", name="Servizi")
+    vendors = [
+        vendor_factory(address=None, category=category, qualification_status="PENDING")
+        for _ in range(2)
+    ]
+
+    http_response = run_status_action(client, "mark_as_approved", vendors, "PENDING")
+    assert http_response.status_code == 302
+
+    stats = CategoryStats.objects.get(category=category)
+    assert (stats.approved_vendors, stats.pending_vendors) == (2, 0)
+
+
+# Test a status action on a filtered changelist refreshes the precomputed alerts
+@pytest.mark.django_db
+def test_mark_as_approved_filtered_changelist_alerts(client, vendor_factory):
+    category = Category.objects.create(code="CERT", name="Certificati", requires_certification=True)
+    vendors = [
+        vendor_factory(
+            address=None, category=category, qualification_status="PENDING",
+            risk_level="LOW", next_audit_due=None,
+        )
+        for _ in range(2)
+    ]
+    refresh_vendor_alert_state()
+    assert VendorAlertState.objects.filter(vendor__in=vendors).count() == 2
+
+    run_status_action(client, "mark_as_approved", vendors, "PENDING")
+    assert not VendorAlertState.objects.filter(vendor__in=vendors).exists()
+
+
+# Test a status action on a filtered changelist invalidates the cached vendors
+@pytest.mark.django_db
+def test_mark_as_approved_filtered_changelist_cache(client, vendor_factory):
+    vendors = [vendor_factory(address=None, qualification_status="PENDING") for _ in range(2)]
+    tags = [f"vendor:{vendor.vendor_code}" for vendor in vendors]
+    before = tag_versions(tags)
+
+    run_status_action(client, "mark_as_approved", vendors, "PENDING")
+    after = tag_versions(tags)
+    assert all(version != previous for version, previous in zip(after, before))
@@ -0,0 +1,54 @@
+# Imports
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from vendor_management_system.vendors.alerts import ALERT_REASONS
+from vendor_management_system.vendors.models import Category, VendorAlertState
+
+
+# Test the alerts return each vendor once with the bitmask of its reasons
+@pytest.mark.django_db
+@pytest.mark.parametrize("precomputed", [False, True])
+def test_vendor_alerts_single_pass(
+    client, api_token, vendor_factory, settings, precomputed,
+    django_capture_on_commit_callbacks,
+):
+    settings.VENDOR_ALERTS_PRECOMPUTED = precomputed
+    yesterday = timezone.localdate() - datetime.timedelta(days=1)
+    category = Category.objects.create(code="CERT", name="Cert", requires_certification=True)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        risky = vendor_factory(
+            address=None, category=category, name="Risky", risk_level="HIGH",
+            next_audit_due=yesterday, qualification_status="APPROVED",
+        )
+        pending = vendor_factory(
+            address=None, category=category, name="Pending", risk_level="LOW",
+            qualification_status="PENDING",
+        )
+        orphan = vendor_factory(address=None, category=None, name="Orphan", risk_level="LOW")
+        vendor_factory(
+            address=None, category=category, name="Fine", risk_level="LOW",
+            qualification_status="APPROVED",
+        )
+
+    assert VendorAlertState.objects.count() == 3
+
+    url = reverse("vendors--alerts")
+    data = client.get(url, {"token": api_token}).json()
+    flags = {row["vendor_code"]: row["alert_flags"] for row in data["results"]}
+    assert flags == {
+        orphan.vendor_code: ALERT_REASONS["no_category"],
+        pending.vendor_code: ALERT_REASONS["missing_certification"],
+        risky.vendor_code: ALERT_REASONS["overdue_audits"] | ALERT_REASONS["high_risk_vendors"],
+    }
+    assert data["counts"]["high_risk_vendors"] == 1
+
+    # A fix drops the vendor from the alerts
+    with django_capture_on_commit_callbacks(execute=True):
+        pending.qualification_status = "APPROVED"
+        pending.save()
+    assert not VendorAlertState.objects.filter(vendor=pending).exists()
@@ -0,0 +1,55 @@
+# Imports
+import pytest
+from django.urls import reverse
+
+from vendor_management_system.core.cache import tag_versions
+from vendor_management_system.vendors.models import Address
+
+
+# Test the vendor detail is cached, revalidated with its ETag and invalidated on save
+@pytest.mark.django_db
+def test_vendor_detail_response_cache(
+    client, api_token, vendor_factory, django_assert_max_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    vendor = vendor_factory(address=None, name="Before")
+    url = reverse("vendors--detail-vendor", kwargs={"vendor_code": vendor.vendor_code})
+
+    first = client.get(url, {"token": api_token})
+    assert first.status_code == 200
+    etag = first["ETag"]
+
+    # Served from the cache: only the token lookup hits the database
+    with django_assert_max_num_queries(1):
+        second = client.get(url, {"token": api_token})
+    assert second.content == first.content
+
+    # Unchanged response
+    not_modified = client.get(url, {"token": api_token}, HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+
+    # A save invalidates the entry once committed
+    vendor.name = "After"
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        vendor.save()
+        assert client.get(url, {"token": api_token}).json()["name"] == "Before"
+    assert callbacks
+    changed = client.get(url, {"token": api_token}, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "After"
+    assert changed["ETag"] != etag
+
+
+# Test deleting an address invalidates the entries of the vendors using it
+@pytest.mark.django_db
+def test_address_delete_invalidates_vendor(vendor_factory, django_capture_on_commit_callbacks):
+    address = Address.objects.create(street_address="Via Roma 1", city="Milano", postal_code="20100")
+    vendor = vendor_factory(address=address)
+    tag = f"vendor:{vendor.vendor_code}"
+    before = tag_versions([tag])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        address.delete()
+    vendor.refresh_from_db()
+    assert vendor.address is None
+    assert tag_versions([tag]) != before
@@ -0,0 +1,25 @@
+# Imports
+import datetime
+import json
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from vendor_management_system.vendors.models import Vendor
+
+
+# Test the incremental vendor export only streams the updated vendors
+@pytest.mark.django_db
+def test_export_vendors_since(client, api_token, vendor_factory):
+    old, recent = vendor_factory(address=None), vendor_factory(address=None)
+    Vendor.objects.filter(pk=old.pk).update(
+        updated_at=timezone.now() - datetime.timedelta(days=3)
+    )
+    url = reverse("vendors--export")
+
+    since = (timezone.now() - datetime.timedelta(days=1)).date().isoformat()
+    response = client.get(url, {"token": api_token, "since": since})
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert [row["vendor_code"] for row in rows] == [recent.vendor_code]
+    assert "category_code" in rows[0]
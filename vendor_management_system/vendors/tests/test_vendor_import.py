@@ -0,0 +1,53 @@
+# Imports
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from vendor_management_system.vendors.models import Category, CategoryStats, Vendor
+
+
+# Test the import upserts the vendors in batches and reports the invalid rows
+@pytest.mark.django_db
+def test_vendor_import_upserts_and_reports_errors(client, api_token, vendor_factory):
+    category = Category.objects.create(code="SERV", name="Servizi")
+    existing = vendor_factory(address=None, name="Old name", email="old@example.com")
+
+    content = "\n".join(
+        [
+            "vendor_code,name,email,category_code,risk_level,city,street_address,postal_code,on_time_delivery_rate",
+            f"{existing.vendor_code},New name,new@example.com,SERV,HIGH,Milano,Via Roma 1,20100,99",
+            "NEWCODE1,Created,created@example.com,SERV,LOW,,,,",
+            "NEWCODE2,Bad,not-an-email,MISSING,UNKNOWN,,,,",
+            "NEWCODE1,Duplicate,dup@example.com,,LOW,,,,",
+        ]
+    )
+    upload = SimpleUploadedFile("vendors.csv", content.encode(), content_type="text/csv")
+
+    url = reverse("vendors--import") + f"?token={api_token}"
+    http_response = client.post(url, {"file": upload})
+    assert http_response.status_code == 200
+    result = http_response.json()
+
+    assert (result["rows"], result["created"], result["updated"], result["failed"]) == (4, 1, 1, 2)
+    assert result["ignored_columns"] == ["on_time_delivery_rate"]
+    assert [error["row"] for error in result["errors"]] == [4, 5]
+    assert set(result["errors"][0]["errors"]) == {"email", "category_code", "risk_level"}
+
+    # Existing vendor updated in place, with a new address
+    existing.refresh_from_db()
+    assert (existing.name, existing.email, existing.category_id) == ("New name", "new@example.com", category.id)
+    assert existing.address.city == "Milano"
+
+    # New vendor created and the derived statistics refreshed
+    assert Vendor.objects.get(pk="NEWCODE1").name == "Created"
+    assert CategoryStats.objects.get(category=category).high_risk_vendors == 1
+
+
+# Test the dry run only validates the rows
+@pytest.mark.django_db
+def test_vendor_import_dry_run(client, api_token):
+    upload = SimpleUploadedFile("vendors.csv", b"name,email\nDry,dry@example.com\n")
+    url = reverse("vendors--import") + f"?token={api_token}&dry_run=true"
+    result = client.post(url, {"file": upload}).json()
+    assert (result["created"], result["dry_run"]) == (1, True)
+    assert not Vendor.objects.exists()
@@ -0,0 +1,49 @@
+# Imports
+import pytest
+from django.urls import reverse
+
+
+# Test the vendor list is paginated with stable cursors
+@pytest.mark.django_db
+def test_vendor_list_keyset_pagination(client, api_token, vendor_factory):
+    for index in range(5):
+        vendor_factory(address=None, name=f"Vendor {index}")
+    url = reverse("vendors--list-create-vendor")
+
+    # First page
+    page = client.get(url, {"token": api_token, "page_size": 2}).json()
+    assert [vendor["name"] for vendor in page["results"]] == ["Vendor 0", "Vendor 1"]
+    assert page["previous"] is None
+
+    # A vendor inserted before the cursor does not shift the next page (the links
+    # do not carry the token)
+    vendor_factory(address=None, name="Vendor 00")
+    page = client.get(f"{page['next']}&token={api_token}").json()
+    assert [vendor["name"] for vendor in page["results"]] == ["Vendor 2", "Vendor 3"]
+
+    # Back to the previous page
+    previous = client.get(f"{page['previous']}&token={api_token}").json()
+    assert [vendor["name"] for vendor in previous["results"]] == ["Vendor 00", "Vendor 1"]
+
+    # Invalid cursor
+    assert client.get(url, {"token": api_token, "cursor": "broken"}).status_code == 404
+
+
+# Test the vendor list only selects the requested fields
+@pytest.mark.django_db
+def test_vendor_list_sparse_fields(
+    client, api_token, vendor_factory, django_assert_max_num_queries
+):
+    vendor_factory(address=None)
+    url = reverse("vendors--list-create-vendor")
+
+    with django_assert_max_num_queries(3) as captured:
+        response = client.get(
+            url, {"token": api_token, "fields": "vendor_code,is_qualified"}
+        )
+    assert response.status_code == 200
+    assert '"email"' not in captured.captured_queries[-1]["sql"]
+    assert set(response.json()["results"][0]) == {"vendor_code", "is_qualified"}
+
+    response = client.get(url, {"token": api_token, "fields": "vendor_code,password"})
+    assert response.status_code == 400
@@ -1,5 +1,6 @@
 # Imports
 from django.urls import path
+from rest_framework.parsers import MultiPartParser
 from vendor_management_system.vendors.views import VendorViewSet, AddressViewSet, CategoryViewSet
 
 
@@ -11,6 +12,24 @@ urlpatterns = [
         VendorViewSet.as_view({"get": "list", "post": "create"}),
         name="vendors--list-create-vendor",
     ),
+    path(
+        "export/",
+        VendorViewSet.as_view({"get": "export"}),
+        name="vendors--export",
+    ),
+    path(
+        "import/",
+        VendorViewSet.as_view(
+            {"post": "import_vendors"}, parser_classes=[MultiPartParser]
+        ),
+        name="vendors--import",
+    ),
+    # Alert and monitoring endpoints (before the vendor code)
+    path(
+        "alerts/",
+        VendorViewSet.as_view({"get": "alerts"}),
+        name="vendors--alerts",
+    ),
     path(
         "<vendor_code>/",
         VendorViewSet.as_view(
@@ -35,6 +54,21 @@ urlpatterns = [
         VendorViewSet.as_view({"get": "performance", "patch": "performance"}),
         name="vendors--performance",
     ),
+    path(
+        "<vendor_code>/performance/recalculate/",
+        VendorViewSet.as_view({"post": "recalculate_performance"}),
+        name="vendors--recalculate-performance",
+    ),
+    path(
+        "<vendor_code>/performance/history/",
+        VendorViewSet.as_view({"get": "performance_history"}),
+        name="vendors--performance-history",
+    ),
+    path(
+        "<vendor_code>/performance/cohort/",
+        VendorViewSet.as_view({"get": "performance_cohort"}),
+        name="vendors--performance-cohort",
+    ),
     
     # Address management for vendors (mantieni dal precedente)
     path(
@@ -43,12 +77,6 @@ urlpatterns = [
         name="vendors--address",
     ),
     
-    # Alert and monitoring endpoints
-    path(
-        "alerts/",
-        VendorViewSet.as_view({"get": "alerts"}),
-        name="vendors--alerts",
-    ),
     
     # Address CRUD operations (standalone) (mantieni dal precedente)
     path(
@@ -1,9 +1,12 @@
 # Imports
+import datetime
+
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpResponse
 from django.urls import reverse
+from django.utils import dateparse, timezone
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import permissions, response, status, viewsets
@@ -13,8 +16,33 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from vendor_management_system.core.authentication import (
     QueryParameterTokenAuthentication,
 )
+from vendor_management_system.core.cache import cached_response
 
+from vendor_management_system.core.exports import (
+    EXPORT_FORMATS,
+    export_response,
+    parse_since,
+)
+from vendor_management_system.core.pagination import KeysetPagination
 from vendor_management_system.core.serializers import QueryParamAuthTokenSerializer
+from vendor_management_system.historical_performances.distributions import (
+    vendor_cohort,
+)
+from vendor_management_system.historical_performances.rollups import (
+    RESOLUTION_STEPS,
+    performance_series,
+)
+from vendor_management_system.purchase_orders.kpis import recompute_vendor_kpis
+from vendor_management_system.vendors.alerts import (
+    ALERT_REASONS,
+    alert_reasons,
+    get_vendor_alerts,
+)
+from vendor_management_system.vendors.hierarchy import (
+    get_category_stats,
+    get_category_tree,
+)
+from vendor_management_system.vendors import imports
 from vendor_management_system.vendors.models import Vendor, Address, Category
 from vendor_management_system.vendors.serializers import (
     VendorCreateUpdateSerializer,
@@ -33,6 +61,25 @@ from vendor_management_system.vendors.serializers import (
 )
 
 
+# Columns of the vendor export
+VENDOR_EXPORT_COLUMNS = (
+    'vendor_code',
+    'name',
+    'email',
+    'phone',
+    'vat_number',
+    'category__code',
+    'qualification_status',
+    'risk_level',
+    'is_active',
+    'on_time_delivery_rate',
+    'quality_rating_avg',
+    'average_response_time',
+    'fulfillment_rate',
+    'updated_at',
+)
+
+
 # ViewSet per Address
 class AddressViewSet(viewsets.ViewSet):
     """ViewSet for managing addresses independently"""
@@ -446,15 +493,10 @@ class CategoryViewSet(viewsets.ViewSet):
         tags=["Categories"],
     )
     @action(detail=False, methods=['get'], url_path='tree')
+    @cached_response("categories:all", "vendors:list")
     def tree(self, request):
-        # Get only root categories (without parent)
-        root_categories = Category.objects.filter(
-            parent__isnull=True, 
-            is_active=True
-        ).order_by('sort_order', 'name')
-        
-        serializer = CategoryTreeSerializer(root_categories, many=True)
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        # Tree assembled from two queries and cached until a category or vendor changes
+        return response.Response(get_category_tree(), status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         operation_id="categories--stats",
@@ -477,10 +519,10 @@ class CategoryViewSet(viewsets.ViewSet):
         tags=["Categories"],
     )
     @action(detail=False, methods=['get'], url_path='stats')
+    @cached_response("categories:all", "vendors:list")
     def stats(self, request):
-        categories = Category.objects.filter(is_active=True).order_by('sort_order', 'name')
-        serializer = CategoryStatsSerializer(categories, many=True)
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        # One grouped count query (or the precomputed table) merged with the hierarchy
+        return response.Response(get_category_stats(), status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         operation_id="categories--vendors",
@@ -516,9 +558,8 @@ class CategoryViewSet(viewsets.ViewSet):
         include_subcategories = request.query_params.get('include_subcategories', 'false').lower() == 'true'
         
         if include_subcategories:
-            # Get all descendant categories
-            categories = [category] + category.get_descendants()
-            vendors = Vendor.objects.filter(category__in=categories)
+            # Get the vendors of the category subtree with one prefix lookup
+            vendors = Vendor.objects.filter(category__path__startswith=category.path)
         else:
             vendors = category.vendors.all()
         
@@ -585,18 +626,73 @@ class VendorViewSet(viewsets.ViewSet):
                 required=False,
                 description="Filter by certification requirement",
             ),
+            openapi.Parameter(
+                name="fields",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Comma separated fields to return (default: all)",
+            ),
+            openapi.Parameter(
+                name="cursor",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Opaque cursor of the page (from the next/previous links)",
+            ),
+            openapi.Parameter(
+                name="page_size",
+                format="integer",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="Number of vendors per page (default: 50, max: 500)",
+            ),
         ],
         responses={
             status.HTTP_200_OK: openapi.Response(
-                "List of all vendors", schema=VendorListSerializer(many=True)
+                "Page of vendors ordered by name",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "next": openapi.Schema(type=openapi.TYPE_STRING),
+                        "previous": openapi.Schema(type=openapi.TYPE_STRING),
+                        "results": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                        ),
+                    },
+                ),
             ),
+            status.HTTP_400_BAD_REQUEST: "Unknown fields",
             status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+            status.HTTP_404_NOT_FOUND: "Invalid cursor",
         },
         tags=["Vendors"],
     )
+    @cached_response("vendors:list", "categories:all")
     def list(self, request):
-        # Get all vendors con select_related per ottimizzare
-        vendors = Vendor.objects.select_related('category', 'address').all()
+        # Get the requested fields
+        fields = list(VendorListSerializer.Meta.fields)
+        if request.query_params.get('fields'):
+            fields = [name.strip() for name in request.query_params['fields'].split(',') if name.strip()]
+            unknown = set(fields) - set(VendorListSerializer.Meta.fields)
+            if unknown:
+                return response.Response(
+                    {"detail": f"Unknown fields: {', '.join(sorted(unknown))}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        # Select only the columns of the requested fields and the pagination keys
+        pagination = KeysetPagination(ordering=("name", "vendor_code"))
+        columns = set(VendorListSerializer.get_model_fields(fields)) | set(pagination.ordering)
+        vendors = Vendor.objects.only(*columns)
+        related = {'category': 'category__parent', 'address': 'address'}
+        related = [path for name, path in related.items() if name in columns]
+        if related:
+            vendors = vendors.select_related(*related)
         
         # Apply existing filters
         qualification_status = request.query_params.get('qualification_status')
@@ -620,11 +716,14 @@ class VendorViewSet(viewsets.ViewSet):
         if requires_certification is not None:
             vendors = vendors.filter(category__requires_certification=requires_certification.lower() == 'true')
 
+        # Get the page of vendors after the cursor
+        page = pagination.paginate_queryset(vendors, request)
+
         # Serialize the vendors using lightweight serializer
-        serializer = VendorListSerializer(vendors, many=True)
+        serializer = VendorListSerializer(page, many=True, fields=fields)
 
         # Return the response
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        return pagination.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
         operation_id="vendors--create-vendor",
@@ -701,6 +800,7 @@ class VendorViewSet(viewsets.ViewSet):
         },
         tags=["Vendors"],
     )
+    @cached_response("vendor:{vendor_code}", "categories:all")
     def retrieve(self, request, vendor_code=None):
         # Get the vendor by vendor_code
         vendor = get_object_or_404(Vendor, vendor_code=vendor_code)
@@ -998,10 +1098,10 @@ class VendorViewSet(viewsets.ViewSet):
                 serializer.errors, status=status.HTTP_400_BAD_REQUEST
             )
 
-    # Custom action to get vendors requiring attention
+    # Custom action to recalculate the performance metrics from the purchase orders
     @swagger_auto_schema(
-        operation_id="vendors--get-alerts",
-        operation_description="Get vendors requiring attention (overdue audits, expired qualifications, etc.)",
+        operation_id="vendors--recalculate-performance",
+        operation_description="Recalculate vendor performance metrics from the purchase orders",
         manual_parameters=[
             openapi.Parameter(
                 name="token",
@@ -1014,79 +1114,378 @@ class VendorViewSet(viewsets.ViewSet):
         ],
         responses={
             status.HTTP_200_OK: openapi.Response(
-                "Vendors requiring attention", 
+                "Recalculated performance metrics", schema=VendorPerformanceSerializer
+            ),
+            status.HTTP_404_NOT_FOUND: "Vendor not found",
+        },
+        tags=["Vendor Performance"],
+    )
+    @action(detail=True, methods=['post'], url_path='performance/recalculate')
+    def recalculate_performance(self, request, vendor_code=None):
+        vendor = get_object_or_404(Vendor, vendor_code=vendor_code)
+
+        # Recompute the counters and the metrics with one aggregate query
+        recompute_vendor_kpis([vendor.pk])
+        vendor.refresh_from_db()
+
+        serializer = VendorPerformanceSerializer(vendor)
+        return response.Response(serializer.data, status=status.HTTP_200_OK)
+
+    # Custom action to stream all the vendors as a file
+    @swagger_auto_schema(
+        operation_id="vendors--export-vendors",
+        operation_description=(
+            "Stream all the vendors as NDJSON or CSV, gzip compressed when the "
+            "client accepts it"
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+            openapi.Parameter(
+                name="output",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                enum=["ndjson", "csv"],
+                description="Format of the export (default: ndjson)",
+            ),
+            openapi.Parameter(
+                name="since",
+                format="date-time",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Only the rows updated on or after this date",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: "Stream of vendors",
+            status.HTTP_400_BAD_REQUEST: "Invalid format or date",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Vendors"],
+    )
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        export_format = request.query_params.get('output', 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            return response.Response(
+                {"detail": f"Invalid output format: {export_format}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        vendors = Vendor.objects.all()
+
+        # Incremental export of the vendors updated since a date
+        since = request.query_params.get('since')
+        if since:
+            since_date = parse_since(since)
+            if since_date is None:
+                return response.Response(
+                    {"detail": f"Invalid 'since' date: {since}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            vendors = vendors.filter(updated_at__gte=since_date)
+
+        # Stream a projection of the columns
+        return export_response(
+            request,
+            vendors.values_list(*VENDOR_EXPORT_COLUMNS),
+            columns=[column.replace('__', '_') for column in VENDOR_EXPORT_COLUMNS],
+            key='vendor_code',
+            filename='vendors',
+            export_format=export_format,
+        )
+
+    # Custom action to import the vendors of a CSV or XLSX file
+    @swagger_auto_schema(
+        operation_id="vendors--import-vendors",
+        operation_description=(
+            "Import the vendors of a CSV or XLSX file, upserted on the vendor code "
+            "in batches; returns the errors of each invalid row and the throughput"
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+            openapi.Parameter(
+                name="file",
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_FILE,
+                required=True,
+                description="CSV or XLSX file with a header row",
+            ),
+            openapi.Parameter(
+                name="dry_run",
+                format="boolean",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+                description="Only validate the rows without writing the vendors",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                "Import report",
                 schema=openapi.Schema(
                     type=openapi.TYPE_OBJECT,
                     properties={
-                        "overdue_audits": openapi.Schema(
+                        "rows": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "created": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "updated": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "failed": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "errors": openapi.Schema(
                             type=openapi.TYPE_ARRAY,
                             items=openapi.Schema(
                                 type=openapi.TYPE_OBJECT,
                                 properties={
+                                    "row": openapi.Schema(type=openapi.TYPE_INTEGER),
                                     "vendor_code": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "name": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "email": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "phone": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "category": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "qualification_status": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "risk_level": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "is_qualified": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                                    "audit_overdue": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                                }
-                            )
+                                    "errors": openapi.Schema(type=openapi.TYPE_OBJECT),
+                                },
+                            ),
                         ),
-                        "expired_qualifications": openapi.Schema(
+                        "dry_run": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                        "ignored_columns": openapi.Schema(
                             type=openapi.TYPE_ARRAY,
-                            items=openapi.Schema(
-                                type=openapi.TYPE_OBJECT,
-                                properties={
-                                    "vendor_code": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "name": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "email": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "phone": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "category": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "qualification_status": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "risk_level": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "is_qualified": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                                    "audit_overdue": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                                }
-                            )
+                            items=openapi.Schema(type=openapi.TYPE_STRING),
                         ),
-                        "high_risk_vendors": openapi.Schema(
+                        "seconds": openapi.Schema(type=openapi.TYPE_NUMBER),
+                        "rows_per_second": openapi.Schema(type=openapi.TYPE_NUMBER),
+                    },
+                ),
+            ),
+            status.HTTP_400_BAD_REQUEST: "Missing or unsupported file",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+            status.HTTP_403_FORBIDDEN: "Vendor users cannot import vendors",
+        },
+        tags=["Vendors"],
+    )
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_vendors(self, request):
+        # Only the staff can import vendors
+        if getattr(request.user, 'role', None) == 'vendor' and not request.user.is_superuser:
+            return response.Response(
+                {"detail": "Vendor users cannot import vendors"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return response.Response(
+                {"detail": "Missing file"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = upload.name.rsplit('.', 1)[-1].lower()
+        if file_format not in imports.IMPORT_FORMATS:
+            return response.Response(
+                {"detail": f"Unsupported file format: {file_format}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        dry_run = request.query_params.get('dry_run', '').lower() == 'true'
+        result = imports.import_vendors(upload, file_format=file_format, dry_run=dry_run)
+        return response.Response(result, status=status.HTTP_200_OK)
+
+    # Custom action to get the performance history of a vendor
+    @swagger_auto_schema(
+        operation_id="vendors--performance-history",
+        operation_description=(
+            "Get the performance history of a vendor as columnar arrays, "
+            "bucketed by the database"
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+            openapi.Parameter(
+                name="from",
+                format="date-time",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Start of the range (default: one year ago)",
+            ),
+            openapi.Parameter(
+                name="to",
+                format="date-time",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="End of the range (default: now)",
+            ),
+            openapi.Parameter(
+                name="bucket",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                enum=["auto", "raw", "day", "week", "month"],
+                description="Bucket size (default: auto, the finest within the points budget)",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                "Vendor performance history",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "resolution": openapi.Schema(type=openapi.TYPE_STRING),
+                        "timestamps": openapi.Schema(
                             type=openapi.TYPE_ARRAY,
-                            items=openapi.Schema(
-                                type=openapi.TYPE_OBJECT,
-                                properties={
-                                    "vendor_code": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "name": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "email": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "phone": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "category": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "qualification_status": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "risk_level": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "is_qualified": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                                    "audit_overdue": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                                }
-                            )
+                            items=openapi.Schema(type=openapi.TYPE_STRING),
                         ),
-                        "missing_certification": openapi.Schema(
-                            type=openapi.TYPE_ARRAY,
-                            items=openapi.Schema(
-                                type=openapi.TYPE_OBJECT,
-                                properties={
-                                    "vendor_code": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "name": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "email": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "phone": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "category": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "qualification_status": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "risk_level": openapi.Schema(type=openapi.TYPE_STRING),
-                                    "is_qualified": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                                    "audit_overdue": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                                }
+                        **{
+                            key: openapi.Schema(
+                                type=openapi.TYPE_ARRAY,
+                                items=openapi.Schema(type=openapi.TYPE_NUMBER),
                             )
+                            for key in (
+                                "on_time",
+                                "quality",
+                                "response_time",
+                                "fulfillment",
+                            )
+                        },
+                    },
+                ),
+            ),
+            status.HTTP_400_BAD_REQUEST: "Invalid range or bucket",
+            status.HTTP_404_NOT_FOUND: "Vendor not found",
+        },
+        tags=["Vendor Performance"],
+    )
+    @action(detail=True, methods=['get'], url_path='performance/history')
+    def performance_history(self, request, vendor_code=None):
+        vendor = get_object_or_404(Vendor.objects.only("pk"), vendor_code=vendor_code)
+
+        # Parse the range
+        end = timezone.now()
+        start = end - datetime.timedelta(days=365)
+        for name in ("from", "to"):
+            value = request.query_params.get(name)
+            if not value:
+                continue
+            parsed = dateparse.parse_datetime(value)
+            if parsed is None:
+                parsed_date = dateparse.parse_date(value)
+                if parsed_date is not None:
+                    parsed = datetime.datetime.combine(parsed_date, datetime.time.min)
+            if parsed is None:
+                return response.Response(
+                    {"detail": f"Invalid '{name}' date: {value}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+            if name == "from":
+                start = parsed
+            else:
+                end = parsed
+        if start > end:
+            return response.Response(
+                {"detail": "'from' must be before 'to'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Parse the bucket
+        bucket = request.query_params.get("bucket", "auto").upper()
+        if bucket != "AUTO" and bucket not in RESOLUTION_STEPS:
+            return response.Response(
+                {"detail": f"Invalid bucket: {bucket.lower()}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        series = performance_series(
+            vendor.pk, start, end, resolution=None if bucket == "AUTO" else bucket
+        )
+        series["resolution"] = series["resolution"].lower()
+        return response.Response(series, status=status.HTTP_200_OK)
+
+    # Custom action to rank a vendor against its category peers
+    @swagger_auto_schema(
+        operation_id="vendors--performance-cohort",
+        operation_description=(
+            "Rank the current performance metrics of a vendor as percentiles "
+            "against the vendors of its category"
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: "Vendor percentiles in its category",
+            status.HTTP_404_NOT_FOUND: "Vendor not found",
+        },
+        tags=["Vendor Performance"],
+    )
+    @action(detail=True, methods=['get'], url_path='performance/cohort')
+    def performance_cohort(self, request, vendor_code=None):
+        vendor = get_object_or_404(Vendor, vendor_code=vendor_code)
+
+        return response.Response(
+            {
+                "vendor_code": vendor.vendor_code,
+                "category": vendor.category_id,
+                "metrics": vendor_cohort(vendor),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    # Custom action to get vendors requiring attention
+    @swagger_auto_schema(
+        operation_id="vendors--get-alerts",
+        operation_description="Get vendors requiring attention (overdue audits, expired qualifications, etc.)",
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                "Vendors requiring attention", 
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "reasons": openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            description="Bit of each alert reason",
+                            additional_properties=openapi.Schema(type=openapi.TYPE_INTEGER),
+                        ),
+                        "counts": openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            description="Number of vendors of each alert reason",
+                            additional_properties=openapi.Schema(type=openapi.TYPE_INTEGER),
                         ),
-                        "no_category": openapi.Schema(
+                        "results": openapi.Schema(
                             type=openapi.TYPE_ARRAY,
                             items=openapi.Schema(
                                 type=openapi.TYPE_OBJECT,
@@ -1100,6 +1499,11 @@ class VendorViewSet(viewsets.ViewSet):
                                     "risk_level": openapi.Schema(type=openapi.TYPE_STRING),
                                     "is_qualified": openapi.Schema(type=openapi.TYPE_BOOLEAN),
                                     "audit_overdue": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                                    "alert_flags": openapi.Schema(type=openapi.TYPE_INTEGER),
+                                    "alerts": openapi.Schema(
+                                        type=openapi.TYPE_ARRAY,
+                                        items=openapi.Schema(type=openapi.TYPE_STRING),
+                                    ),
                                 }
                             )
                         ),
@@ -1110,41 +1514,29 @@ class VendorViewSet(viewsets.ViewSet):
         tags=["Vendor Alerts"],
     )
     @action(detail=False, methods=['get'], url_path='alerts')
+    @cached_response("vendors:list", "categories:all", daily=True)
     def alerts(self, request):
-        from django.utils import timezone
-        today = timezone.now().date()
-        
-        # Get vendors with overdue audits
-        overdue_audits = Vendor.objects.select_related('category', 'address').filter(
-            next_audit_due__lt=today
-        ).exclude(next_audit_due__isnull=True)
-        
-        # Get vendors with expired qualifications
-        expired_qualifications = Vendor.objects.select_related('category', 'address').filter(
-            qualification_expiry__lt=today,
-            qualification_status='APPROVED'
-        ).exclude(qualification_expiry__isnull=True)
-        
-        # Get high risk vendors
-        high_risk_vendors = Vendor.objects.select_related('category', 'address').filter(risk_level='HIGH')
-        
-        # Get vendors in categories requiring certification but without proper status
-        missing_certification = Vendor.objects.select_related('category', 'address').filter(
-            category__requires_certification=True,
-            qualification_status__in=['PENDING', 'REJECTED']
+        # Vendors requiring attention, each once with the bitmask of its reasons
+        vendors = list(
+            get_vendor_alerts()
+            .select_related('category__parent', 'address')
+            .order_by('name', 'vendor_code')
         )
-        
-        # Get vendors without category assigned
-        no_category = Vendor.objects.select_related('address').filter(category__isnull=True)
-        
+
+        results = []
+        counts = dict.fromkeys(ALERT_REASONS, 0)
+        for vendor, data in zip(vendors, VendorListSerializer(vendors, many=True).data):
+            reasons = alert_reasons(vendor.alert_flags)
+            for reason in reasons:
+                counts[reason] += 1
+            results.append({**data, 'alert_flags': vendor.alert_flags, 'alerts': reasons})
+
         data = {
-            'overdue_audits': VendorListSerializer(overdue_audits, many=True).data,
-            'expired_qualifications': VendorListSerializer(expired_qualifications, many=True).data,
-            'high_risk_vendors': VendorListSerializer(high_risk_vendors, many=True).data,
-            'missing_certification': VendorListSerializer(missing_certification, many=True).data,
-            'no_category': VendorListSerializer(no_category, many=True).data,
+            'reasons': ALERT_REASONS,
+            'counts': counts,
+            'results': results,
         }
-        
+
         return response.Response(data, status=status.HTTP_200_OK)
 
     # Address management for vendors